@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..config import settings
+from ..database import get_db
+from ..services import result_cache_service
+from ..services.embedding_cache import embedding_cache
+
+router = APIRouter()
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Guards admin routes with a shared token (settings.admin_token).
+    If no token is configured the routes stay open, which is only meant for local development.
+    """
+    if settings.admin_token and x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/cache/transcriptions", dependencies=[Depends(require_admin)])
+def get_transcription_cache_stats(db: Session = Depends(get_db)):
+    """Number of cached results, their total size and how often they were reused."""
+    return result_cache_service.cache_stats(db)
+
+@router.delete("/cache/transcriptions", dependencies=[Depends(require_admin)])
+def purge_transcription_cache(db: Session = Depends(get_db)):
+    """Removes every cached transcription result."""
+    return {"deleted": result_cache_service.purge_cache(db)}
+
+@router.get("/cache/embeddings", dependencies=[Depends(require_admin)])
+def get_embedding_cache_stats():
+    """Memory/disk hit and miss counters of the semantic-analysis embedding cache."""
+    return embedding_cache.stats()
+
+@router.delete("/cache/embeddings", dependencies=[Depends(require_admin)])
+def purge_embedding_cache():
+    """Removes every cached embedding (memory and disk)."""
+    return {"deleted": embedding_cache.purge()}
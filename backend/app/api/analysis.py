@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from ..schemas.analysis import AnalysisRequest, AnalysisResponse
-from ..services.semantic_analysis_service import analyze_semantic_relevance
+import json
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas.analysis import AnalysisRequest, AnalysisResponse, BatchAnalysisRequest
+from ..services import session_service
+from ..services.semantic_analysis_service import analyze_semantic_relevance, analyze_batch
 
 router = APIRouter()
 
 @router.post("/relevance", response_model=AnalysisResponse)
-async def semantic_analysis(request: AnalysisRequest):
+def semantic_analysis(request: AnalysisRequest, db: Session = Depends(get_db)):
     """
     Analyzes the semantic relevance between an interview transcript and a resume.
     
@@ -13,19 +18,64 @@ async def semantic_analysis(request: AnalysisRequest):
     1. Chunks the interview transcript into 30s segments.
     2. Embeds both the transcript chunks and the resume sections using Sentence Transformers.
     3. Calculates cosine similarity to determine relevance, topic drift, and redundancy.
+
+    With `session_id`, the stored transcript is used (no re-transcription) and the
+    result is saved with the session, so `GET /sessions/{session_id}` returns it later.
+
+    A plain `def` route: FastAPI runs it in the threadpool, so the database calls and
+    the embedding work never block the event loop.
     """
+    transcript = request.transcript
+    session = None
+    if request.session_id:
+        session = session_service.get_session(db, request.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if transcript is None:
+            transcript = session_service.load_transcript(db, session)
+    if transcript is None:
+        raise HTTPException(status_code=400, detail="Provide a transcript or a session_id.")
+
     try:
         # Check if transcript has valid segments
-        if not request.transcript.get("segments"):
+        if not transcript.get("segments"):
             raise HTTPException(status_code=400, detail="Transcript is empty or malformed.")
             
-        result = analyze_semantic_relevance(request.transcript, request.resume_text)
+        result = analyze_semantic_relevance(transcript, request.resume_text)
         
         if "error" in result:
              raise HTTPException(status_code=400, detail=result["error"])
+
+        if session is not None:
+            session_service.save_metric(db, session, "semantic", result)
              
         return result
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         # In production, log the error here
         raise HTTPException(status_code=500, detail=f"Semantic analysis failed: {str(e)}")
+
+@router.post("/relevance/batch", summary="Batch Semantic Analysis (NDJSON stream)")
+def semantic_analysis_batch(request: BatchAnalysisRequest):
+    """
+    Scores N transcripts against M resumes in one call.
+
+    All texts are de-duplicated and embedded in large batches, then each
+    (transcript, resume) pair is scored from the shared embeddings.
+    The response is NDJSON: one `BatchAnalysisResult` JSON object per line,
+    streamed as soon as each pair is scored.
+    """
+    transcripts = {t.id: t.transcript for t in request.transcripts}
+    resumes = {r.id: r.resume_text for r in request.resumes}
+    if len(transcripts) != len(request.transcripts) or len(resumes) != len(request.resumes):
+        raise HTTPException(status_code=400, detail="Transcript and resume ids must be unique.")
+    if request.batch_size is not None and request.batch_size <= 0:
+        raise HTTPException(status_code=400, detail="batch_size must be positive.")
+
+    def ndjson_lines():
+        for item in analyze_batch(transcripts, resumes, request.pairs, request.batch_size):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
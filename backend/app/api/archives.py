@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas.archive import ArchiveStatusResponse
+from ..services import archive_service
+from .admin import require_admin
+
+router = APIRouter()
+
+def get_archive_task(db: Session, archive_id: str):
+    task = archive_service.get_task(db, archive_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Archive not found")
+    return task
+
+@router.get("/{archive_id}", response_model=ArchiveStatusResponse, summary="Get Archive Upload Status")
+def get_archive(archive_id: str, db: Session = Depends(get_db)):
+    """
+    Reports the background S3 upload of a recording.
+    The ID is returned as `archive.archive_id` by the transcription endpoints.
+    """
+    return archive_service.task_to_response(get_archive_task(db, archive_id))
+
+@router.post("/{archive_id}/retry", response_model=ArchiveStatusResponse, status_code=202,
+             summary="Retry a Failed Archive Upload", dependencies=[Depends(require_admin)])
+def retry_archive(archive_id: str, db: Session = Depends(get_db)):
+    """Queues a failed upload again (e.g. after fixing credentials or the bucket policy)."""
+    task = get_archive_task(db, archive_id)
+    if task.status != "failed":
+        raise HTTPException(status_code=409, detail=f"Archive is {task.status}.")
+    try:
+        task = archive_service.retry_task(db, task)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    return archive_service.task_to_response(task)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas.analytics import CandidateTrendResponse
+from ..services import trend_service
+
+router = APIRouter()
+
+@router.get("/{candidate_id}/trend", response_model=CandidateTrendResponse, summary="Get a Candidate's Trend")
+def get_candidate_trend(candidate_id: str, db: Session = Depends(get_db)):
+    """
+    Score series, moving averages, best score and streaks of a candidate.
+    Served from the rollup kept up to date as sessions are saved (no rescoring).
+    """
+    rollup = trend_service.get_rollup(db, candidate_id)
+    if rollup is None:
+        raise HTTPException(status_code=404, detail="No sessions stored for this candidate")
+    return trend_service.rollup_to_response(rollup, trend_service.get_trend_points(db, candidate_id))
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas.cohort import CohortRankRequest, CohortRankResponse
+from ..services import cohort_service, session_service
+
+router = APIRouter()
+
+@router.post("/rank", response_model=CohortRankResponse, summary="Score and Rank a Cohort")
+def rank_cohort(request: CohortRankRequest):
+    """
+    Scores every session (same formula as the per-session score) and returns its
+    percentile rank within the submitted cohort.
+    """
+    ids = [s.id for s in request.sessions]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Session ids must be unique.")
+    return cohort_service.rank_metrics([s.model_dump() for s in request.sessions])
+
+@router.get("/interviews/{interview_id}", response_model=CohortRankResponse, summary="Rank an Interview's Stored Sessions")
+def rank_interview_cohort(interview_id: int, db: Session = Depends(get_db)):
+    """Percentile ranks of all stored sessions of an interview, from their stored scores."""
+    if not session_service.interview_exists(db, interview_id):
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return cohort_service.rank_interview(db, interview_id)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ..services.model_registry import model_registry
+from ..services.whisper_pool import whisper_pool
+
+router = APIRouter()
+
+@router.get("/live")
+def liveness():
+    """The process is up and serving HTTP (models may still be loading)."""
+    return {"status": "alive"}
+
+@router.get("/ready")
+def readiness():
+    """
+    Returns 200 once every preloaded model is loaded and warmed up, 503 before that.
+    Point the load balancer / Kubernetes readiness probe here.
+    """
+    stats = model_registry.stats()
+    status_code = 200 if stats["ready"] else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "status": "ready" if stats["ready"] else "loading",
+            "models": {name: {"loaded": m["loaded"], "error": m["error"]} for name, m in stats["models"].items()},
+        },
+    )
+
+@router.get("/models")
+def model_stats():
+    """Per-model load time, warmup time, memory footprint and idle time."""
+    stats = model_registry.stats()
+    if whisper_pool.enabled:
+        stats["whisper_pool"] = whisper_pool.stats()
+    return stats
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from ..database import get_db
-from ..schemas.interview import InterviewCreate, InterviewResponse
+from ..config import settings
+from ..database import get_db, get_async_db
+from ..schemas.interview import InterviewCreate, InterviewResponse, InterviewPage, BulkImportResponse
 from ..services import interview_service
 
 # What is APIRouter?
@@ -11,7 +17,104 @@ from ..services import interview_service
 # We can define prefixed routes here and include them in main.py later.
 router = APIRouter()
 
-@router.get("/example", response_model=List[InterviewResponse])
+@router.get("", response_model=InterviewPage, summary="List Interviews (cursor pagination)")
+def list_interviews(cursor: Optional[str] = None, limit: int = Query(default=100, ge=1, le=settings.page_max_limit),
+                    db: Session = Depends(get_db)):
+    """
+    Interviews, newest first. Pass the returned `next_cursor` as `?cursor=` for the
+    next page; every page costs the same however deep it is (keyset pagination).
+    """
+    try:
+        return interview_service.get_interview_page(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/export", summary="Export Interviews (NDJSON or CSV stream)")
+def export_interviews(format: str = Query(default="ndjson", pattern="^(ndjson|csv)$")):
+    """
+    Streams every interview, newest first, fetched from the database in batches
+    of `export_batch_size` rows, so exports of any size use constant memory.
+    """
+    if format == "csv":
+        return StreamingResponse(
+            interview_service.export_interviews("csv"), media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="interviews.csv"'},
+        )
+    return StreamingResponse(interview_service.export_interviews("ndjson"), media_type="application/x-ndjson")
+
+async def _request_items(request: Request):
+    """
+    Yields (index, item or None, error) for every row of the body.
+    NDJSON bodies are parsed line by line as they arrive; JSON bodies must be an array.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        index, pending = 0, b""
+        async for chunk in request.stream():
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield (index, *_parse_line(line))
+                    index += 1
+        if pending.strip():
+            yield (index, *_parse_line(pending))
+        return
+
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON (application/x-ndjson).")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of interviews.")
+    for index, item in enumerate(items):
+        yield index, item, None
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in error.errors())
+
+@router.post("/bulk", response_model=BulkImportResponse, summary="Bulk Import Interviews (JSON array or NDJSON)")
+async def bulk_import_interviews(request: Request, db: Session = Depends(get_db)):
+    """
+    Imports many interviews in one request, e.g. a customer's back catalogue.
+
+    Send a JSON array or an NDJSON stream (`Content-Type: application/x-ndjson`) of
+    InterviewCreate objects. Valid rows are inserted in batches of `bulk_insert_batch_size`
+    (one INSERT per batch); invalid rows are reported in `errors` and skipped.
+    """
+    received, inserted, errors, batch = 0, 0, [], []
+
+    async def flush():
+        nonlocal inserted
+        count, failures = await run_in_threadpool(interview_service.bulk_insert_interviews, db, batch[:])
+        inserted += count
+        errors.extend({"index": i, "detail": detail} for i, detail in failures)
+        batch.clear()
+
+    async for index, item, error in _request_items(request):
+        received += 1
+        if error is None:
+            try:
+                batch.append((index, InterviewCreate.model_validate(item).model_dump()))
+            except ValidationError as e:
+                error = _validation_message(e)
+        if error is not None:
+            errors.append({"index": index, "detail": error})
+        if len(batch) >= settings.bulk_insert_batch_size:
+            await flush()
+    await flush()
+
+    errors.sort(key=lambda e: e["index"])
+    return {"received": received, "inserted": inserted, "failed": len(errors), "errors": errors}
+
+# Sync routes run in Starlette's threadpool (40 threads by default): under load every
+# in-flight query holds a thread. With settings.use_async_db the async variants below
+# are registered instead and wait on the database without occupying a thread.
+
 def get_interviews_list(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """
     Get a list of interviews.
@@ -22,7 +125,6 @@ def get_interviews_list(skip: int = 0, limit: int = 100, db: Session = Depends(g
     interviews = interview_service.get_interviews(db, skip=skip, limit=limit)
     return interviews
 
-@router.post("/example", response_model=InterviewResponse)
 def create_new_interview(interview: InterviewCreate, db: Session = Depends(get_db)):
     """
     Create a new interview.
@@ -31,3 +133,24 @@ def create_new_interview(interview: InterviewCreate, db: Session = Depends(get_d
     Uses the service layer to interact with the database.
     """
     return interview_service.create_interview(db, interview.dict())
+
+if settings.use_async_db:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    async def get_interviews_list_async(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+        """
+        Get a list of interviews (async engine).
+        """
+        return await interview_service.get_interviews_async(db, skip=skip, limit=limit)
+
+    async def create_new_interview_async(interview: InterviewCreate, db: AsyncSession = Depends(get_async_db)):
+        """
+        Create a new interview (async engine).
+        """
+        return await interview_service.create_interview_async(db, interview.dict())
+
+    router.add_api_route("/example", get_interviews_list_async, methods=["GET"], response_model=List[InterviewResponse])
+    router.add_api_route("/example", create_new_interview_async, methods=["POST"], response_model=InterviewResponse)
+else:
+    router.add_api_route("/example", get_interviews_list, methods=["GET"], response_model=List[InterviewResponse])
+    router.add_api_route("/example", create_new_interview, methods=["POST"], response_model=InterviewResponse)
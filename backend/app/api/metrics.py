@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..config import settings
+from ..utils.metrics import metrics
+
+router = APIRouter()
+
+@router.get("", response_class=PlainTextResponse, summary="Prometheus Metrics")
+def prometheus_metrics():
+    """
+    Counters, gauges and latency histograms in the Prometheus text format:
+    pipeline stages, uploads, pitch tracking, embeddings, S3, model loads,
+    job / Whisper / archive queue depth, cache hits and HTTP requests.
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
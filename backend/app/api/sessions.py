@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from ..database import get_db
+from ..schemas.session import SessionSummary, SessionDetail, SessionTranscript, SessionFeedback
+from ..services import session_service
+
+router = APIRouter()
+
+# Stored Sessions
+# ---------------
+# Every recording processed by /transcription/transcribe or /transcription/jobs
+# is stored as a session. These routes read the stored results; none of them
+# runs a model, so reopening a past session is a database lookup.
+
+def get_stored_session(db: Session, session_id: str, with_metrics: bool = False):
+    session = session_service.get_session(db, session_id, with_metrics=with_metrics)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+@router.get("", response_model=List[SessionSummary], summary="List Stored Sessions")
+def list_sessions(interview_id: Optional[int] = None, candidate_id: Optional[str] = None, skip: int = Query(default=0, ge=0),
+                  limit: int = Query(default=100, ge=1, le=500), db: Session = Depends(get_db)):
+    """Stored sessions, newest first. Filter by `interview_id` or `candidate_id` to get one history."""
+    sessions = session_service.list_sessions(db, interview_id=interview_id, candidate_id=candidate_id, skip=skip, limit=limit)
+    return [session_service.session_to_response(s) for s in sessions]
+
+@router.get("/{session_id}", response_model=SessionDetail, summary="Get a Stored Session")
+def get_session(session_id: str, db: Session = Depends(get_db)):
+    """Headline numbers plus every stored analysis result (speech, emotional stability, semantic)."""
+    session = get_stored_session(db, session_id, with_metrics=True)
+    return session_service.session_to_response(session, include_metrics=True)
+
+@router.get("/{session_id}/transcript", response_model=SessionTranscript, summary="Get a Stored Transcript")
+def get_session_transcript(session_id: str, db: Session = Depends(get_db)):
+    """The timestamped transcript, segments and words, as returned by the upload endpoints."""
+    return session_service.load_transcript(db, get_stored_session(db, session_id))
+
+@router.get("/{session_id}/feedback", response_model=SessionFeedback, summary="Get Feedback for a Stored Session")
+def get_session_feedback(session_id: str, db: Session = Depends(get_db)):
+    """Performance score and written feedback, computed from the stored metrics."""
+    return session_service.session_feedback(db, get_stored_session(db, session_id, with_metrics=True))
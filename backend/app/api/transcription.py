@@ -1,64 +1,238 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from ..services import transcription_service, speech_analysis_service, audio_analysis_service
-from ..services.s3_service import s3_service
+import asyncio
+import json
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas.job import JobSubmitResponse, JobStatusResponse
+from ..schemas.prosody import ProsodyWindowsRequest, ProsodyWindowsResponse
+from ..config import settings
+from ..services import job_service, upload_service, session_service
+from ..services.pipeline_service import run_transcription_pipeline
+from ..services.pitch_tracking import PITCH_BACKENDS
+from ..services.filler_matcher import get_matcher
+from ..services.prosody_index import load_index
+from ..services.audio_analysis_service import index_variant
+from ..services.live_transcription_service import LiveTranscriber
+from ..utils.helpers import log_warning
+from typing import Optional
 import os
 
 router = APIRouter()
 
 SUPPORTED_EXTENSIONS = {".wav", ".mp3", ".m4a"}
 
+def validate_extension(filename: str) -> str:
+    """Raises a 400 if the upload is not a supported audio type. Returns the extension."""
+    extension = os.path.splitext(filename)[1].lower()
+
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {extension}. Supported types: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+    return extension
+
+def validate_pitch_backend(pitch_backend: Optional[str]):
+    if pitch_backend is not None and pitch_backend not in PITCH_BACKENDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown pitch backend: {pitch_backend}. Supported: {', '.join(PITCH_BACKENDS)}"
+        )
+
+def validate_filler_lexicons(filler_lexicons: Optional[str]):
+    """Raises a 400 for unknown lexicons (and compiles the requested ones, so the pipeline does not fail later)."""
+    if filler_lexicons is not None:
+        try:
+            get_matcher(filler_lexicons)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+PITCH_BACKEND_QUERY = Query(default=None, description="F0 tracker: pyin (accurate), yin or fast. Defaults to server config.")
+INTERVIEW_ID_QUERY = Query(default=None, description="Interview to store the analysed session under (see /sessions).")
+CANDIDATE_ID_QUERY = Query(default=None, max_length=64, description="Your ID for the candidate; the session is added to their trend (see /candidates).")
+FILLER_LEXICONS_QUERY = Query(default=None, max_length=256, description="Comma-separated filler lexicons, e.g. en,acme. Defaults to server config.")
+
+def validate_interview(db: Session, interview_id: Optional[int]):
+    if interview_id is not None and not session_service.interview_exists(db, interview_id):
+        raise HTTPException(status_code=404, detail="Interview not found")
+
 @router.post("/transcribe", summary="Upload and Transcribe Audio")
-async def transcribe_audio(file: UploadFile = File(...)):
+async def transcribe_audio(file: UploadFile = File(...), pitch_backend: Optional[str] = PITCH_BACKEND_QUERY,
+                           interview_id: Optional[int] = INTERVIEW_ID_QUERY, candidate_id: Optional[str] = CANDIDATE_ID_QUERY,
+                           filler_lexicons: Optional[str] = FILLER_LEXICONS_QUERY, db: Session = Depends(get_db)):
     """
     Endpoint to upload an audio file and get a timestamped transcription.
-    
+
     1. Validates the file extension.
     2. Saves the file temporarily.
     3. Uses Whisper to transcribe.
     4. Returns the result as JSON.
+
+    The heavy work runs in a threadpool so other requests are not blocked.
+    For long recordings prefer `POST /jobs`, which returns immediately.
+    The result is stored; `session_id` reopens it later via `GET /sessions/{session_id}`.
     """
-    
-    # 1. Validate File Extension
-    filename = file.filename
-    extension = os.path.splitext(filename)[1].lower()
-    
-    if extension not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type: {extension}. Supported types: {', '.join(SUPPORTED_EXTENSIONS)}"
-        )
-    
-    # 2. Save the file using the service layer
-    # We await this if it was async, but shutil is sync.
-    # We can run it in a threadpool if blocking becomes an issue, but for now simple sync call is okay.
-    file_path = transcription_service.save_upload_file(file)
-    
+
+    # 1. Validate File Extension (and the optional pitch backend / lexicons / interview)
+    extension = validate_extension(file.filename)
+    validate_pitch_backend(pitch_backend)
+    validate_filler_lexicons(filler_lexicons)
+    validate_interview(db, interview_id)
+
+    # 2. Save the file using the service layer (non-blocking writes, size limit)
+    # A unique name avoids clashes between concurrent uploads of the same filename.
+    # The SHA-256 computed while saving lets repeat uploads hit the result cache.
+    file_path, audio_hash = await upload_service.save_upload_file(file, f"{job_service.new_job_id()}{extension}")
+
     try:
-        # 3. Transcribe audio using the service layer
-        # cleanup=False because we need the file for the next step
-        transcription_result = transcription_service.transcribe(file_path, cleanup=False)
-        
-        # 4. Analyze Speech patterns
-        analysis_result = speech_analysis_service.analyze_speech(transcription_result)
-
-        # 5. Analyze Emotional Stability (Audio Features)
-        emotional_analysis = audio_analysis_service.get_audio_features(file_path, transcription_result.get("segments", []))
-        
-        # 6. Archive to AWS S3 (Optional)
-        # This will only upload if use_s3_storage is True in config
-        s3_url = s3_service.upload_file(file_path)
-
-        # Merge results
-        return {
-            "transcription": transcription_result,
-            "analysis": analysis_result,
-            "emotional_stability": emotional_analysis,
-            "archive_url": s3_url
-        }
-        
+        # 3-6. Transcribe, analyze and archive (blocking work, off the event loop)
+        return await run_in_threadpool(
+            run_transcription_pipeline, file_path, audio_hash=audio_hash, pitch_backend=pitch_backend,
+            interview_id=interview_id, filename=file.filename, candidate_id=candidate_id,
+            filler_lexicons=filler_lexicons
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         # Manual cleanup since we told transcription_service NOT to do it
         if os.path.exists(file_path):
             os.remove(file_path)
+
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202, summary="Queue Audio for Transcription")
+async def submit_transcription_job(file: UploadFile = File(...), pitch_backend: Optional[str] = PITCH_BACKEND_QUERY,
+                                   interview_id: Optional[int] = INTERVIEW_ID_QUERY, candidate_id: Optional[str] = CANDIDATE_ID_QUERY,
+                                   filler_lexicons: Optional[str] = FILLER_LEXICONS_QUERY, db: Session = Depends(get_db)):
+    """
+    Uploads an audio file and queues it for background processing.
+
+    Returns a job ID right away. Poll `GET /jobs/{job_id}` for progress and the result.
+    """
+    extension = validate_extension(file.filename)
+    validate_pitch_backend(pitch_backend)
+    validate_filler_lexicons(filler_lexicons)
+    validate_interview(db, interview_id)
+    job_id = job_service.new_job_id()
+
+    # The file must outlive this request, so it is stored under the job ID
+    file_path, audio_hash = await upload_service.save_upload_file(file, f"{job_id}{extension}")
+
+    job = job_service.create_job(db, job_id, file.filename, file_path, audio_hash, pitch_backend,
+                                 interview_id, candidate_id, filler_lexicons)
+    return {"job_id": job.id, "status": job.status}
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse, summary="Get Transcription Job Status")
+def get_transcription_job(job_id: str, db: Session = Depends(get_db)):
+    """
+    Reports the job status and current pipeline stage.
+    The full result is included once the status is 'completed'.
+    """
+    job = job_service.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_service.job_to_response(job)
+
+def get_prosody_index(audio_hash: str, pitch_backend: Optional[str]):
+    validate_pitch_backend(pitch_backend)
+    index = load_index(audio_hash, index_variant(pitch_backend or settings.pitch_backend))
+    if index is None:
+        raise HTTPException(status_code=404, detail="No prosody index for this recording. Transcribe it first.")
+    return index
+
+@router.post("/prosody/{audio_hash}/windows", response_model=ProsodyWindowsResponse, summary="Stability for Custom Time Windows")
+def prosody_windows(audio_hash: str, request: ProsodyWindowsRequest):
+    """
+    Pitch/energy stability for arbitrary time ranges of an analysed recording.
+
+    `audio_hash` is returned by /transcribe. Every window is answered from the stored
+    prefix-sum index in O(1); the audio is not decoded again.
+    """
+    index = get_prosody_index(audio_hash, request.pitch_backend)
+    windows = index.windows([(w.start, w.end) for w in request.windows])
+    return {"audio_hash": audio_hash, "duration": round(index.duration, 2), "windows": windows}
+
+@router.get("/prosody/{audio_hash}/timeline", response_model=ProsodyWindowsResponse, summary="Sliding-Window Stability Timeline")
+def prosody_timeline(audio_hash: str, window_seconds: float = Query(default=30.0, gt=0), step_seconds: float = Query(default=5.0, gt=0),
+                     start: float = 0.0, end: Optional[float] = None, pitch_backend: Optional[str] = PITCH_BACKEND_QUERY):
+    """
+    Stability over a sliding window (e.g. 30s windows every 5s) for charting in the UI.
+    """
+    index = get_prosody_index(audio_hash, pitch_backend)
+    windows = index.timeline(window_seconds, step_seconds, start_time=start, end_time=end)
+    return {"audio_hash": audio_hash, "duration": round(index.duration, 2), "windows": windows}
+
+@router.websocket("/live")
+async def live_transcription(websocket: WebSocket):
+    """
+    Real-time transcription while the user is still recording.
+
+    Protocol (see test_live_transcription.py for a client):
+    1. Optional text message: {"type": "start", "sample_rate": 48000, "encoding": "pcm_s16le" | "float32",
+       "filler_lexicons": "en,acme"} (default: 16 kHz pcm_s16le, server lexicons).
+    2. Binary messages: raw mono audio frames, e.g. every 100-250 ms.
+       The server answers with {"type": "partial", "committed": [...], "tentative": [...], "metrics": {...}}
+       every few seconds of audio. Append `committed` segments; replace the previous `tentative` ones.
+    3. Text message {"type": "stop"}: the server transcribes the last few seconds and sends
+       {"type": "final", "transcription": {...}, "analysis": {...}}, then closes the socket.
+    """
+    await websocket.accept()
+    session: Optional[LiveTranscriber] = None
+    running: Optional[asyncio.Task] = None
+
+    async def run(call):
+        # Whisper runs in a thread; frames keep arriving meanwhile. A failed round is
+        # reported to the client instead of ending the task (and later the socket).
+        try:
+            await websocket.send_json(await run_in_threadpool(call))
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "detail": e.detail})
+        except Exception as e:
+            log_warning(f"Live transcription round failed: {e}")
+            await websocket.send_json({"type": "error", "detail": str(e)})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("text") is not None:
+                try:
+                    command = json.loads(message["text"])
+                except ValueError:
+                    command = None
+                if not isinstance(command, dict):
+                    await websocket.send_json({"type": "error", "detail": "Invalid message: expected a JSON object"})
+                    continue
+
+                if command.get("type") == "start" and session is None:
+                    try:
+                        session = LiveTranscriber(
+                            sample_rate=int(command.get("sample_rate", 16000)),
+                            encoding=command.get("encoding", "pcm_s16le"),
+                            filler_lexicons=command.get("filler_lexicons"),
+                        )
+                    except (TypeError, ValueError) as e:
+                        await websocket.send_json({"type": "error", "detail": str(e)})
+                        await websocket.close(code=1003)
+                        return
+                elif command.get("type") == "stop":
+                    if running:
+                        await running
+                    session = session or LiveTranscriber()
+                    await run(session.finish)
+                    await websocket.close()
+                    return
+
+            elif message.get("bytes") is not None:
+                session = session or LiveTranscriber()
+                session.add_audio(message["bytes"])
+                # One round at a time per connection; audio that arrives meanwhile joins the next round
+                if session.ready() and (running is None or running.done()):
+                    running = asyncio.create_task(run(session.step))
+    finally:
+        if running and not running.done():
+            running.cancel()
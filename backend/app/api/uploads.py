@@ -0,0 +1,94 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Header, Path
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..config import settings
+from ..database import get_db
+from ..schemas.job import JobSubmitResponse
+from ..schemas.upload import UploadInitiateRequest, UploadSessionResponse, UploadPartInfo
+from ..services import job_service, upload_service
+from .transcription import (
+    validate_extension, validate_pitch_backend, validate_filler_lexicons, validate_interview,
+    PITCH_BACKEND_QUERY, INTERVIEW_ID_QUERY, CANDIDATE_ID_QUERY, FILLER_LEXICONS_QUERY
+)
+
+router = APIRouter()
+
+# Resumable Uploads
+# -----------------
+# 1. POST   /uploads                         -> upload_id and the maximum part size
+# 2. PUT    /uploads/{id}/parts/{n}          -> raw bytes of part n (1-based), any order
+# 3. GET    /uploads/{id}                    -> which parts arrived (resume after a dropped connection)
+# 4. POST   /uploads/{id}/complete           -> stitches the parts together and queues a transcription job
+
+def get_upload_session(db: Session, upload_id: str):
+    session = upload_service.get_session(db, upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return session
+
+@router.post("", response_model=UploadSessionResponse, status_code=201, summary="Start a Resumable Upload")
+def initiate_upload(request: UploadInitiateRequest, db: Session = Depends(get_db)):
+    """
+    Creates an upload session. Split the file into parts of at most `part_size` bytes.
+    """
+    validate_extension(request.filename)
+    session = upload_service.create_session(db, request.filename, request.total_size)
+    return upload_service.session_to_response(session, parts=[])
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse, summary="Get Upload Progress")
+def get_upload(upload_id: str, db: Session = Depends(get_db)):
+    """Lists the parts received so far, so an interrupted client only re-sends the missing ones."""
+    return upload_service.session_to_response(get_upload_session(db, upload_id))
+
+@router.put("/{upload_id}/parts/{part_number}", response_model=UploadPartInfo, summary="Upload One Part")
+async def upload_part(request: Request, upload_id: str, part_number: int = Path(..., ge=1),
+                      x_part_sha256: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
+    """
+    Stores the raw request body as part `part_number`. Re-sending a part replaces it.
+    An optional `X-Part-SHA256` header is verified against the received bytes.
+    """
+    session = get_upload_session(db, upload_id)
+
+    # Reject oversized parts from the header, before reading the body
+    content_length = request.headers.get("content-length")
+    if content_length:
+        if not content_length.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header.")
+        if int(content_length) > settings.upload_part_size:
+            raise upload_service.payload_too_large(settings.upload_part_size)
+
+    return await upload_service.write_part(session, part_number, request.stream(), x_part_sha256)
+
+@router.post("/{upload_id}/complete", response_model=JobSubmitResponse, status_code=202, summary="Finish Upload and Queue Transcription")
+async def complete_upload(upload_id: str, pitch_backend: Optional[str] = PITCH_BACKEND_QUERY,
+                          interview_id: Optional[int] = INTERVIEW_ID_QUERY, candidate_id: Optional[str] = CANDIDATE_ID_QUERY,
+                          filler_lexicons: Optional[str] = FILLER_LEXICONS_QUERY, db: Session = Depends(get_db)):
+    """
+    Assembles the parts into the recording and queues it like `POST /transcription/jobs`.
+    Poll `GET /transcription/jobs/{job_id}` for the result.
+    """
+    validate_pitch_backend(pitch_backend)
+    validate_filler_lexicons(filler_lexicons)
+    validate_interview(db, interview_id)
+    session = get_upload_session(db, upload_id)
+    if session.status == "completed":
+        # Completing twice (e.g. the response was lost) returns the same job
+        return {"job_id": session.job_id, "status": job_service.get_job(db, session.job_id).status}
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}.")
+
+    extension = validate_extension(session.filename)
+    job_id = job_service.new_job_id()
+    file_path, audio_hash = await upload_service.assemble(session, f"{job_id}{extension}")
+
+    session.status = "completed"
+    session.job_id = job_id
+    db.commit()
+    job = job_service.create_job(db, job_id, session.filename, file_path, audio_hash, pitch_backend,
+                                 interview_id, candidate_id, filler_lexicons)
+    return {"job_id": job.id, "status": job.status}
+
+@router.delete("/{upload_id}", status_code=204, summary="Abort Upload")
+def abort_upload(upload_id: str, db: Session = Depends(get_db)):
+    """Discards the session and any parts stored for it."""
+    upload_service.abort_session(db, get_upload_session(db, upload_id))
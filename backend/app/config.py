@@ -9,13 +9,108 @@ class Settings(BaseSettings):
     debug: bool = True
     database_url: str = "sqlite:///./test.db"
     secret_key: str = "change_this_secret_key"
-    
+
+    # Database Connections
+    use_async_db: bool = False  # Serve the interview routes through an async engine (aiosqlite / asyncpg)
+    db_pool_size: int = 10  # Connections kept open per engine
+    db_max_overflow: int = 20  # Extra connections allowed under bursts
+    db_pool_recycle_seconds: int = 1800  # Reconnect older connections (server-side idle timeouts)
+    db_pool_timeout_seconds: float = 30.0  # Wait for a free connection before failing
+    db_pool_pre_ping: bool = True  # Check connections before use (survives database restarts)
+    sqlite_wal: bool = True  # WAL journal: readers are not blocked by a writer
+    sqlite_synchronous: str = "NORMAL"  # OFF | NORMAL | FULL | EXTRA
+    sqlite_busy_timeout_ms: int = 5000  # A writer waits this long for the lock instead of failing
+
+    # Listings, Export & Bulk Import
+    page_max_limit: int = 500  # Largest page a listing endpoint returns
+    export_batch_size: int = 1000  # Rows fetched per query while streaming an export
+    bulk_insert_batch_size: int = 1000  # Rows per executemany INSERT (and per transaction) in bulk imports
+
     # AWS Storage Config
     aws_access_key_id: str = "placeholder_key"
     aws_secret_access_key: str = "placeholder_secret"
     aws_region: str = "us-east-1"
     s3_bucket_name: str = "interview-recordings-bucket"
     use_s3_storage: bool = False  # Feature flag to enable/disable easily
+    s3_endpoint_url: str = ""  # S3-compatible endpoint, e.g. http://localhost:9000 (MinIO) or :5000 (moto_server); empty = AWS
+
+    # Background Archiving (S3)
+    s3_upload_workers: int = 2  # Recordings uploaded at the same time
+    s3_transfer_concurrency: int = 4  # Parallel parts per multipart upload
+    s3_multipart_threshold: int = 16 * 1024 * 1024  # Larger files are sent as multipart uploads
+    s3_multipart_chunksize: int = 8 * 1024 * 1024
+    s3_max_pool_connections: int = 10  # Raised automatically to workers * transfer concurrency
+    s3_connect_timeout_seconds: float = 10.0
+    s3_read_timeout_seconds: float = 60.0
+    s3_max_attempts: int = 6  # Upload attempts before an archive is marked failed
+    s3_retry_base_seconds: float = 30.0  # Backoff before retry n is base * 2^(n-1)
+    s3_retry_poll_seconds: float = 10.0  # How often due retries are picked up
+    s3_upload_lease_seconds: float = 3600.0  # An upload claimed longer ago is presumed dead (worker crashed) and retried
+    archive_spool_dir: str = "archive_spool"  # Recordings wait here until uploaded
+
+    # Background Job Queue
+    job_workers: int = 2  # Number of transcription jobs processed concurrently
+    pipeline_stage_workers: int = 8  # Threads shared by all pipelines for stages that run side by side
+
+    # Uploads
+    max_upload_bytes: int = 500 * 1024 * 1024  # Larger recordings are rejected with 413
+    upload_part_size: int = 8 * 1024 * 1024  # Max bytes per part of a resumable upload
+
+    # Whisper Worker Pool
+    whisper_model_name: str = "base"
+    whisper_workers: int = 0  # Worker processes for Whisper; 0 = run the model inside the API process
+    whisper_queue_size: int = 4  # Recordings allowed to wait for a free worker before we answer 503
+    whisper_torch_threads: int = 0  # Torch threads per worker; 0 = cpu_count // whisper_workers
+    whisper_retry_after_seconds: int = 30  # Retry-After value sent when the queue is full
+
+    # Speech Analysis
+    filler_lexicons: str = "en"  # Comma-separated filler lexicons, e.g. "en" or "en,acme" (see filler_matcher.py)
+    filler_lexicon_dir: str = "lexicons"  # Extra/customer lexicons as <name>.txt, one phrase per line
+
+    # Live Transcription (WebSocket)
+    live_step_seconds: float = 3.0  # New audio needed before the next transcription round
+    live_holdback_seconds: float = 2.0  # Segments ending this close to the live edge stay tentative
+    live_max_window_seconds: float = 25.0  # Force a commit before the buffer reaches Whisper's 30s window
+
+    # Model Lifecycle
+    preload_models: bool = True  # Load + warm up models at startup; /health/ready waits for it
+    preload_in_parent: bool = False  # Load weights when app.main is imported (gunicorn --preload shares them copy-on-write)
+    model_idle_timeout_seconds: int = 0  # Unload models unused for this long; 0 = never
+    model_eviction_check_interval_seconds: int = 60
+
+    # Stored Sessions
+    persist_sessions: bool = True  # Store every pipeline result (transcript, words, metrics) for later reads
+    trend_window: int = 5  # Sessions in the candidate trend's moving average
+    trend_ema_alpha: float = 0.3  # Weight of the newest session in the exponential moving average
+
+    # Transcription Result Cache
+    result_cache_enabled: bool = True
+    result_cache_max_bytes: int = 256 * 1024 * 1024  # LRU entries are evicted above this size
+    result_cache_include_analysis: bool = True  # Also cache speech + emotional analysis, not just the transcript
+
+    # Embedding Cache (semantic analysis)
+    embedding_cache_enabled: bool = True
+    embedding_cache_dir: str = "embedding_cache"  # Memory-mapped vectors + index, one pair per model
+    embedding_cache_memory_items: int = 10000  # Vectors kept in the in-process LRU tier
+    semantic_encode_batch_size: int = 64  # Texts per model.encode forward pass
+    semantic_block_size: int = 512  # Tile size for the redundancy matrix; bounds memory on long transcripts
+
+    # Audio Analysis
+    pitch_backend: str = "pyin"  # pyin (accurate) | yin | fast (vectorized YIN); see benchmarks/bench_pitch.py
+    prosody_index_dir: str = "prosody_indexes"  # Stored prefix-sum indexes for the prosody windows endpoint
+    # Rate the prosody features are computed at. 16000 reuses the buffer decoded for Whisper,
+    # 8000 is a reduced-rate mode (half the work), 0 decodes the file again at its native rate.
+    prosody_sample_rate: int = 16000
+    prosody_stream_threshold_seconds: float = 600.0  # Longer recordings are analysed block by block (0 = always)
+    prosody_stream_block_seconds: float = 30.0  # Audio held in memory at a time when streaming
+
+    # Observability
+    log_level: str = "INFO"  # DEBUG | INFO | WARNING | ERROR
+    log_format: str = "json"  # json (one object per line) | text
+    metrics_enabled: bool = True  # Prometheus text format at GET /metrics
+    server_timing_enabled: bool = True  # Per-request Server-Timing header (stage durations)
+
+    admin_token: str = ""  # Required in the X-Admin-Token header for /admin routes (empty = open, dev only)
 
     class Config:
         env_file = ".env"
@@ -1,8 +1,25 @@
-from fastapi import FastAPI
-from .api import interviews, transcription, analysis
-from .database import engine, Base
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from .utils.logging_config import setup_logging, stop_logging
+
+# Configure logging before the services are imported (some log while loading)
+setup_logging()
+
+from .api import metrics as metrics_api
+from .api import interviews, transcription, uploads, archives, sessions, candidates, cohorts, analysis, health, admin
+from .database import engine, async_engine, Base
 from .config import settings
+from .services.job_service import job_queue
+from .services.archive_service import archive_uploader
+from .services.model_registry import model_registry
+from .services.filler_matcher import get_matcher
+from .services.whisper_pool import whisper_pool
+from .services.upload_service import MULTIPART_OVERHEAD
 from .utils.helpers import log_debug_message
+from .utils.metrics import metrics, start_request_timings, server_timing_header
 
 # Introduction to FastAPI App Initialization:
 # This file is the entry point. It creates the FastAPI "app" instance.
@@ -12,11 +29,48 @@ from .utils.helpers import log_debug_message
 # In production, you would use Alembic migrations instead.
 Base.metadata.create_all(bind=engine)
 
+# Preload model weights at import time (e.g. `gunicorn --preload`).
+# The master process then holds the weights and forked workers share them
+# copy-on-write. Warmup is deferred to each worker (see lifespan below).
+if settings.preload_models and settings.preload_in_parent:
+    model_registry.preload(warm=False)
+    model_registry.share_with_forked_workers()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the default filler lexicons now: an unknown name in FILLER_LEXICONS
+    # fails the startup instead of every transcription
+    get_matcher()
+
+    # Load + warm up models in the background so /health/live answers right away
+    # while /health/ready keeps returning 503 until the models are usable.
+    if settings.preload_models:
+        threading.Thread(target=model_registry.preload, name="model-preload", daemon=True).start()
+    else:
+        model_registry.mark_ready()
+    model_registry.start_idle_evictor()
+
+    # Start the Whisper worker processes (if enabled), the background
+    # transcription workers (which also resume unfinished jobs) and the
+    # S3 uploader (which resumes unfinished archive uploads)
+    whisper_pool.start()
+    job_queue.start()
+    archive_uploader.start()
+    yield
+    archive_uploader.shutdown()
+    job_queue.shutdown()
+    whisper_pool.shutdown()
+    model_registry.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    stop_logging()
+
 app = FastAPI(
     title=settings.app_name,
     description="Backend API for Interview Performance Analyzer",
     version="0.1.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 # Include Routers
@@ -24,7 +78,52 @@ app = FastAPI(
 # This keeps main.py clean and manageable.
 app.include_router(interviews.router, prefix="/api/v1/interviews", tags=["interviews"])
 app.include_router(transcription.router, prefix="/api/v1/transcription", tags=["transcription"])
+app.include_router(uploads.router, prefix="/api/v1/uploads", tags=["uploads"])
+app.include_router(archives.router, prefix="/api/v1/archives", tags=["archives"])
+app.include_router(sessions.router, prefix="/api/v1/sessions", tags=["sessions"])
+app.include_router(candidates.router, prefix="/api/v1/candidates", tags=["candidates"])
+app.include_router(cohorts.router, prefix="/api/v1/cohorts", tags=["cohorts"])
 app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["semantic-analysis"])
+app.include_router(health.router, prefix="/health", tags=["health"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
+app.include_router(metrics_api.router, prefix="/metrics", tags=["metrics"])
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_seconds", "Time to the response headers, by route template, method and status",
+    ["method", "route", "status"]
+)
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Refuses request bodies above the upload limit based on Content-Length,
+    before any of the body is read. Chunked bodies without a length are
+    still stopped while they are written (see upload_service).
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.max_upload_bytes + MULTIPART_OVERHEAD:
+        return JSONResponse(status_code=413, content={"detail": f"Upload exceeds the limit of {settings.max_upload_bytes} bytes."})
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_request_timings(request: Request, call_next):
+    """
+    Observes every request in the http_request_seconds histogram and adds a
+    Server-Timing header with the durations recorded while handling it
+    (upload, pipeline stages, embedding, ...), readable in the browser devtools.
+    """
+    started = time.perf_counter()
+    timings = start_request_timings()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    # The route template keeps the label set small (no IDs); unmatched paths share one label.
+    # Newer FastAPI versions keep the router prefix in the effective route context.
+    context = request.scope.get("fastapi", {}).get("effective_route_context")
+    route = getattr(context, "path", None) or getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=response.status_code)
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = server_timing_header(timings, elapsed)
+    return response
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Index
+from ..database import Base
+from datetime import datetime
+
+class SessionScore(Base):
+    """
+    Database Model for the performance score of one stored session
+    (see session_comparison_service.calculate_session_score), computed once when
+    the session is saved and again only when its inputs change.
+    """
+    __tablename__ = "session_scores"
+    __table_args__ = (Index("ix_session_scores_candidate_created", "candidate_id", "created_at"),)
+
+    session_id = Column(String(36), ForeignKey("interview_sessions.id", ondelete="CASCADE"), primary_key=True)
+    candidate_id = Column(String, nullable=True)
+    final_score = Column(Float)
+    relevance = Column(Float)
+    stability = Column(Float)
+    pace = Column(Float)
+    clarity = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)  # Same as the session's created_at
+    # The session's point in its candidate's trend (set when folded into the rollup)
+    delta = Column(Float, nullable=True)  # Change from the previous session
+    trend = Column(String, nullable=True)  # baseline | improving | declining | stagnant
+    moving_average = Column(Float, nullable=True)
+    ema = Column(Float, nullable=True)
+
+class CandidateRollup(Base):
+    """
+    Database Model for a candidate's progress, maintained incrementally as sessions are saved.
+    The per-session points live on SessionScore; this row only holds the aggregates and
+    the last scores needed to advance them, so its size does not grow with the sessions.
+    """
+    __tablename__ = "candidate_rollups"
+
+    candidate_id = Column(String, primary_key=True)
+    session_count = Column(Integer, default=0)
+    average_score = Column(Float, nullable=True)  # Mean over all sessions
+    moving_average = Column(Float, nullable=True)  # Mean over the last settings.trend_window sessions
+    ema_score = Column(Float, nullable=True)  # Exponential moving average (settings.trend_ema_alpha)
+    best_score = Column(Float, nullable=True)
+    best_session_id = Column(String(36), nullable=True)
+    latest_score = Column(Float, nullable=True)
+    latest_created_at = Column(DateTime, nullable=True)  # Sessions older than this are merged by a replay
+    current_streak = Column(Integer, default=0)  # Consecutive sessions that beat the previous one
+    longest_streak = Column(Integer, default=0)
+    recent_scores = Column(Text, default="[]")  # JSON list of the last settings.trend_window scores, oldest first
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
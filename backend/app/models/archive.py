@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, BigInteger, DateTime
+from ..database import Base
+from datetime import datetime
+
+class ArchiveTask(Base):
+    """
+    Database Model for one recording waiting to be (or already) archived to S3.
+    Rows are the persistent upload queue: pending work survives a restart and
+    failed uploads are retried with backoff (see archive_service.py).
+    """
+    __tablename__ = "archive_tasks"
+
+    id = Column(String(36), primary_key=True, index=True)  # UUID4 string
+    status = Column(String, index=True, default="pending")  # pending | uploading | retrying | uploaded | failed
+    file_path = Column(String)  # Spooled copy of the recording, deleted once uploaded
+    bucket = Column(String)
+    object_name = Column(String)
+    size = Column(BigInteger, nullable=True)
+    audio_hash = Column(String(64), nullable=True, index=True)
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, nullable=True, index=True)  # When a 'retrying' task is due
+    claimed_at = Column(DateTime, nullable=True)  # When a worker claimed the current/last attempt (lease start)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    uploaded_at = Column(DateTime, nullable=True)
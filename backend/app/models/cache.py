@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from ..database import Base
+from datetime import datetime
+
+class CachedTranscription(Base):
+    """
+    Content-addressed cache of pipeline results.
+    The key is derived from the SHA-256 of the recording plus the model name and
+    options, so re-uploads of the same file are served without running Whisper.
+    """
+    __tablename__ = "transcription_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256(audio_hash | model | options)
+    audio_hash = Column(String(64), index=True)  # sha256 of the uploaded file
+    model_name = Column(String)
+    options = Column(Text)  # JSON-encoded options that went into the key
+    payload = Column(Text)  # JSON-encoded transcription (+ optional analysis)
+    size_bytes = Column(Integer)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)  # Drives LRU eviction
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func, literal_column
 from ..database import Base  # Import Base from the database.py file
 from datetime import datetime
 
@@ -19,3 +19,11 @@ class Interview(Base):
     # 2. Columns: Define the data types (Integer, String, etc.) for each field.
     # 3. primary_key=True: This field uniquely identifies each row.
     # 4. index=True: Makes searching by this column faster.
+
+# Keyset pagination / export walk the table in (created_at, id) order.
+# created_at is nullable, and NULL never compares with a cursor, so the sort key
+# treats a missing created_at as the epoch (the oldest). The index is on the
+# same expression, so the seeks stay index-backed.
+SORT_CREATED_AT_DEFAULT = datetime(1970, 1, 1)
+SORT_CREATED_AT = func.coalesce(Interview.created_at, literal_column("'1970-01-01 00:00:00.000000'"))
+Index("ix_interviews_keyset", SORT_CREATED_AT, Interview.id)
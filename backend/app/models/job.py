@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from ..database import Base
+from datetime import datetime
+
+class TranscriptionJob(Base):
+    """
+    Database Model for a background transcription job.
+    Jobs are persisted so that queued work survives a server restart.
+    """
+    __tablename__ = "transcription_jobs"
+
+    id = Column(String(36), primary_key=True, index=True)  # UUID4 string
+    status = Column(String, index=True, default="queued")  # queued | running | completed | failed
+    stage = Column(String, nullable=True)  # Pipeline stages running right now (comma-separated)
+    stage_index = Column(Integer, default=0)  # Finished pipeline stages
+    filename = Column(String)  # Original filename supplied by the client
+    file_path = Column(String)  # Where the upload waits on disk until processed
+    audio_hash = Column(String(64), nullable=True)  # SHA-256 of the upload, used by the result cache
+    pitch_backend = Column(String, nullable=True)  # F0 tracker requested for this job (None = config default)
+    interview_id = Column(Integer, nullable=True)  # Interview the stored session is attached to
+    candidate_id = Column(String, nullable=True)  # Candidate whose trend the session counts toward
+    filler_lexicons = Column(String, nullable=True)  # Filler lexicons for the speech analysis (None = config default)
+    result = Column(Text, nullable=True)  # JSON-encoded pipeline output
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,98 @@
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from ..database import Base
+from datetime import datetime
+
+# Stored Interview Sessions
+# -------------------------
+# Every processed recording is kept as a session so past results can be
+# reopened without running the ML pipeline again:
+#
+#   interviews 1--n interview_sessions 1--n transcript_segments 1--n transcript_words
+#                                      1--n metric_results (one row per kind)
+#
+# The headline numbers (WPM, fillers, stability, relevance) are also columns on
+# the session row, so lists and dashboards never have to parse the JSON payloads.
+
+class InterviewSession(Base):
+    """
+    Database Model for one analysed recording (an answer or a whole interview).
+    """
+    __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # Sessions of one interview / one candidate, in time order
+        Index("ix_interview_sessions_interview_created", "interview_id", "created_at"),
+        Index("ix_interview_sessions_candidate_created", "candidate_id", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True, index=True)  # UUID4 string
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=True)
+    candidate_id = Column(String, nullable=True)  # Caller's ID for the person interviewed (drives the trend rollups)
+    job_id = Column(String(36), nullable=True, index=True)  # Transcription job that produced it (if any)
+    filename = Column(String, nullable=True)
+    audio_hash = Column(String(64), nullable=True, index=True)
+    full_text = Column(Text)
+    duration_seconds = Column(Float, default=0.0)
+    word_count = Column(Integer, default=0)
+    speaking_rate_wpm = Column(Float, nullable=True)
+    filler_count = Column(Integer, nullable=True)
+    pause_count = Column(Integer, nullable=True)
+    emotional_stability_score = Column(Float, nullable=True)
+    semantic_relevance = Column(Float, nullable=True)  # Set once a semantic analysis is stored
+    archive_url = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    segments = relationship(
+        "TranscriptSegment", back_populates="session", order_by="TranscriptSegment.position",
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    metrics = relationship("MetricResult", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+
+class TranscriptSegment(Base):
+    """
+    Database Model for one Whisper segment of a session.
+    """
+    __tablename__ = "transcript_segments"
+    __table_args__ = (UniqueConstraint("session_id", "position", name="uq_transcript_segments_session_position"),)
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(36), ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # 0-based order within the session
+    start = Column(Float)
+    end = Column(Float)
+    text = Column(Text)
+
+    session = relationship("InterviewSession", back_populates="segments")
+
+class TranscriptWord(Base):
+    """
+    Database Model for one timestamped word. `session_id` is stored as well so
+    the words of a session are read with one indexed range scan.
+    """
+    __tablename__ = "transcript_words"
+    __table_args__ = (Index("ix_transcript_words_session_position", "session_id", "position"),)
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(36), ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False)
+    segment_id = Column(Integer, ForeignKey("transcript_segments.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # 0-based order within the session
+    word = Column(String)
+    start = Column(Float)
+    end = Column(Float)
+
+class MetricResult(Base):
+    """
+    Database Model for one analysis result of a session, stored as JSON:
+    'speech' (WPM, pauses, fillers), 'emotional_stability', 'semantic', 'timings'.
+    """
+    __tablename__ = "metric_results"
+    __table_args__ = (UniqueConstraint("session_id", "kind", name="uq_metric_results_session_kind"),)
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(36), ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(32), nullable=False)
+    payload = Column(Text)  # JSON-encoded result
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    session = relationship("InterviewSession", back_populates="metrics")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from ..database import Base
+from datetime import datetime
+
+class UploadSession(Base):
+    """
+    Database Model for a resumable (multi-part) upload.
+    The parts themselves live on disk (uploads/parts/<id>/); this row tracks the session.
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(36), primary_key=True, index=True)  # UUID4 string
+    filename = Column(String)  # Original filename supplied by the client
+    status = Column(String, index=True, default="open")  # open | completed | aborted
+    total_size = Column(BigInteger, nullable=True)  # Size announced by the client, checked on completion
+    job_id = Column(String(36), nullable=True)  # Transcription job created on completion
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,12 +1,15 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 class AnalysisRequest(BaseModel):
     """
     Schema for the semantic analysis input.
     """
-    transcript: Dict[str, Any]  # The full JSON output from the transcription service
+    transcript: Optional[Dict[str, Any]] = None  # The full JSON output from the transcription service
     resume_text: str
+    # A stored session: its transcript is used when `transcript` is omitted,
+    # and the result is saved with the session
+    session_id: Optional[str] = None
 
 class AnalysisChunk(BaseModel):
     timestamp: str
@@ -31,3 +34,31 @@ class AnalysisResponse(BaseModel):
     chunk_analysis: List[AnalysisChunk]
     redundancy_alerts: List[RedundancyAlert]
     topic_drift_timeline: List[float]
+
+class BatchTranscript(BaseModel):
+    id: str
+    transcript: Dict[str, Any]  # Same shape as AnalysisRequest.transcript
+
+class BatchResume(BaseModel):
+    id: str
+    resume_text: str
+
+class BatchAnalysisRequest(BaseModel):
+    """
+    Schema for analysing many transcripts against many resumes in one call.
+    If `pairs` is omitted, every transcript is scored against every resume.
+    """
+    transcripts: List[BatchTranscript]
+    resumes: List[BatchResume]
+    pairs: Optional[List[Tuple[str, str]]] = None  # (transcript_id, resume_id)
+    batch_size: Optional[int] = None  # model.encode batch size (defaults to config)
+
+class BatchAnalysisResult(BaseModel):
+    """
+    One line of the NDJSON batch response.
+    Exactly one of `result` / `error` is set.
+    """
+    transcript_id: str
+    resume_id: str
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
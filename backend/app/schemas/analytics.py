@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import datetime
+
+class TrendPoint(BaseModel):
+    """One session in a candidate's trend."""
+    session_id: str
+    created_at: datetime
+    score: float  # 0-100
+    components: Dict[str, float]  # relevance, stability, pace, clarity (0-100)
+    delta: float  # Change from the previous session
+    trend: str  # baseline | improving | declining | stagnant
+    moving_average: float
+    ema: float
+
+class CandidateTrendResponse(BaseModel):
+    """
+    A candidate's progress across all stored sessions, maintained as sessions are saved.
+    """
+    candidate_id: str
+    session_count: int
+    average_score: Optional[float] = None
+    moving_average: Optional[float] = None  # Over the last `trend_window` sessions
+    ema_score: Optional[float] = None
+    best_score: Optional[float] = None
+    best_session_id: Optional[str] = None
+    latest_score: Optional[float] = None
+    current_streak: int  # Consecutive sessions that beat the previous one
+    longest_streak: int
+    series: List[TrendPoint]  # Oldest first
+    updated_at: datetime
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class ArchiveStatusResponse(BaseModel):
+    """
+    State of a background S3 upload. Poll until `status` is 'uploaded' or 'failed'.
+    """
+    archive_id: str
+    status: str  # pending | uploading | retrying | uploaded | failed
+    archive_url: str  # s3:// URI the recording is (or will be) stored under
+    size: Optional[int] = None
+    attempts: int
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    uploaded_at: Optional[datetime] = None
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional
+
+class CohortSession(BaseModel):
+    """Metrics of one session, as accepted by calculate_session_score."""
+    id: str
+    overall_relevance: float = 0.0
+    overall_emotional_stability_score: float = 0.0
+    speaking_rate_wpm: float = 0
+    filler_words_count: float = 0
+    duration_seconds: float = 0
+
+class CohortRankRequest(BaseModel):
+    sessions: List[CohortSession] = Field(..., min_length=1)
+
+class CohortRankedSession(BaseModel):
+    id: str
+    final_score: float  # 0-100
+    components: Dict[str, float]
+    percentile: float  # 0-100: share of the cohort scoring lower (ties count half)
+
+class CohortRankResponse(BaseModel):
+    """
+    Scores and percentile ranks of every session in a cohort.
+    """
+    count: int
+    median_score: float
+    p25_score: float
+    p75_score: float
+    results: List[CohortRankedSession]
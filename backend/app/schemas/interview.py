@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 # Introduction to Pydantic Schemas:
@@ -15,7 +15,29 @@ class InterviewCreate(InterviewBase):
 
 class InterviewResponse(InterviewBase):
     id: int
-    created_at: datetime
+    created_at: Optional[datetime] = None  # Rows inserted without one (they sort as the oldest)
 
     class Config:
         from_attributes = True  # Allows converting ORM objects 
+
+class InterviewPage(BaseModel):
+    """
+    One page of interviews, newest first. Pass `next_cursor` back as `?cursor=`
+    to get the following page; it is None on the last page.
+    """
+    items: List[InterviewResponse]
+    next_cursor: Optional[str] = None
+
+class BulkImportError(BaseModel):
+    index: int  # 0-based position of the row in the array / NDJSON stream
+    detail: str
+
+class BulkImportResponse(BaseModel):
+    """
+    Outcome of a bulk import. Rows that fail (invalid JSON, validation, database
+    error) are listed in `errors`; every other row is inserted.
+    """
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkImportError]
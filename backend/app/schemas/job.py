@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+class JobSubmitResponse(BaseModel):
+    """
+    Returned immediately after an upload is accepted into the job queue.
+    """
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    """
+    Schema for polling a background transcription job.
+    `result` is only populated once the job has completed.
+    """
+    job_id: str
+    status: str
+    stage: Optional[str] = None  # Stages running right now, comma-separated
+    progress: float  # 0.0 - 1.0, based on completed pipeline stages
+    filename: str
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class TimeWindow(BaseModel):
+    start: float  # seconds
+    end: float
+
+class ProsodyWindowsRequest(BaseModel):
+    """
+    Arbitrary time ranges to score against a recording that was already analysed.
+    """
+    windows: List[TimeWindow]
+    pitch_backend: Optional[str] = None  # Must match the backend used for the analysis (default: config)
+
+class ProsodyWindow(BaseModel):
+    start: float
+    end: float
+    pitch_stability: float
+    energy_stability: float
+    pitch_mean_hz: float
+    voiced_ratio: float
+    emotional_state: str
+
+class ProsodyWindowsResponse(BaseModel):
+    audio_hash: str
+    duration: float
+    windows: List[ProsodyWindow]
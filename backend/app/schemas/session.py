@@ -0,0 +1,52 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+class SessionSummary(BaseModel):
+    """
+    A stored interview session (one analysed recording), without the transcript.
+    """
+    session_id: str
+    interview_id: Optional[int] = None
+    candidate_id: Optional[str] = None
+    job_id: Optional[str] = None
+    filename: Optional[str] = None
+    audio_hash: Optional[str] = None
+    duration_seconds: float
+    word_count: int
+    speaking_rate_wpm: Optional[float] = None
+    filler_count: Optional[int] = None
+    pause_count: Optional[int] = None
+    emotional_stability_score: Optional[float] = None
+    semantic_relevance: Optional[float] = None
+    archive_url: Optional[str] = None
+    created_at: datetime
+
+class SessionDetail(SessionSummary):
+    """
+    A stored session with its full analysis results, keyed by kind
+    ('speech', 'emotional_stability', 'semantic', 'timings').
+    """
+    full_text: str
+    metrics: Dict[str, Any]
+
+class StoredWord(BaseModel):
+    word: str
+    start: float
+    end: float
+
+class StoredSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+    words: List[StoredWord]
+
+class SessionTranscript(BaseModel):
+    """Same shape as the `transcription` returned by the upload endpoints."""
+    full_text: str
+    segments: List[StoredSegment]
+
+class SessionFeedback(BaseModel):
+    session_id: str
+    score: Dict[str, Any]  # final_score (0-100) and component scores
+    feedback: Dict[str, Any]  # summary, strengths, improvements, grade
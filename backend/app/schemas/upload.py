@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class UploadInitiateRequest(BaseModel):
+    """
+    Starts a resumable upload. `total_size` is optional but lets the server
+    reject oversized recordings before any data is sent.
+    """
+    filename: str
+    total_size: Optional[int] = Field(default=None, gt=0)
+
+class UploadPartInfo(BaseModel):
+    part_number: int
+    size: int
+    sha256: Optional[str] = None  # Only returned right after the part is stored
+
+class UploadSessionResponse(BaseModel):
+    """
+    State of a resumable upload. A client that lost its connection calls
+    GET on the session and re-sends only the parts that are missing.
+    """
+    upload_id: str
+    filename: str
+    status: str
+    total_size: Optional[int] = None
+    received_bytes: int
+    part_size: int  # Maximum size of one part
+    parts: List[UploadPartInfo]
+    job_id: Optional[str] = None
+    created_at: datetime
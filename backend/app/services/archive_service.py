@@ -0,0 +1,264 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, or_
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.archive import ArchiveTask
+from ..utils.helpers import log_info, log_warning, log_error
+from ..utils.metrics import metrics
+from .s3_service import s3_service
+
+# Background Archiving
+# --------------------
+# Uploading a recording to S3 can take longer than analysing it, and used to
+# fail silently (the archive URL was just None). Instead, the pipeline only
+# *queues* the recording and the response goes out right away:
+#
+# 1. `archive_file` hard-links the upload into settings.archive_spool_dir (so the
+#    caller may delete its copy) and stores an ArchiveTask row.
+# 2. A small pool of uploader threads (settings.s3_upload_workers, so S3 traffic
+#    never takes over the machine) sends it with the shared, pooled S3 client.
+# 3. A failed upload is retried with exponential backoff; after s3_max_attempts the
+#    task is marked failed and the spooled file is kept for a manual retry.
+#
+# Because the queue is the ArchiveTask table, pending uploads are resumed after a
+# restart. Clients poll GET /api/v1/archives/{archive_id} for the status.
+#
+# Several worker processes share the table, so a task is claimed with a single
+# conditional UPDATE: only the process whose UPDATE changed the row uploads it.
+# The claim is a lease (settings.s3_upload_lease_seconds): an 'uploading' task
+# whose claim is older than that belongs to a worker that died, and is queued again.
+
+# Longest wait between two attempts
+MAX_BACKOFF_SECONDS = 3600
+
+S3_UPLOAD_SECONDS = metrics.histogram("s3_upload_seconds", "Duration of S3 upload attempts", ["outcome"])
+
+class ArchiveUploader:
+    """
+    Uploads spooled recordings on a fixed-size thread pool and retries failures.
+    """
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._scheduler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._inflight = set()  # Task IDs submitted and not finished yet
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the uploader pool and the retry scheduler, and resumes unfinished uploads.
+        Does nothing while S3 storage is disabled.
+        """
+        if self._executor is not None or not s3_service.enabled:
+            return
+        os.makedirs(settings.archive_spool_dir, exist_ok=True)
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="archive-upload")
+        self._submit_due()
+        self._scheduler = threading.Thread(target=self._schedule_loop, name="archive-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def shutdown(self):
+        """Stops the scheduler. Uploads cut short are resumed on the next start."""
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, task_id: str):
+        if self._executor is None:
+            self.start()
+            if self._executor is None:
+                return
+        with self._lock:
+            if task_id in self._inflight:
+                return
+            self._inflight.add(task_id)
+        self._executor.submit(self._upload, task_id)
+
+    def _release_expired_claims(self, db):
+        # An upload whose worker died (lease expired) starts again from scratch. Uploads
+        # still running in another process keep their claim. Rows claimed before
+        # claimed_at existed have no timestamp and are released too.
+        expired = datetime.utcnow() - timedelta(seconds=settings.s3_upload_lease_seconds)
+        released = (
+            db.query(ArchiveTask)
+            .filter(ArchiveTask.status == "uploading")
+            .filter(or_(ArchiveTask.claimed_at.is_(None), ArchiveTask.claimed_at < expired))
+            .update({ArchiveTask.status: "pending", ArchiveTask.next_attempt_at: None}, synchronize_session=False)
+        )
+        db.commit()
+        if released:
+            log_warning(f"Released {released} archive uploads with an expired claim")
+
+    def _schedule_loop(self):
+        while not self._stop.wait(settings.s3_retry_poll_seconds):
+            try:
+                self._submit_due()
+            except Exception as e:
+                log_error(f"Archive scheduler error: {e}")
+
+    def _submit_due(self):
+        """Submits every pending task and every retry whose backoff has elapsed."""
+        db = SessionLocal()
+        try:
+            self._release_expired_claims(db)
+            now = datetime.utcnow()
+            due = (
+                db.query(ArchiveTask.id, ArchiveTask.status, ArchiveTask.next_attempt_at)
+                .filter(ArchiveTask.status.in_(["pending", "retrying"]))
+                .order_by(ArchiveTask.created_at)
+                .all()
+            )
+        finally:
+            db.close()
+        for task_id, status, next_attempt_at in due:
+            if status == "pending" or next_attempt_at is None or next_attempt_at <= now:
+                self.submit(task_id)
+
+    def _upload(self, task_id: str):
+        """
+        Uploads one task inside a worker thread.
+        Each worker uses its own database session.
+        """
+        db = SessionLocal()
+        try:
+            # Claim atomically: another process may have submitted the same task
+            now = datetime.utcnow()
+            claimed = (
+                db.query(ArchiveTask)
+                .filter(ArchiveTask.id == task_id, ArchiveTask.status.in_(["pending", "retrying"]))
+                .filter(or_(ArchiveTask.next_attempt_at.is_(None), ArchiveTask.next_attempt_at <= now))
+                .update({
+                    ArchiveTask.status: "uploading",
+                    ArchiveTask.claimed_at: now,
+                    ArchiveTask.attempts: func.coalesce(ArchiveTask.attempts, 0) + 1,
+                }, synchronize_session=False)
+            )
+            db.commit()
+            if claimed != 1:
+                return
+            task = db.query(ArchiveTask).filter(ArchiveTask.id == task_id).one()
+
+            started = time.perf_counter()
+            try:
+                s3_service.upload(task.file_path, task.object_name)
+            except Exception as e:
+                S3_UPLOAD_SECONDS.observe(time.perf_counter() - started, outcome="error")
+                task.last_error = str(e)
+                # A missing spool file will not come back; anything else may be temporary
+                if isinstance(e, FileNotFoundError) or task.attempts >= settings.s3_max_attempts:
+                    task.status = "failed"
+                    task.next_attempt_at = None
+                    log_error(f"Archive {task.id} failed after {task.attempts} attempts: {e}", archive_id=task.id)
+                else:
+                    backoff = min(settings.s3_retry_base_seconds * 2 ** (task.attempts - 1), MAX_BACKOFF_SECONDS)
+                    task.status = "retrying"
+                    task.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff)
+                    log_warning(f"Archive {task.id} upload failed, retrying in {backoff:.0f}s: {e}", archive_id=task.id)
+                db.commit()
+                return
+
+            S3_UPLOAD_SECONDS.observe(time.perf_counter() - started, outcome="ok")
+            task.status = "uploaded"
+            task.uploaded_at = datetime.utcnow()
+            task.next_attempt_at = None
+            task.last_error = None
+            db.commit()
+            if os.path.exists(task.file_path):
+                os.remove(task.file_path)
+        except Exception as e:
+            log_error(f"Archive {task_id} crashed: {e}", archive_id=task_id)
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight.discard(task_id)
+
+# Singleton instance
+archive_uploader = ArchiveUploader(max_workers=settings.s3_upload_workers)
+
+metrics.gauge("archive_uploads_in_flight", "Archive uploads submitted and not finished",
+              callback=lambda: len(archive_uploader._inflight))
+
+def _spool(file_path: str, task_id: str) -> str:
+    """Keeps the recording for the uploader: a hard link (instant) or a copy across filesystems."""
+    os.makedirs(settings.archive_spool_dir, exist_ok=True)
+    spool_path = os.path.join(settings.archive_spool_dir, task_id + os.path.splitext(file_path)[1])
+    try:
+        os.link(file_path, spool_path)
+    except OSError:
+        shutil.copyfile(file_path, spool_path)
+    return spool_path
+
+def archive_file(file_path: str, audio_hash: Optional[str] = None, object_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Queues a recording for upload to S3 and returns immediately.
+
+    Args:
+        file_path (str): The recording. It may be deleted as soon as this returns.
+        audio_hash (str): SHA-256 of the recording, stored for reference.
+        object_name (str): S3 object name. Defaults to the file name.
+
+    Returns:
+        dict: `archive_summary` of the new task (ID to poll, status and target URI).
+    """
+    task_id = str(uuid.uuid4())
+    spool_path = _spool(file_path, task_id)
+    task = ArchiveTask(
+        id=task_id, status="pending", file_path=spool_path, bucket=settings.s3_bucket_name,
+        object_name=object_name or os.path.basename(file_path), size=os.path.getsize(spool_path),
+        audio_hash=audio_hash, attempts=0
+    )
+    db = SessionLocal()
+    try:
+        db.add(task)
+        db.commit()
+        db.refresh(task)
+        summary = archive_summary(task)
+    finally:
+        db.close()
+    archive_uploader.submit(task_id)
+    return summary
+
+def get_task(db, archive_id: str) -> Optional[ArchiveTask]:
+    return db.query(ArchiveTask).filter(ArchiveTask.id == archive_id).first()
+
+def retry_task(db, task: ArchiveTask) -> ArchiveTask:
+    """Queues a failed upload again with a fresh set of attempts."""
+    if not os.path.exists(task.file_path):
+        raise FileNotFoundError("The spooled recording no longer exists.")
+    task.status = "pending"
+    task.attempts = 0
+    task.next_attempt_at = None
+    db.commit()
+    archive_uploader.submit(task.id)
+    return task
+
+def _uri(task: ArchiveTask) -> str:
+    return f"s3://{task.bucket}/{task.object_name}"
+
+def archive_summary(task: ArchiveTask) -> Dict[str, Any]:
+    """The JSON-safe part of the status that goes into pipeline results."""
+    return {"archive_id": task.id, "status": task.status, "archive_url": _uri(task)}
+
+def task_to_response(task: ArchiveTask) -> dict:
+    """Converts an ArchiveTask row into the ArchiveStatusResponse shape."""
+    return {
+        **archive_summary(task),
+        "size": task.size,
+        "attempts": task.attempts or 0,
+        "next_attempt_at": task.next_attempt_at,
+        "last_error": task.last_error,
+        "created_at": task.created_at,
+        "uploaded_at": task.uploaded_at,
+    }
@@ -1,8 +1,202 @@
 import numpy as np
 import librosa
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from ..config import settings
+from ..utils.helpers import log_warning
+from .pitch_tracking import estimate_f0, DEFAULT_FMIN
+from .prosody_index import ProsodyIndex, save_index
+from .audio_decode import (
+    decode_audio, to_prosody_rate, audio_duration, array_blocks, resample_blocks, stream_audio, DECODE_SAMPLE_RATE
+)
 
-def get_audio_features(file_path: str, transcript_segments: List[Dict]) -> Dict[str, Any]:
+def frame_settings(sr: int) -> Tuple[int, int]:
+    """
+    Frame settings shared by the energy and pitch extractors, for a sample rate.
+    The frame must hold two periods of the lowest pitch (YIN needs it), rounded up
+    to a power of two; the hop is a quarter frame. This gives 2048/512 at 44.1 and
+    48 kHz (the original settings), 1024/256 at 16 kHz and 512/128 at 8 kHz.
+    """
+    frame_length = int(2 ** np.ceil(np.log2(2 * sr / DEFAULT_FMIN)))
+    return frame_length, frame_length // 4
+
+def index_variant(pitch_backend: str) -> str:
+    """Name under which prosody indexes are stored: depends on the pitch backend and the analysis rate."""
+    return f"{pitch_backend}_{settings.prosody_sample_rate or 'native'}"
+
+def extract_prosody_frames(y: np.ndarray, sr: int, pitch_backend: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Computes the frame-level prosodic features of a recording.
+
+    Returns:
+        Tuple: (f0 per frame with 0 = unvoiced, RMS energy per frame, seconds per frame)
+    """
+    frame_length, hop_length = frame_settings(sr)
+
+    # 1. Extract Energy (RMS) - "Loudness"
+    # frame_length corresponds to ~50ms windows
+    rmse = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
+    
+    # 2. Extract Pitch (Fundamental Frequency - F0)
+    # By default librosa.pyin (Probabilistic YIN) for robust pitch tracking;
+    # faster backends trade a little accuracy for speed on bulk workloads.
+    # fmin/fmax are limited to human voice range (50Hz - 500Hz covers most speech)
+    # Unvoiced frames come back as 0
+    f0 = estimate_f0(y, sr, backend=pitch_backend or settings.pitch_backend, frame_length=frame_length, hop_length=hop_length)
+    
+    # Time per frame in seconds
+    return f0, rmse, hop_length / sr
+
+def extract_prosody_frames_streaming(blocks: Iterable[np.ndarray], sr: int,
+                                     pitch_backend: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Same output as `extract_prosody_frames`, computed block by block.
+    
+    Only the current block (plus less than one frame carried over to the next one)
+    and the compact per-frame arrays are held in memory, so peak memory does not
+    grow with the length of the recording.
+    
+    Frames are cut exactly like the one-shot version (half a frame of silence padded
+    at both ends, then every hop), so energy and the "fast" pitch tracker give the
+    same values. pyin's HMM smoothing and the "yin" silence gate only see one block
+    at a time and can differ slightly near block edges.
+    """
+    frame_length, hop_length = frame_settings(sr)
+    pitch_backend = pitch_backend or settings.pitch_backend
+    f0_parts, rmse_parts = [], []
+    
+    def consume(buffer: np.ndarray) -> np.ndarray:
+        # Analyse every complete frame in the buffer, return the samples the next frame still needs
+        if len(buffer) < frame_length:
+            return buffer
+        n_frames = 1 + (len(buffer) - frame_length) // hop_length
+        usable = buffer[:(n_frames - 1) * hop_length + frame_length]
+        rmse_parts.append(librosa.feature.rms(y=usable, frame_length=frame_length, hop_length=hop_length, center=False)[0])
+        f0_parts.append(estimate_f0(usable, sr, backend=pitch_backend, frame_length=frame_length,
+                                    hop_length=hop_length, center=False))
+        return buffer[n_frames * hop_length:]
+    
+    padding = np.zeros(frame_length // 2, dtype=np.float32)
+    carry = padding
+    for block in blocks:
+        carry = consume(np.concatenate([carry, np.asarray(block, dtype=np.float32)]))
+    consume(np.concatenate([carry, padding]))
+    
+    f0 = np.concatenate(f0_parts) if f0_parts else np.zeros(0)
+    rmse = np.concatenate(rmse_parts) if rmse_parts else np.zeros(0)
+    return f0, rmse, hop_length / sr
+
+def summarize_segments(index: ProsodyIndex, transcript_segments: List[Dict]) -> Dict[str, Any]:
+    """
+    Stability scores per transcript segment and overall, read from the prosody index.
+    Each segment is O(1): a few prefix-sum lookups instead of slicing the frame arrays.
+    """
+    # Convert every segment's time range to frame indices
+    bounds = [index.frame_range(seg.get("start", 0), seg.get("end", 0)) for seg in transcript_segments]
+    
+    # Ensure indices are within bounds
+    kept = [i for i, (start_frame, end_frame) in enumerate(bounds)
+            if not (start_frame >= index.num_frames or end_frame > index.num_frames)]
+    
+    stats = index.window_stats(
+        np.array([bounds[i][0] for i in kept], dtype=np.int64),
+        np.array([bounds[i][1] for i in kept], dtype=np.int64),
+    )
+    overall_pitch_variances = stats["pitch_stability"].tolist()
+    overall_energy_variances = stats["energy_stability"].tolist()
+    
+    segment_analysis = []
+    for row, i in enumerate(kept):
+        segment = transcript_segments[i]
+        start_time = segment.get("start", 0)
+        end_time = segment.get("end", 0)
+        pitch_stability_score = overall_pitch_variances[row]
+        energy_stability_score = overall_energy_variances[row]
+        
+        segment_analysis.append({
+            "timestamp": f"{round(start_time, 1)}s - {round(end_time, 1)}s",
+            "text": segment.get("text", ""),
+            "pitch_stability": round(float(pitch_stability_score), 2),
+            "energy_stability": round(float(energy_stability_score), 2),
+            "emotional_state": "Stable" if (pitch_stability_score > 0.7 and energy_stability_score > 0.7) else "Variable"
+        })
+        
+    # Calculate overall score (0.0 to 1.0)
+    if overall_pitch_variances:
+        avg_pitch_stability = np.mean(overall_pitch_variances)
+        avg_energy_stability = np.mean(overall_energy_variances)
+        overall_score = (avg_pitch_stability + avg_energy_stability) / 2
+    else:
+        overall_score = 0.0
+        
+    return {
+        "overall_emotional_stability_score": round(float(overall_score), 2),
+        "segment_analysis": segment_analysis,
+        "metrics": {
+            "average_pitch_stability": round(float(np.mean(overall_pitch_variances)), 2) if overall_pitch_variances else 0,
+            "average_energy_stability": round(float(np.mean(overall_energy_variances)), 2) if overall_energy_variances else 0
+        }
+    }
+
+def build_prosody_index(file_path: str, pitch_backend: Optional[str] = None, audio_hash: Optional[str] = None,
+                        audio: Optional[np.ndarray] = None, audio_sr: int = DECODE_SAMPLE_RATE) -> ProsodyIndex:
+    """
+    Extracts the frame-level pitch and energy of a recording and builds its prosody index.
+    This part does not need the transcript, so the pipeline runs it alongside Whisper.
+    
+    `pitch_backend` picks the F0 tracker ("pyin", "yin" or "fast", see pitch_tracking.py).
+    Defaults to settings.pitch_backend.
+    
+    If `audio_hash` is given, the index is stored so stability for any other
+    time window can be computed later without touching the audio again.
+    
+    `audio` is the already decoded recording (float32 mono at `audio_sr`), shared
+    with Whisper so the file is not decoded a second time. Without it the file is
+    decoded here. settings.prosody_sample_rate picks the analysis rate.
+    
+    Recordings longer than settings.prosody_stream_threshold_seconds are analysed
+    in blocks, so the prosody side adds only a block of memory however long the
+    interview is. A shared `audio` buffer is itself the whole recording, though
+    (Whisper needs it); without one, long files are read from disk block by block.
+    """
+    pitch_backend = pitch_backend or settings.pitch_backend
+    threshold = settings.prosody_stream_threshold_seconds
+    block_seconds = settings.prosody_stream_block_seconds
+    
+    if settings.prosody_sample_rate and audio is not None:
+        # Reuse the shared buffer (resampled only in reduced-rate mode)
+        sr = settings.prosody_sample_rate
+        if threshold and len(audio) / audio_sr <= threshold:
+            y = to_prosody_rate(audio, audio_sr, sr)
+            f0, rmse, frame_time = extract_prosody_frames(y, sr, pitch_backend)
+        else:
+            # Views into the shared buffer, resampled block by block: no second full-size array
+            blocks = resample_blocks(array_blocks(audio, audio_sr, block_seconds), audio_sr, sr)
+            f0, rmse, frame_time = extract_prosody_frames_streaming(blocks, sr, pitch_backend)
+    else:
+        duration = audio_duration(file_path)  # None when unknown: stream to be safe
+        if threshold and duration is not None and duration <= threshold:
+            if settings.prosody_sample_rate:
+                sr = settings.prosody_sample_rate
+                y = decode_audio(file_path, sr)
+            else:
+                # Load audio file
+                # sr=None preserves the native sampling rate
+                y, sr = librosa.load(file_path, sr=None)
+            f0, rmse, frame_time = extract_prosody_frames(y, sr, pitch_backend)
+        else:
+            # Read the file block by block; never holds the whole recording
+            sr, blocks = stream_audio(file_path, settings.prosody_sample_rate or None, block_seconds)
+            f0, rmse, frame_time = extract_prosody_frames_streaming(blocks, sr, pitch_backend)
+    
+    # Build the prefix-sum index once; every time window is O(1) afterwards
+    index = ProsodyIndex.from_frames(f0, rmse, frame_time)
+    if audio_hash:
+        save_index(index, audio_hash, index_variant(pitch_backend))
+    return index
+
+def get_audio_features(file_path: str, transcript_segments: List[Dict], pitch_backend: Optional[str] = None,
+                       audio_hash: Optional[str] = None, audio: Optional[np.ndarray] = None,
+                       audio_sr: int = DECODE_SAMPLE_RATE) -> Dict[str, Any]:
     """
     Analyzes emotional stability by measuring prosodic features (pitch and energy) 
     over time, aligned with transcript segments.
@@ -15,100 +209,13 @@ def get_audio_features(file_path: str, transcript_segments: List[Dict]) -> Dict[
     
     We aim for "Controlled Variance" - expressive but not shaky.
     However, for simplicity, we treat high random variance as "Instability".
+    
+    The remaining arguments are passed to `build_prosody_index`.
     """
     try:
-        # Load audio file
-        # sr=None preserves the native sampling rate
-        y, sr = librosa.load(file_path, sr=None)
-        
-        # 1. Extract Energy (RMS) - "Loudness"
-        # frame_length corresponds to ~50ms windows
-        hop_length = 512
-        rmse = librosa.feature.rms(y=y, frame_length=2048, hop_length=hop_length)[0]
-        
-        # 2. Extract Pitch (Fundamental Frequency - F0)
-        # We use librosa.pyin (Probabilistic YIN) for robust pitch tracking
-        # limit fmin/fmax to human voice range (50Hz - 500Hz covers most speech)
-        f0, voiced_flag, voiced_probs = librosa.pyin(y, fmin=50, fmax=500, sr=sr, frame_length=2048, hop_length=hop_length)
-        
-        # Replace NaNs (unvoiced segments) with 0 for calculation
-        f0 = np.nan_to_num(f0)
-        
-        segment_analysis = []
-        overall_pitch_variances = []
-        overall_energy_variances = []
-        
-        # Time per frame in seconds
-        frame_time = hop_length / sr
-        
-        # Analyze each segment from the transcript
-        for segment in transcript_segments:
-            start_time = segment.get("start", 0)
-            end_time = segment.get("end", 0)
-            text = segment.get("text", "")
-            
-            # Convert time to frame indices
-            start_frame = int(start_time / frame_time)
-            end_frame = int(end_time / frame_time)
-            
-            # Ensure indices are within bounds
-            if start_frame >= len(rmse) or end_frame > len(rmse):
-                continue
-                
-            # Extract features for this segment
-            segment_pitch = f0[start_frame:end_frame]
-            segment_energy = rmse[start_frame:end_frame]
-            
-            # Filter out silence/unvoiced parts for pitch calculation
-            # We only care about pitch when the person is actually speaking (voiced)
-            voiced_pitch = segment_pitch[segment_pitch > 0]
-            
-            if len(voiced_pitch) > 0:
-                pitch_std = np.std(voiced_pitch)
-                pitch_mean = np.mean(voiced_pitch)
-                # Coefficient of Variation (CV) - Normalized variance
-                pitch_stability_score = 1.0 - min(pitch_std / (pitch_mean + 1e-6), 1.0)
-            else:
-                pitch_std = 0
-                pitch_stability_score = 0.5 # Neutral if no voice detected
-                
-            if len(segment_energy) > 0:
-                energy_std = np.std(segment_energy)
-                energy_mean = np.mean(segment_energy)
-                # Energy stability score
-                energy_stability_score = 1.0 - min(energy_std / (energy_mean + 1e-6), 1.0)
-            else:
-                energy_std = 0
-                energy_stability_score = 0.5
-                
-            overall_pitch_variances.append(pitch_stability_score)
-            overall_energy_variances.append(energy_stability_score)
-            
-            segment_analysis.append({
-                "timestamp": f"{round(start_time, 1)}s - {round(end_time, 1)}s",
-                "text": text,
-                "pitch_stability": round(float(pitch_stability_score), 2),
-                "energy_stability": round(float(energy_stability_score), 2),
-                "emotional_state": "Stable" if (pitch_stability_score > 0.7 and energy_stability_score > 0.7) else "Variable"
-            })
-            
-        # Calculate overall score (0.0 to 1.0)
-        if overall_pitch_variances:
-            avg_pitch_stability = np.mean(overall_pitch_variances)
-            avg_energy_stability = np.mean(overall_energy_variances)
-            overall_score = (avg_pitch_stability + avg_energy_stability) / 2
-        else:
-            overall_score = 0.0
-            
-        return {
-            "overall_emotional_stability_score": round(float(overall_score), 2),
-            "segment_analysis": segment_analysis,
-            "metrics": {
-                "average_pitch_stability": round(float(np.mean(overall_pitch_variances)), 2) if overall_pitch_variances else 0,
-                "average_energy_stability": round(float(np.mean(overall_energy_variances)), 2) if overall_energy_variances else 0
-            }
-        }
+        index = build_prosody_index(file_path, pitch_backend, audio_hash, audio, audio_sr)
+        return summarize_segments(index, transcript_segments)
 
     except Exception as e:
-        print(f"Error in audio analysis: {e}")
+        log_warning(f"Error in audio analysis: {e}", file_path=file_path)
         return {"error": str(e)}
@@ -0,0 +1,149 @@
+import subprocess
+from typing import Iterable, Iterator, Optional, Tuple
+import numpy as np
+import librosa
+import soundfile as sf
+import soxr
+
+# Audio Decoding
+# --------------
+# Every upload used to be decoded twice: Whisper shelled out to ffmpeg to get
+# 16 kHz audio, and librosa decoded the file again at its native rate
+# (often 44.1/48 kHz, i.e. ~3x more samples than Whisper needs).
+#
+# Now the pipeline decodes once, into a single float32 mono buffer at Whisper's
+# native rate. The same array is handed to Whisper and to the prosody extractor
+# (no copies; numpy arrays are passed by reference).
+#
+# For long recordings the prosody extractor can also work on a stream of blocks
+# (`stream_audio` / `array_blocks`), so only one block is in memory at a time.
+# Whisper itself always needs the whole 16 kHz buffer (~230 MB per hour), so while
+# a recording is being transcribed that buffer sets the peak, not the prosody side.
+
+# Whisper works on 16 kHz mono audio
+DECODE_SAMPLE_RATE = 16000
+
+def decode_audio(file_path: str, sr: int = DECODE_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decodes any audio file to a float32 mono array in [-1, 1] at `sr` Hz.
+
+    Uses ffmpeg (same command Whisper uses internally). If ffmpeg is not
+    installed, falls back to librosa (which handles WAV/FLAC/OGG via soundfile).
+    """
+    try:
+        raw = subprocess.run(_ffmpeg_command(file_path, sr), capture_output=True, check=True).stdout
+    except FileNotFoundError:
+        audio, _ = librosa.load(file_path, sr=sr, mono=True)
+        return audio.astype(np.float32, copy=False)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore')[-500:]}") from e
+
+    return _pcm16_to_float(raw)
+
+def _ffmpeg_command(file_path: str, sr: int) -> list:
+    return [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", file_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-",
+    ]
+
+def _pcm16_to_float(raw: bytes) -> np.ndarray:
+    # int16 -> float32, scaled in place to avoid another full-size temporary
+    audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
+
+def to_prosody_rate(audio: np.ndarray, sr: int, target_sr: int) -> np.ndarray:
+    """
+    Returns the buffer to use for prosodic analysis.
+    Pitch and energy of speech need far less bandwidth than transcription,
+    so a reduced rate (e.g. 8 kHz) halves the feature-extraction work again.
+    At the decode rate this returns the same array (no copy).
+    """
+    if not target_sr or target_sr == sr:
+        return audio
+    return librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+
+def audio_duration(file_path: str) -> Optional[float]:
+    """Duration in seconds from the file header, or None if soundfile cannot read the format (e.g. m4a)."""
+    try:
+        return sf.info(file_path).duration
+    except Exception:
+        return None
+
+def array_blocks(audio: np.ndarray, sr: int, block_seconds: float) -> Iterator[np.ndarray]:
+    """Splits an in-memory recording into consecutive blocks (views, no copies)."""
+    block = max(1, int(block_seconds * sr))
+    for start in range(0, len(audio), block):
+        yield audio[start:start + block]
+
+def resample_blocks(blocks: Iterable[np.ndarray], sr: int, target_sr: int) -> Iterator[np.ndarray]:
+    """Resamples a stream of blocks with a streaming resampler (no full-size copy)."""
+    if sr == target_sr:
+        yield from blocks
+        return
+    resampler = soxr.ResampleStream(sr, target_sr, 1, dtype="float32")
+    for block in blocks:
+        out = resampler.resample_chunk(block)
+        if len(out):
+            yield out
+    tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+    if len(tail):
+        yield tail
+
+def stream_audio(file_path: str, sr: Optional[int] = None, block_seconds: float = 30.0) -> Tuple[int, Iterator[np.ndarray]]:
+    """
+    Reads a recording block by block as float32 mono, without loading all of it.
+
+    Formats soundfile understands (WAV/FLAC/OGG/MP3) are read directly and, if needed,
+    resampled with a streaming resampler. Anything else is decoded by an ffmpeg pipe.
+
+    Args:
+        file_path (str): Path to the audio file.
+        sr (int): Rate of the returned blocks. None keeps the native rate when
+            soundfile can read the file (16 kHz otherwise).
+        block_seconds (float): Length of each block.
+
+    Returns:
+        Tuple[int, Iterator]: The sample rate of the blocks and the block iterator.
+    """
+    try:
+        native_sr = sf.info(file_path).samplerate
+    except Exception:
+        native_sr = None
+
+    if native_sr is not None:
+        target_sr = sr or native_sr
+        return target_sr, _soundfile_blocks(file_path, native_sr, target_sr, block_seconds)
+
+    target_sr = sr or DECODE_SAMPLE_RATE
+    return target_sr, _ffmpeg_blocks(file_path, target_sr, block_seconds)
+
+def _soundfile_blocks(file_path: str, native_sr: int, sr: int, block_seconds: float) -> Iterator[np.ndarray]:
+    blocksize = max(1, int(block_seconds * native_sr))
+
+    def mono_blocks():
+        for block in sf.blocks(file_path, blocksize=blocksize, dtype="float32", always_2d=True):
+            # Average the channels, like librosa.load(mono=True)
+            yield block.mean(axis=1) if block.shape[1] > 1 else np.ascontiguousarray(block[:, 0])
+
+    for block in resample_blocks(mono_blocks(), native_sr, sr):
+        if len(block):
+            yield block
+
+def _ffmpeg_blocks(file_path: str, sr: int, block_seconds: float) -> Iterator[np.ndarray]:
+    block_bytes = max(1, int(block_seconds * sr)) * 2  # 16-bit samples
+    process = subprocess.Popen(_ffmpeg_command(file_path, sr), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            raw = process.stdout.read(block_bytes)
+            if not raw:
+                break
+            yield _pcm16_to_float(raw[:len(raw) // 2 * 2])
+    finally:
+        # Also runs when the consumer stops early
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+    if process.returncode not in (0, -9):
+        raise RuntimeError(f"ffmpeg failed to decode {file_path} (exit code {process.returncode})")
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.analytics import SessionScore
+from ..models.session import InterviewSession
+from .session_comparison_service import score_sessions, metrics_to_columns, PercentileIndex
+
+# Cohort Ranking
+# --------------
+# Scores a whole cohort in one vectorized call and ranks every member with a
+# sorted-array percentile index (see session_comparison_service.py).
+
+COMPONENTS = ("relevance", "stability", "pace", "clarity")
+
+def rank_scores(ids: Sequence[str], final_scores: np.ndarray, components: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Builds the CohortRankResponse shape from score columns."""
+    index = PercentileIndex(final_scores)
+    percentiles = np.round(index.percentile(final_scores), 1)
+    results = [
+        {
+            "id": session_id,
+            "final_score": float(final_scores[i]),
+            "components": {name: float(components[name][i]) for name in COMPONENTS},
+            "percentile": float(percentiles[i]),
+        }
+        for i, session_id in enumerate(ids)
+    ]
+    return {
+        "count": len(index),
+        "median_score": round(index.quantile(0.5), 1),
+        "p25_score": round(index.quantile(0.25), 1),
+        "p75_score": round(index.quantile(0.75), 1),
+        "results": results,
+    }
+
+def rank_metrics(sessions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Scores and ranks a cohort given as metrics dicts (each with an "id").
+    """
+    scores = score_sessions(metrics_to_columns(sessions))
+    return rank_scores([s["id"] for s in sessions], scores["final_score"], scores)
+
+def rank_interview(db: Session, interview_id: int) -> Dict[str, Any]:
+    """
+    Ranks the stored sessions of one interview (e.g. a bootcamp assignment) by their
+    stored scores: one query, no rescoring.
+    """
+    rows = (
+        db.query(SessionScore.session_id, SessionScore.final_score, SessionScore.relevance,
+                 SessionScore.stability, SessionScore.pace, SessionScore.clarity)
+        .join(InterviewSession, InterviewSession.id == SessionScore.session_id)
+        .filter(InterviewSession.interview_id == interview_id)
+        .all()
+    )
+    if not rows:
+        return {"count": 0, "median_score": 0.0, "p25_score": 0.0, "p75_score": 0.0, "results": []}
+    ids, final_scores, *component_columns = zip(*rows)
+    components = {name: np.array(values, dtype=np.float64) for name, values in zip(COMPONENTS, component_columns)}
+    return rank_scores(ids, np.array(final_scores, dtype=np.float64), components)
@@ -0,0 +1,299 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..config import settings
+from ..utils.helpers import log_warning
+from ..utils.metrics import metrics, record_timing
+
+try:
+    import fcntl  # POSIX only; used to serialize writers across worker processes
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Embedding Cache
+# ---------------
+# The same resume is analysed against dozens of practice sessions, so the same
+# resume sections get embedded over and over. This cache sits in front of
+# `model.encode` and only sends texts it has never seen to the model.
+#
+# Two tiers:
+# 1. Memory: an LRU dict of the most recently used vectors (per process).
+# 2. Disk: one float32 matrix per model, memory-mapped (`<model>.npy`), plus an
+#    index file (`<model>.index.json`) mapping text keys to row numbers.
+#    The memmap means only the rows we actually read are paged in.
+#
+# Keys are sha256(model name + normalized text). Stored vectors are the raw
+# `model.encode` output; callers normalize them if they need to.
+
+INITIAL_DISK_CAPACITY = 1024  # rows; the matrix doubles when full
+
+CACHE_LOOKUPS = metrics.counter("cache_lookups_total", "Cache lookups by cache and outcome (hit/miss)", ["cache", "result"])
+ENCODE_SECONDS = metrics.histogram("embedding_encode_seconds", "Time spent in model.encode (cache misses only)")
+ENCODED_TEXTS = metrics.counter("embedding_texts_encoded_total", "Texts sent to the embedding model")
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC + collapsed whitespace, so trivially different copies share a key."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+def make_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """Exclusive lock shared by every worker process writing the same model's files."""
+    lock_file = open(lock_path, "a")
+    try:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+class _DiskTier:
+    """Append-only memory-mapped matrix of embeddings for one model."""
+    def __init__(self, directory: str, model_name: str):
+        slug = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.matrix_path = os.path.join(directory, f"{slug}.npy")
+        self.index_path = os.path.join(directory, f"{slug}.index.json")
+        self.lock_path = os.path.join(directory, f"{slug}.lock")
+        self.matrix = None
+        self.keys: Dict[str, int] = {}
+        self.rows = 0
+        self._index_mtime = None
+        self._load_index()
+
+    def _reset(self):
+        self.matrix = None
+        self.keys = {}
+        self.rows = 0
+        self._index_mtime = None
+
+    def _load_index(self):
+        # The files can disappear at any time (a purge from another process), so a
+        # missing file means "empty" rather than an error
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            mtime = os.path.getmtime(self.index_path)
+            matrix = np.load(self.matrix_path, mmap_mode="r+")
+        except FileNotFoundError:
+            self._reset()
+            return
+        self.keys = data["keys"]
+        self.rows = data["rows"]
+        self._index_mtime = mtime
+        self.matrix = matrix
+
+    def refresh_if_changed(self):
+        """Picks up rows appended (or a purge) by other worker processes."""
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._index_mtime:
+            self._load_index()
+
+    def get(self, key: str):
+        row = self.keys.get(key)
+        if row is None:
+            return None
+        return np.array(self.matrix[row])  # copy the row out of the memmap
+
+    def append(self, new_keys: List[str], vectors: np.ndarray):
+        with _file_lock(self.lock_path):
+            self.refresh_if_changed()
+
+            fresh = [(k, v) for k, v in zip(new_keys, vectors) if k not in self.keys]
+            if not fresh:
+                return
+            self._ensure_capacity(self.rows + len(fresh), vectors.shape[1])
+
+            start = self.rows
+            for offset, (key, vector) in enumerate(fresh):
+                self.matrix[start + offset] = vector
+                self.keys[key] = start + offset
+            self.rows = start + len(fresh)
+
+            # Data first, then the index, so the index never points at unwritten rows
+            self.matrix.flush()
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"rows": self.rows, "dim": int(vectors.shape[1]), "keys": self.keys}, f)
+            os.replace(tmp_path, self.index_path)
+            self._index_mtime = os.path.getmtime(self.index_path)
+
+    def _ensure_capacity(self, needed_rows: int, dim: int):
+        capacity = 0 if self.matrix is None else self.matrix.shape[0]
+        if needed_rows <= capacity:
+            return
+        new_capacity = max(INITIAL_DISK_CAPACITY, capacity)
+        while new_capacity < needed_rows:
+            new_capacity *= 2
+
+        tmp_path = f"{self.matrix_path}.tmp.npy"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(new_capacity, dim))
+        if self.matrix is not None:
+            grown[:self.rows] = self.matrix[:self.rows]
+        grown.flush()
+        del grown
+        self.matrix = None
+        os.replace(tmp_path, self.matrix_path)
+        self.matrix = np.load(self.matrix_path, mmap_mode="r+")
+
+def _timed_encode(model: Any, texts: List[str], batch_size: int) -> np.ndarray:
+    started = time.perf_counter()
+    encoded = np.asarray(model.encode(texts, batch_size=batch_size), dtype=np.float32)
+    elapsed = time.perf_counter() - started
+    ENCODE_SECONDS.observe(elapsed)
+    ENCODED_TEXTS.inc(len(texts))
+    record_timing("embedding", elapsed)
+    return encoded
+
+class EmbeddingCache:
+    """
+    Memory + disk cache in front of a SentenceTransformer-style `encode`.
+    """
+    def __init__(self, directory: str, memory_items: int):
+        self.directory = directory
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk: Dict[str, _DiskTier] = {}
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_tier(self, model_name: str) -> _DiskTier:
+        if model_name not in self._disk:
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk[model_name] = _DiskTier(self.directory, model_name)
+        return self._disk[model_name]
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def encode(self, model: Any, model_name: str, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Returns embeddings for `texts` (same order), calling `model.encode` only for cache misses.
+
+        Args:
+            model: Object with an `encode(list_of_texts, batch_size=...)` method.
+            model_name (str): Part of the cache key; different models never share vectors.
+            texts (list): Texts to embed. Duplicates are encoded once.
+            batch_size (int): Passed through to `model.encode` for the misses.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        if not settings.embedding_cache_enabled:
+            return _timed_encode(model, texts, batch_size)
+
+        keys = [make_key(model_name, t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}  # key -> text, insertion ordered and de-duplicated
+
+        with self._lock:
+            disk = self._disk_tier(model_name)
+            disk.refresh_if_changed()
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                else:
+                    vector = disk.get(key)
+                    if vector is not None:
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+                if vector is not None:
+                    found[key] = vector
+                else:
+                    missing[key] = text
+            self.misses += len(missing)
+        CACHE_LOOKUPS.inc(len(found), cache="embedding", result="hit")
+        CACHE_LOOKUPS.inc(len(missing), cache="embedding", result="miss")
+
+        if missing:
+            # Only never-seen texts reach the model, in one batched call
+            encoded = _timed_encode(model, list(missing.values()), batch_size)
+            with self._lock:
+                for key, vector in zip(missing.keys(), encoded):
+                    found[key] = vector
+                    self._remember(key, vector)
+                try:
+                    self._disk_tier(model_name).append(list(missing.keys()), encoded)
+                except OSError as e:
+                    # A full or read-only disk should not fail the analysis
+                    log_warning(f"Embedding cache disk write failed: {e}")
+
+        return np.stack([found[k] for k in keys])
+
+    def purge(self) -> int:
+        """
+        Clears both tiers. Returns the number of disk rows removed.
+
+        Works from the files on disk, not the tiers this process has opened, so it
+        also removes what earlier runs and other worker processes wrote.
+        """
+        with self._lock:
+            self._memory.clear()
+            for disk in self._disk.values():
+                disk.matrix = None
+            self._disk.clear()
+            if not os.path.isdir(self.directory):
+                return 0
+
+            removed = 0
+            for index_path in glob.glob(os.path.join(self.directory, "*.index.json")):
+                slug = os.path.basename(index_path)[:-len(".index.json")]
+                with _file_lock(os.path.join(self.directory, f"{slug}.lock")):
+                    try:
+                        with open(index_path) as f:
+                            removed += json.load(f).get("rows", 0)
+                    except (OSError, ValueError):
+                        pass  # Already gone or unreadable: delete it anyway
+                    for path in (os.path.join(self.directory, f"{slug}.npy"), index_path):
+                        if os.path.exists(path):
+                            os.remove(path)
+            # Matrices without an index (an interrupted first write, leftover .tmp files)
+            for path in glob.glob(os.path.join(self.directory, "*.npy")):
+                slug = os.path.basename(path).split(".npy")[0]
+                with _file_lock(os.path.join(self.directory, f"{slug}.lock")):
+                    if os.path.exists(path):
+                        os.remove(path)
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": settings.embedding_cache_enabled,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_items": len(self._memory),
+            "disk_rows": {name: d.rows for name, d in self._disk.items()},
+        }
+
+# Singleton instance
+embedding_cache = EmbeddingCache(
+    directory=settings.embedding_cache_dir,
+    memory_items=settings.embedding_cache_memory_items,
+)
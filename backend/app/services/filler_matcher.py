@@ -0,0 +1,191 @@
+import os
+import re
+from functools import lru_cache
+from itertools import compress
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import settings
+from ..utils.helpers import log_debug_message
+
+# Filler Phrase Matching
+# ----------------------
+# Fillers are not only single words ("um", "uh") but also phrases ("you know",
+# "i mean", "sort of"). Whisper gives us one word at a time, so phrases have to
+# be matched over the *sequence* of words.
+#
+# The lexicon is compiled into a token trie (nested dicts, one level per word).
+# Matching walks the word stream once; at every position it follows the trie as
+# far as the words allow and takes the longest phrase found (greedy, no overlaps).
+# Phrases are a few words long, so this is linear in the number of words.
+# Words that do not start any phrase cost one dict lookup.
+#
+# Lexicons: built-in ones per language below, plus `<name>.txt` files in
+# settings.filler_lexicon_dir (one phrase per line, `#` for comments) for
+# customer-specific lists. Requests may pick their own combination (e.g. a
+# customer's list on top of "en"); settings.filler_lexicons is the default.
+# Compiled matchers are cached, so each combination is read and compiled once
+# per process. The default is compiled at startup, so a bad config fails there.
+
+BUILTIN_LEXICONS: Dict[str, List[str]] = {
+    "en": ["um", "uh", "er", "ah", "like", "you know", "i mean", "sort of"],
+    "es": ["eh", "em", "este", "pues", "o sea", "bueno", "es decir"],
+    "de": ["äh", "ähm", "also", "halt", "quasi", "sozusagen", "na ja"],
+    "fr": ["euh", "ben", "bah", "genre", "tu vois", "en fait", "du coup"],
+}
+
+# Trie key marking the end of a phrase. Not a string, so no token can collide with
+# it (punctuation-only words like "..." normalize to "")
+_END = object()
+
+_STRIP_CHARS = " \t\n.,?!"
+
+# Lexicon names become file names in filler_lexicon_dir, so no paths
+_LEXICON_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+def normalize_token(word: str) -> str:
+    """Lowercases a transcript word and strips surrounding whitespace and punctuation."""
+    return word.lower().strip(_STRIP_CHARS)
+
+class FillerMatcher:
+    """
+    Compiled filler lexicon (token trie).
+    """
+    def __init__(self, phrases: Iterable[str]):
+        self.root: Dict = {}
+        self.phrases = set()
+        for phrase in phrases:
+            tokens = [normalize_token(t) for t in phrase.split()]
+            tokens = [t for t in tokens if t]
+            if not tokens:
+                continue
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = " ".join(tokens)
+            self.phrases.add(node[_END])
+        # Fillers that are one word and the start of no longer phrase ("um") need no trie walk
+        self._single = {token: node[_END] for token, node in self.root.items() if list(node) == [_END]}
+
+    def starts_phrase(self, token: str) -> bool:
+        return token in self.root
+
+    def scan(self, tokens: List[str], final: bool = True) -> Tuple[List[Tuple[str, int, int]], int]:
+        """
+        Greedy longest-match over normalized tokens.
+
+        Args:
+            tokens (list): Consecutive normalized words of the transcript.
+            final (bool): No more words will follow. If False, matching stops where a
+                longer phrase could still be completed by the next words.
+
+        Returns:
+            Tuple[list, int]: (phrase, first index, end index) per hit, and how many tokens
+            were fully processed. Tokens after that must be passed again with the next ones.
+        """
+        # Most words start no filler; find the few that do in one C-speed pass
+        candidates = list(compress(range(len(tokens)), map(self.root.__contains__, tokens)))
+        return self._match(candidates, tokens.__getitem__, len(tokens), final)
+
+    def _match(self, candidates: List[int], token_at: Callable[[int], str], n: int,
+               final: bool) -> Tuple[List[Tuple[str, int, int]], int]:
+        # Walks the trie from each candidate position (positions inside a previous hit are skipped)
+        root = self.root
+        single = self._single
+        hits = []
+        resume_at = 0
+        for i in candidates:
+            if i < resume_at:
+                continue
+            token = token_at(i)
+            if token in single:
+                hits.append((single[token], i, i + 1))
+                continue
+            node = root[token]
+            j = i + 1
+            best = (node[_END], j) if _END in node else None
+            while j < n:
+                next_token = token_at(j)
+                if not next_token:
+                    j += 1  # Punctuation-only word ("...", "?") inside or after a phrase
+                    continue
+                child = node.get(next_token)
+                if child is None:
+                    break
+                node = child
+                j += 1
+                if _END in node:
+                    best = (node[_END], j)
+            else:
+                # Out of words while still inside the trie: a later word may extend the match
+                if not final and any(key is not _END for key in node):
+                    return hits, i
+            if best:
+                hits.append((best[0], i, best[1]))
+                resume_at = best[1]
+        return hits, n
+
+    def resolve(self, words: List[Dict], final: bool = True) -> Tuple[List[Dict], int]:
+        """
+        Same as `scan` for word dicts ({"token", "start", "end"}); hits come with timestamps.
+        """
+        matches, consumed = self.scan([w["token"] for w in words], final)
+        return [
+            {"phrase": phrase, "start": words[i]["start"], "end": words[end - 1]["end"]}
+            for phrase, i, end in matches
+        ], consumed
+
+    def find(self, transcript_words: List[Dict]) -> List[Dict]:
+        """All fillers in a complete list of Whisper words ({"word", "start", "end"})."""
+        raw = list(map(itemgetter("word"), transcript_words))
+        # Normalize each distinct word once (transcripts repeat the same few thousand words)
+        normalized = {word: word.lower().strip(_STRIP_CHARS) for word in set(raw)}
+        starters = {word for word, token in normalized.items() if token in self.root}
+        candidates = list(compress(range(len(raw)), map(starters.__contains__, raw)))
+
+        matches, _ = self._match(candidates, lambda j: normalized[raw[j]], len(raw), final=True)
+        return [
+            {"phrase": phrase, "start": transcript_words[i]["start"], "end": transcript_words[end - 1]["end"]}
+            for phrase, i, end in matches
+        ]
+
+def _load_lexicon(name: str) -> List[str]:
+    path = os.path.join(settings.filler_lexicon_dir, f"{name}.txt")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+    if name in BUILTIN_LEXICONS:
+        return BUILTIN_LEXICONS[name]
+    raise ValueError(f"Unknown filler lexicon: {name}")
+
+def normalize_lexicons(lexicons: Optional[str] = None) -> str:
+    """
+    Canonical form of a comma-separated lexicon list ("en, acme" -> "en,acme"),
+    used as the matcher cache key and in the result cache key.
+    Defaults to settings.filler_lexicons. Raises ValueError for invalid names.
+    """
+    lexicons = lexicons or settings.filler_lexicons
+    if not isinstance(lexicons, str):
+        raise ValueError("Filler lexicons must be a comma-separated string")
+    names = [n.strip() for n in lexicons.split(",") if n.strip()]
+    if not names:
+        raise ValueError("No filler lexicon given")
+    for name in names:
+        if not _LEXICON_NAME.match(name):
+            raise ValueError(f"Invalid filler lexicon name: {name}")
+    return ",".join(dict.fromkeys(names))
+
+def get_matcher(lexicons: Optional[str] = None) -> FillerMatcher:
+    """
+    Returns the compiled matcher for a comma-separated list of lexicons, e.g. "en" or
+    "en,acme" (English plus a customer's own list). Defaults to settings.filler_lexicons.
+    Raises ValueError for unknown or invalid lexicon names.
+    """
+    return _compile(normalize_lexicons(lexicons))
+
+@lru_cache(maxsize=64)
+def _compile(lexicons: str) -> FillerMatcher:
+    names = lexicons.split(",")
+    phrases = [phrase for name in names for phrase in _load_lexicon(name)]
+    log_debug_message(f"Compiled filler lexicon '{lexicons}' ({len(phrases)} phrases)")
+    return FillerMatcher(phrases)
@@ -1,5 +1,19 @@
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import select, insert, or_, and_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from ..models.interview import Interview
+from ..config import settings
+from ..database import SessionLocal
+from ..models.interview import Interview, SORT_CREATED_AT, SORT_CREATED_AT_DEFAULT
+
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio needs greenlet, which is only installed for the async engine
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 # Introduction to Services:
 # Services handle the core business logic of the application.
@@ -18,6 +32,14 @@ def get_interviews(db: Session, skip: int = 0, limit: int = 100):
     """
     return db.query(Interview).offset(skip).limit(limit).all()
 
+async def get_interviews_async(db: "AsyncSession", skip: int = 0, limit: int = 100):
+    """
+    Same as `get_interviews`, for the async engine (settings.use_async_db).
+    The query is awaited, so the event loop keeps serving other requests meanwhile.
+    """
+    result = await db.execute(select(Interview).offset(skip).limit(limit))
+    return result.scalars().all()
+
 def create_interview(db: Session, interview_data: dict):
     """
     Service function to create a new interview.
@@ -36,3 +58,154 @@ def create_interview(db: Session, interview_data: dict):
     # Refresh to update with any DB-generated fields (like ID)
     db.refresh(new_interview)
     return new_interview
+
+async def create_interview_async(db: "AsyncSession", interview_data: dict):
+    """
+    Same as `create_interview`, for the async engine (settings.use_async_db).
+    """
+    new_interview = Interview(**interview_data)
+    db.add(new_interview)
+    await db.commit()
+    await db.refresh(new_interview)
+    return new_interview
+
+# Keyset Pagination & Export
+# --------------------------
+# `offset(skip)` makes the database read and discard every skipped row, so deep
+# pages get linearly slower. Listings instead continue after the last row seen:
+# rows are ordered by (created_at, id) (ix_interviews_keyset) and a page
+# starts with "WHERE (created_at, id) < last", one index seek at any depth.
+# The position is handed to the client as an opaque cursor. created_at is
+# nullable: rows without one sort as the oldest (see SORT_CREATED_AT), so they
+# are listed and exported too.
+#
+# Only the columns are selected (no ORM objects), and exports walk the table
+# one keyset batch at a time, so memory stays constant however big the table is.
+
+EXPORT_COLUMNS = ("id", "title", "description", "created_at")
+_COLUMNS = tuple(getattr(Interview, name) for name in EXPORT_COLUMNS)
+
+def encode_cursor(created_at: Optional[datetime], interview_id: int) -> str:
+    raw = json.dumps([(created_at or SORT_CREATED_AT_DEFAULT).isoformat(), interview_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for a cursor that was not produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, interview_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(interview_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def _keyset_query(db: Session, after: Optional[Tuple[datetime, int]]):
+    """Interview rows (newest first) that come after `after` = (created_at, id)."""
+    query = db.query(*_COLUMNS)
+    if after is not None:
+        created_at, interview_id = after
+        query = query.filter(or_(
+            SORT_CREATED_AT < created_at,
+            and_(SORT_CREATED_AT == created_at, Interview.id < interview_id),
+        ))
+    return query.order_by(SORT_CREATED_AT.desc(), Interview.id.desc())
+
+def get_interview_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+    """
+    One page of interviews, newest first.
+
+    Args:
+        db (Session): The database session.
+        cursor (str): `next_cursor` of the previous page (None for the first page).
+        limit (int): Number of records to return.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str or None}
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # One extra row tells us whether another page follows
+    rows = _keyset_query(db, after).limit(limit + 1).all()
+    items = [row._asdict() for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+def iter_interview_batches(db: Session, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Every interview, newest first, as lists of at most `batch_size` rows (one keyset query each)."""
+    after = None
+    while True:
+        rows = [row._asdict() for row in _keyset_query(db, after).limit(batch_size).all()]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1]["created_at"] or SORT_CREATED_AT_DEFAULT, rows[-1]["id"])
+
+def _export_values(row: Dict[str, Any]) -> List[Any]:
+    created_at = row["created_at"]
+    return [row["id"], row["title"], row["description"], created_at.isoformat() if created_at else None]
+
+def export_interviews(fmt: str = "ndjson", batch_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Streams every interview as NDJSON lines or CSV (with a header row), one chunk per batch.
+    Uses its own database session because the stream outlives the request handler.
+    """
+    batch_size = batch_size or settings.export_batch_size
+    db = SessionLocal()
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            for rows in iter_interview_batches(db, batch_size):
+                writer.writerows(_export_values(row) for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()  # Header only (empty table)
+        else:
+            for rows in iter_interview_batches(db, batch_size):
+                yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, _export_values(row)))) + "\n" for row in rows)
+    finally:
+        db.close()
+
+# Bulk Import
+# -----------
+# `create_interview` costs one transaction (plus a refresh query) per record.
+# Bulk imports insert validated rows in batches: one executemany INSERT and one
+# commit per batch. If a batch fails, it is retried row by row so only the
+# offending rows are reported and the rest of the batch is still stored.
+
+def bulk_insert_interviews(db: Session, rows: List[Tuple[int, Dict[str, Any]]]) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Inserts one batch of interviews.
+
+    Args:
+        db (Session): The database session.
+        rows (list): (index, interview_data) pairs, already validated.
+
+    Returns:
+        tuple: (number inserted, [(index, error message), ...])
+    """
+    if not rows:
+        return 0, []
+    try:
+        db.execute(insert(Interview), [data for _, data in rows])
+        db.commit()
+        return len(rows), []
+    except SQLAlchemyError:
+        db.rollback()
+
+    inserted, errors = 0, []
+    for index, data in rows:
+        try:
+            db.execute(insert(Interview), [data])
+            db.commit()
+            inserted += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            errors.append((index, str(getattr(e, "orig", None) or e)))
+    return inserted, errors
@@ -0,0 +1,188 @@
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.job import TranscriptionJob
+from ..utils.helpers import log_info, log_warning, log_error
+from ..utils.metrics import metrics
+from .pipeline_service import run_transcription_pipeline, PIPELINE_STAGES
+
+# Background Job Queue
+# --------------------
+# Long recordings take minutes to process. Instead of holding the HTTP request
+# (and the event loop) open, uploads are stored as TranscriptionJob rows and a
+# bounded pool of worker threads runs the pipeline. Clients poll for the result.
+# Because the job rows live in the database, queued work is picked up again
+# after a restart (see `JobQueue.start`).
+
+JOBS_QUEUED = metrics.gauge("job_queue_depth", "Transcription jobs waiting for a worker")
+JOBS_RUNNING = metrics.gauge("jobs_running", "Transcription jobs being processed")
+JOBS_FINISHED = metrics.counter("jobs_finished_total", "Finished transcription jobs by status", ["status"])
+
+class JobQueue:
+    """
+    Runs transcription jobs on a fixed-size thread pool.
+    """
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self):
+        """
+        Starts the worker pool and re-enqueues any unfinished jobs from a previous run.
+        """
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="transcription-job")
+        self._resume_pending_jobs()
+
+    def shutdown(self):
+        """Stops accepting new work. Jobs still running are allowed to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def enqueue(self, job_id: str):
+        if self._executor is None:
+            self.start()
+        self._submit(job_id)
+
+    def _submit(self, job_id: str):
+        JOBS_QUEUED.inc()
+        self._executor.submit(self._run_job, job_id)
+
+    def _resume_pending_jobs(self):
+        db = SessionLocal()
+        try:
+            pending = (
+                db.query(TranscriptionJob)
+                .filter(TranscriptionJob.status.in_(["queued", "running"]))
+                .order_by(TranscriptionJob.created_at)
+                .all()
+            )
+            for job in pending:
+                if not os.path.exists(job.file_path):
+                    _mark_failed(db, job, "Uploaded file was lost before processing.")
+                    continue
+                # A job that was 'running' when the server stopped is started again from scratch
+                job.status = "queued"
+                job.stage = None
+                job.stage_index = 0
+                db.commit()
+                log_info(f"Resuming transcription job {job.id}", job_id=job.id)
+                self._submit(job.id)
+        finally:
+            db.close()
+
+    def _run_job(self, job_id: str):
+        """
+        Executes a single job inside a worker thread.
+        Each worker uses its own database session.
+        """
+        JOBS_QUEUED.dec()
+        JOBS_RUNNING.inc()
+        db = SessionLocal()
+        try:
+            job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+            if job is None or job.status not in ("queued", "running"):
+                return
+
+            job.status = "running"
+            db.commit()
+
+            def on_stage(running: List[str], finished: int):
+                # Several stages can run at once, e.g. "transcribing,extracting_prosody"
+                job.stage = ",".join(running) or None
+                job.stage_index = finished
+                db.commit()
+
+            try:
+                # Jobs are already queued durably, so they wait for a Whisper worker instead of failing
+                result = run_transcription_pipeline(
+                    job.file_path, on_stage=on_stage, block=True,
+                    audio_hash=job.audio_hash, pitch_backend=job.pitch_backend,
+                    interview_id=job.interview_id, job_id=job.id, filename=job.filename,
+                    candidate_id=job.candidate_id, filler_lexicons=job.filler_lexicons
+                )
+                job.result = json.dumps(result)
+                job.status = "completed"
+                job.stage = None
+                job.stage_index = len(PIPELINE_STAGES)
+                db.commit()
+                JOBS_FINISHED.inc(status="completed")
+            except Exception as e:
+                # HTTPException carries the useful message in `detail`
+                _mark_failed(db, job, str(getattr(e, "detail", e)))
+            finally:
+                if os.path.exists(job.file_path):
+                    os.remove(job.file_path)
+        except Exception as e:
+            log_error(f"Transcription job {job_id} crashed: {e}", job_id=job_id)
+        finally:
+            db.close()
+            JOBS_RUNNING.dec()
+
+def _mark_failed(db: Session, job: TranscriptionJob, error: str):
+    job.status = "failed"
+    job.error = error
+    db.commit()
+    JOBS_FINISHED.inc(status="failed")
+    log_warning(f"Transcription job {job.id} failed: {error}", job_id=job.id)
+
+# Singleton instance
+job_queue = JobQueue(max_workers=settings.job_workers)
+
+def new_job_id() -> str:
+    return str(uuid.uuid4())
+
+def create_job(db: Session, job_id: str, filename: str, file_path: str,
+               audio_hash: Optional[str] = None, pitch_backend: Optional[str] = None,
+               interview_id: Optional[int] = None, candidate_id: Optional[str] = None,
+               filler_lexicons: Optional[str] = None) -> TranscriptionJob:
+    """
+    Persists a new job and hands it to the worker pool.
+
+    Args:
+        db (Session): The database session.
+        job_id (str): Pre-generated job ID (also used to name the saved upload).
+        filename (str): Original filename from the client.
+        file_path (str): Where the upload was saved.
+        audio_hash (str): SHA-256 of the upload, so the job can be served from the result cache.
+        pitch_backend (str): Optional F0 tracker override for the emotional analysis.
+        interview_id (int): Optional interview the resulting session is stored under.
+        candidate_id (str): Optional candidate whose trend the session counts toward.
+        filler_lexicons (str): Optional filler lexicons for the speech analysis, e.g. "en,acme".
+    """
+    job = TranscriptionJob(
+        id=job_id, status="queued", filename=filename, file_path=file_path,
+        audio_hash=audio_hash, pitch_backend=pitch_backend,
+        interview_id=interview_id, candidate_id=candidate_id, filler_lexicons=filler_lexicons
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    job_queue.enqueue(job.id)
+    return job
+
+def get_job(db: Session, job_id: str) -> Optional[TranscriptionJob]:
+    return db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+
+def job_to_response(job: TranscriptionJob) -> dict:
+    """Converts a job row into the JobStatusResponse shape."""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": round((job.stage_index or 0) / len(PIPELINE_STAGES), 2),
+        "filename": job.filename,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+    }
@@ -0,0 +1,191 @@
+import threading
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import soxr
+
+from ..config import settings
+from . import transcription_service
+from .speech_analysis_service import SpeechMetricsAccumulator
+from .audio_decode import DECODE_SAMPLE_RATE
+
+# Live Transcription
+# ------------------
+# Transcribes audio while it is being recorded (see the /transcription/live WebSocket).
+#
+# Audio arrives in small frames and is appended to a buffer. Every `live_step_seconds`
+# of new audio, Whisper transcribes the buffer (the not-yet-final part of the recording).
+# Segments that end well before the end of the buffer (`live_holdback_seconds`) will
+# not change any more: they are *committed*, and the buffer is cut at the end of the
+# last committed segment. The remaining segments are *tentative*; they are sent to the
+# client but transcribed again in the next round, with more context.
+#
+# Because only the uncommitted tail is transcribed, each round costs about the same,
+# and when recording stops only the last few seconds are left to process.
+
+SUPPORTED_ENCODINGS = ("pcm_s16le", "float32")
+
+class LiveTranscriber:
+    """
+    Incremental transcription state for one live session.
+    `add_audio` may be called while `step` runs in another thread.
+    """
+    def __init__(self, sample_rate: int = DECODE_SAMPLE_RATE, encoding: str = "pcm_s16le",
+                 filler_lexicons: Optional[str] = None):
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}. Supported: {', '.join(SUPPORTED_ENCODINGS)}")
+        self.encoding = encoding
+        # Clients usually record at 44.1/48 kHz; Whisper wants 16 kHz
+        self._resampler = (
+            soxr.ResampleStream(sample_rate, DECODE_SAMPLE_RATE, 1, dtype="float32")
+            if sample_rate != DECODE_SAMPLE_RATE else None
+        )
+        self._chunks: List[np.ndarray] = []  # Uncommitted audio, starting at `buffer_start`
+        self._buffered = 0  # Samples in `_chunks`
+        self._lock = threading.Lock()
+        self.buffer_start = 0.0  # Recording time (s) of the first buffered sample
+        self.received_samples = 0
+        self._samples_at_last_step = 0
+        self.committed: List[Dict] = []
+        self.tentative: List[Dict] = []
+        # Metrics of the committed segments, updated as they are committed (never recomputed)
+        # (raises ValueError for unknown filler lexicons)
+        self._metrics = SpeechMetricsAccumulator(lexicon=filler_lexicons)
+
+    @property
+    def received_seconds(self) -> float:
+        return self.received_samples / DECODE_SAMPLE_RATE
+
+    def add_audio(self, data: bytes):
+        """Appends one frame of mono audio (raw bytes in the session's encoding)."""
+        if self.encoding == "pcm_s16le":
+            samples = np.frombuffer(data[:len(data) // 2 * 2], dtype=np.int16).astype(np.float32) / 32768.0
+        else:
+            samples = np.frombuffer(data[:len(data) // 4 * 4], dtype=np.float32)
+        if self._resampler is not None:
+            samples = self._resampler.resample_chunk(samples)
+        self._append(samples)
+
+    def _append(self, samples: np.ndarray):
+        if not len(samples):
+            return
+        with self._lock:
+            self._chunks.append(samples)
+            self._buffered += len(samples)
+            self.received_samples += len(samples)
+
+    def ready(self) -> bool:
+        """True once enough new audio arrived since the last round."""
+        new_samples = self.received_samples - self._samples_at_last_step
+        return new_samples >= settings.live_step_seconds * DECODE_SAMPLE_RATE
+
+    def _window(self) -> np.ndarray:
+        # Merge the buffered frames into one array (done once per round, not per frame)
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            self._samples_at_last_step = self.received_samples
+            return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def _drop(self, samples: int):
+        # Removes committed audio from the front of the buffer (frames that arrived meanwhile stay)
+        with self._lock:
+            samples = min(samples, self._buffered)
+            merged = np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.float32)
+            self._chunks = [merged[samples:]] if len(merged) > samples else []
+            self._buffered -= samples
+            self.buffer_start += samples / DECODE_SAMPLE_RATE
+
+    def _transcribe(self, audio: np.ndarray) -> List[Dict]:
+        """Transcribes the buffer; timestamps are shifted to recording time."""
+        result = transcription_service.transcribe(None, cleanup=False, block=True, audio=audio)
+        offset = self.buffer_start
+        segments = []
+        for segment in result["segments"]:
+            segments.append({
+                **segment,
+                "start": round(segment["start"] + offset, 2),
+                "end": round(segment["end"] + offset, 2),
+                "words": [
+                    {**w, "start": round(w["start"] + offset, 2), "end": round(w["end"] + offset, 2)}
+                    for w in segment.get("words", [])
+                ],
+            })
+        return segments
+
+    def step(self, final: bool = False) -> Dict[str, Any]:
+        """
+        Runs one transcription round over the uncommitted audio (blocking; run it in a thread).
+
+        Args:
+            final (bool): Recording has stopped; commit everything.
+
+        Returns:
+            dict: The segments committed in this round, the current tentative segments
+            and running speech metrics.
+        """
+        audio = self._window()
+        window_seconds = len(audio) / DECODE_SAMPLE_RATE
+        segments = self._transcribe(audio) if len(audio) else []
+
+        if final:
+            newly_committed = segments
+        else:
+            cutoff = self.buffer_start + window_seconds - settings.live_holdback_seconds
+            newly_committed = []
+            for segment in segments:
+                if segment["end"] > cutoff:
+                    break
+                newly_committed.append(segment)
+            # Whisper handles at most 30 s; never let the buffer outgrow the window
+            if not newly_committed and window_seconds >= settings.live_max_window_seconds:
+                newly_committed = segments[:-1] or segments
+
+        if newly_committed:
+            cut = newly_committed[-1]["end"]
+        elif not segments and window_seconds >= settings.live_max_window_seconds:
+            # Long silence: keep only the last holdback seconds
+            cut = self.buffer_start + window_seconds - settings.live_holdback_seconds
+        else:
+            cut = self.buffer_start
+        if final:
+            cut = self.buffer_start + window_seconds
+
+        self.committed.extend(newly_committed)
+        self._metrics.add_segments(newly_committed)
+        self.tentative = segments[len(newly_committed):]
+        self._drop(int(round((cut - self.buffer_start) * DECODE_SAMPLE_RATE)))
+
+        return {
+            "type": "final" if final else "partial",
+            "committed": newly_committed,
+            "tentative": self.tentative,
+            "received_seconds": round(self.received_seconds, 2),
+            "metrics": self.metrics(),
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Speech metrics over everything transcribed so far (committed + tentative): rate,
+        counts, totals and filler breakdown. The per-pause / per-filler lists are only in
+        the final analysis, so a round costs O(new words), not O(session).
+        """
+        return self._metrics.preview(self.tentative, details=False)
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Flushes the resampler, transcribes the remaining audio and returns the complete
+        result in the same shape as the upload pipeline's transcription + analysis.
+        """
+        if self._resampler is not None:
+            self._append(self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+        update = self.step(final=True)
+        transcription = {
+            "full_text": " ".join(s["text"] for s in self.committed).strip(),
+            "segments": self.committed,
+        }
+        return {
+            **update,
+            "transcription": transcription,
+            "analysis": self._metrics.result(),
+        }
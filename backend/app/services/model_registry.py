@@ -0,0 +1,241 @@
+import gc
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+from ..utils.helpers import log_info, log_error
+from ..utils.metrics import metrics
+
+# Model Registry
+# --------------
+# One place that owns every heavy ML model (Whisper, SentenceTransformer).
+# - Models are registered by the service that uses them, with a loader and an
+#   optional warmup function (a dummy inference that allocates buffers/caches).
+# - `preload` loads and warms them up at startup so the first real request is fast.
+#   The readiness probe (/health/ready) only passes once preloading is done.
+# - Models unused for `model_idle_timeout_seconds` are unloaded to free RAM
+#   and transparently reloaded on the next `get`.
+# - With `preload_in_parent`, weights are loaded when app.main is imported. Under
+#   `gunicorn --preload` that happens in the master, so forked workers share the
+#   weights copy-on-write instead of each holding a private copy.
+
+MODEL_LOAD_SECONDS = metrics.histogram("model_load_seconds", "Time to load model weights", ["model"])
+MODEL_WARMUP_SECONDS = metrics.histogram("model_warmup_seconds", "Time of the warmup inference after a load", ["model"])
+MODEL_LOADS = metrics.counter("model_loads_total", "Model loads (including reloads after idle eviction)", ["model"])
+
+def _process_rss_bytes() -> Optional[int]:
+    """Resident memory of this process (Linux only). Used to measure load cost."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _estimate_model_bytes(model: Any) -> Optional[int]:
+    """Size of the weights for torch modules (parameters + buffers)."""
+    try:
+        params = sum(p.numel() * p.element_size() for p in model.parameters())
+        buffers = sum(b.numel() * b.element_size() for b in model.buffers())
+        return int(params + buffers)
+    except Exception:
+        return None
+
+def _release_freed_memory():
+    """Asks glibc to hand freed heap pages back to the OS after an unload."""
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception:
+        pass
+
+class _ManagedModel:
+    """Bookkeeping for one registered model."""
+    def __init__(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], None]], preload: bool):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.preload = preload
+        self.instance = None
+        self.warmed_up = False
+        self.lock = threading.Lock()
+        self.last_used = 0.0
+        self.load_count = 0
+        self.load_time_seconds = None
+        self.warmup_time_seconds = None
+        self.weights_bytes = None
+        self.rss_delta_bytes = None
+        self.error = None
+
+class ModelRegistry:
+    """
+    Loads, warms up, shares and evicts ML models.
+    """
+    def __init__(self, idle_timeout_seconds: int, check_interval_seconds: int):
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._models: Dict[str, _ManagedModel] = {}
+        self._preload_done = threading.Event()
+        self._evictor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def register(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None, preload: bool = True):
+        """
+        Registers a model. Nothing is loaded yet.
+
+        Args:
+            name (str): Key used with `get`.
+            loader (callable): Returns the loaded model.
+            warmup (callable): Optional dummy inference run once after loading.
+            preload (bool): Whether `preload()` (startup) should load this model.
+        """
+        if name not in self._models:
+            self._models[name] = _ManagedModel(name, loader, warmup, preload)
+
+    def get(self, name: str) -> Any:
+        """Returns the model, loading (and warming up) it first if needed."""
+        entry = self._models[name]
+        # Read once: the idle evictor may clear entry.instance at any moment
+        instance = entry.instance
+        if instance is not None:
+            entry.last_used = time.monotonic()
+            return instance
+        return self._load(entry, warm=True)
+
+    def _load(self, entry: _ManagedModel, warm: bool) -> Any:
+        """Loads (and optionally warms up) the model. Returns the instance, taken under the lock."""
+        with entry.lock:
+            if entry.instance is None:
+                log_info(f"Loading model '{entry.name}'...", model=entry.name)
+                rss_before = _process_rss_bytes()
+                started = time.perf_counter()
+                try:
+                    instance = entry.loader()
+                except Exception as e:
+                    entry.error = str(e)
+                    raise
+                entry.load_time_seconds = round(time.perf_counter() - started, 3)
+                MODEL_LOAD_SECONDS.observe(entry.load_time_seconds, model=entry.name)
+                MODEL_LOADS.inc(model=entry.name)
+                rss_after = _process_rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    entry.rss_delta_bytes = rss_after - rss_before
+                entry.weights_bytes = _estimate_model_bytes(instance)
+                entry.instance = instance
+                entry.warmed_up = False
+                entry.load_count += 1
+                entry.error = None
+                entry.last_used = time.monotonic()
+                log_info(f"Model '{entry.name}' loaded in {entry.load_time_seconds}s", model=entry.name)
+
+            if warm and not entry.warmed_up and entry.warmup is not None:
+                started = time.perf_counter()
+                entry.warmup(entry.instance)
+                entry.warmup_time_seconds = round(time.perf_counter() - started, 3)
+                MODEL_WARMUP_SECONDS.observe(entry.warmup_time_seconds, model=entry.name)
+            entry.warmed_up = True
+            # A long load + warmup must not count as idle time
+            entry.last_used = time.monotonic()
+            return entry.instance
+
+    def preload(self, names: Optional[List[str]] = None, warm: bool = True):
+        """
+        Loads (and optionally warms up) models ahead of traffic.
+
+        Args:
+            names (list): Models to load. Defaults to every model registered with preload=True.
+            warm (bool): Run the warmup inference. Skipped when preloading in a parent
+                process, because running torch before fork() can deadlock the children.
+                Each worker then warms up its own shared copy at startup.
+        """
+        targets = names if names is not None else [n for n, m in self._models.items() if m.preload]
+        for name in targets:
+            try:
+                self._load(self._models[name], warm=warm)
+            except Exception as e:
+                # We don't crash here; /health/ready reports the failure.
+                log_error(f"Error preloading model '{name}': {e}", model=name)
+        if warm:
+            self._preload_done.set()
+
+    def share_with_forked_workers(self):
+        """
+        Call after loading in the parent process and before forking workers.
+
+        gc.freeze() moves every existing object into a permanent generation that
+        the garbage collector never scans. Without it, the first GC pass in each
+        worker writes to every object header and copies the weight pages.
+        """
+        gc.freeze()
+
+    def mark_ready(self):
+        """Used when preloading is disabled: models load lazily and we are ready at once."""
+        self._preload_done.set()
+
+    def is_ready(self) -> bool:
+        if not self._preload_done.is_set():
+            return False
+        # An evicted model is reloaded on demand, so only a failed load makes us unready
+        return not any(m.error for m in self._models.values() if m.preload)
+
+    def unload(self, name: str, idle_for: Optional[float] = None):
+        """Unloads the model; with `idle_for`, only if it is still unused for that many seconds."""
+        entry = self._models[name]
+        with entry.lock:
+            if entry.instance is None:
+                return
+            if idle_for is not None and time.monotonic() - entry.last_used <= idle_for:
+                return  # Used again since the evictor checked
+            entry.instance = None
+            entry.warmed_up = False
+        _release_freed_memory()
+        log_info(f"Unloaded idle model '{name}'", model=name)
+
+    def start_idle_evictor(self):
+        """Starts a daemon thread that unloads models idle for longer than the timeout."""
+        if self.idle_timeout_seconds <= 0 or self._evictor is not None:
+            return
+        self._stop.clear()
+        self._evictor = threading.Thread(target=self._evict_loop, name="model-evictor", daemon=True)
+        self._evictor.start()
+
+    def stop(self):
+        self._stop.set()
+        self._evictor = None
+
+    def _evict_loop(self):
+        while not self._stop.wait(self.check_interval_seconds):
+            now = time.monotonic()
+            for name, entry in self._models.items():
+                if entry.instance is not None and now - entry.last_used > self.idle_timeout_seconds:
+                    self.unload(name, idle_for=self.idle_timeout_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        models = {}
+        for name, entry in self._models.items():
+            models[name] = {
+                "loaded": entry.instance is not None,
+                "warmed_up": entry.warmed_up,
+                "load_count": entry.load_count,
+                "load_time_seconds": entry.load_time_seconds,
+                "warmup_time_seconds": entry.warmup_time_seconds,
+                "weights_bytes": entry.weights_bytes,
+                "rss_delta_bytes": entry.rss_delta_bytes,
+                "idle_seconds": round(now - entry.last_used, 1) if entry.instance is not None else None,
+                "error": entry.error,
+            }
+        return {
+            "ready": self.is_ready(),
+            "process_rss_bytes": _process_rss_bytes(),
+            "idle_timeout_seconds": self.idle_timeout_seconds,
+            "models": models,
+        }
+
+# Singleton instance
+model_registry = ModelRegistry(
+    idle_timeout_seconds=settings.model_idle_timeout_seconds,
+    check_interval_seconds=settings.model_eviction_check_interval_seconds,
+)
@@ -0,0 +1,228 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+from . import transcription_service, speech_analysis_service, audio_analysis_service, result_cache_service, archive_service
+from . import session_service
+from .audio_decode import decode_audio, audio_duration, DECODE_SAMPLE_RATE
+from .filler_matcher import normalize_lexicons
+from .s3_service import s3_service
+from .stage_graph import StageGraph
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.helpers import log_debug_message, log_warning
+from ..utils.metrics import metrics, record_timing
+
+# Transcription Pipeline
+# ----------------------
+# The full upload pipeline (Whisper -> speech metrics -> prosody -> archive)
+# lives here so the synchronous endpoint and the background job workers
+# run exactly the same steps.
+#
+# The steps form a small dependency graph (see stage_graph.py). Stages that do
+# not depend on each other run at the same time:
+#
+#   decoding --> transcribing --------> analyzing_speech
+#       |              |
+#       |              v
+#       +--> extracting_prosody --> analyzing_audio
+#
+#   archiving (only needs the uploaded file)
+#
+# Pitch tracking only needs the transcript for the final per-segment summary,
+# so the expensive part runs next to Whisper and a request takes roughly
+# max(Whisper, pitch tracking) instead of their sum.
+
+# All stages, used to report job progress (finished stages / total).
+PIPELINE_STAGES = ["decoding", "transcribing", "extracting_prosody", "analyzing_speech", "analyzing_audio", "archiving"]
+
+# Shared by all pipelines. Stages never submit work to this pool themselves, so it cannot deadlock.
+_stage_executor = ThreadPoolExecutor(max_workers=settings.pipeline_stage_workers, thread_name_prefix="pipeline-stage")
+
+STAGE_SECONDS = metrics.histogram("pipeline_stage_seconds", "Duration of each pipeline stage that ran", ["stage"])
+PIPELINE_SECONDS = metrics.histogram("pipeline_seconds", "Duration of whole pipeline runs", ["cached"])
+
+def cache_options(pitch_backend: str, filler_lexicons: str) -> Dict[str, Any]:
+    """Every setting that changes the pipeline output must be part of the cache key."""
+    options = {
+        "word_timestamps": True,
+        "include_analysis": settings.result_cache_include_analysis,
+        "pitch_backend": pitch_backend,
+        "prosody_sample_rate": settings.prosody_sample_rate,
+    }
+    if settings.result_cache_include_analysis:
+        options["speech_analysis_version"] = speech_analysis_service.ANALYSIS_VERSION
+        options["filler_lexicons"] = filler_lexicons
+    return options
+
+def _under_stream_threshold(file_path: str) -> bool:
+    threshold = settings.prosody_stream_threshold_seconds
+    duration = audio_duration(file_path)
+    return bool(threshold) and duration is not None and duration <= threshold
+
+def run_transcription_pipeline(file_path: str, on_stage: Optional[Callable[[List[str], int], None]] = None,
+                               block: bool = False, audio_hash: Optional[str] = None,
+                               pitch_backend: Optional[str] = None, interview_id: Optional[int] = None,
+                               job_id: Optional[str] = None, filename: Optional[str] = None,
+                               candidate_id: Optional[str] = None, filler_lexicons: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs every analysis step on a saved audio file.
+
+    This is blocking (CPU-bound) work. Never call it directly from an async route;
+    use a threadpool or the job queue instead.
+
+    Args:
+        file_path (str): Path to the saved upload. The caller is responsible for deleting it.
+        on_stage (callable): Optional callback invoked with (running stage names, number of
+            finished stages) whenever a stage starts or finishes. Runs in the calling thread.
+        block (bool): Wait for a free Whisper worker instead of failing fast with a 503.
+        audio_hash (str): SHA-256 of the file. When given, results are read from / written
+            to the result cache.
+        pitch_backend (str): F0 tracker for the emotional analysis. Defaults to settings.pitch_backend.
+        interview_id, job_id, filename, candidate_id: Stored with the session (see session_service.py).
+        filler_lexicons (str): Filler lexicons for the speech analysis, e.g. "en,acme".
+            Defaults to settings.filler_lexicons.
+
+    Returns:
+        dict: The merged transcription, speech analysis, emotional stability, archive URL and
+        archive upload status, the stored `session_id`, plus `timings` (wall-clock seconds of the whole run and of each stage that ran).
+    """
+    started = time.perf_counter()
+    pitch_backend = pitch_backend or settings.pitch_backend
+    filler_lexicons = normalize_lexicons(filler_lexicons)
+
+    cached = None
+    if audio_hash:
+        db = SessionLocal()
+        try:
+            cached = result_cache_service.get_cached_result(
+                db, audio_hash, transcription_service.MODEL_NAME, cache_options(pitch_backend, filler_lexicons)
+            )
+        finally:
+            db.close()
+
+    def decode(inputs: Dict[str, Any]):
+        # Decode once: Whisper and the prosody extractor share the same 16 kHz buffer
+        try:
+            return decode_audio(file_path)
+        except Exception as e:
+            # Let each step decode (and report errors) on its own, as before
+            log_warning(f"Shared decode failed, falling back to per-step decoding: {e}", file_path=file_path)
+            return None
+
+    def transcribe(inputs: Dict[str, Any]):
+        # cleanup=False because we need the file for the other steps
+        return transcription_service.transcribe(file_path, cleanup=False, block=block, audio=inputs["decoding"])
+
+    def analyze_speech(inputs: Dict[str, Any]):
+        return speech_analysis_service.analyze_speech(inputs["transcribing"], lexicon=filler_lexicons)
+
+    def extract_prosody(inputs: Dict[str, Any]):
+        # A failed audio analysis must not fail the request: hand the error on to analyzing_audio
+        try:
+            return audio_analysis_service.build_prosody_index(
+                file_path, pitch_backend, audio_hash, audio=inputs["decoding"], audio_sr=DECODE_SAMPLE_RATE
+            )
+        except Exception as e:
+            return e
+
+    def analyze_audio(inputs: Dict[str, Any]):
+        try:
+            index = inputs["extracting_prosody"]
+            if isinstance(index, Exception):
+                raise index
+            return audio_analysis_service.summarize_segments(index, inputs["transcribing"].get("segments", []))
+        except Exception as e:
+            log_warning(f"Error in audio analysis: {e}", file_path=file_path)
+            return {"error": str(e)}
+
+    def archive(inputs: Dict[str, Any]):
+        # This will only archive if use_s3_storage is True in config.
+        # The upload itself runs in the background (see archive_service.py)
+        if not s3_service.enabled:
+            log_debug_message("S3 upload skipped (not configured)")
+            return None
+        try:
+            return archive_service.archive_file(file_path, audio_hash=audio_hash)
+        except Exception as e:
+            log_warning(f"Could not queue archive upload: {e}", file_path=file_path)
+            return {"archive_id": None, "status": "failed", "archive_url": None, "error": str(e)}
+
+    graph = StageGraph()
+    # The PCM buffer can be large (~230 MB per hour of audio); keep=False frees it
+    # as soon as Whisper and the prosody extractor are done with it
+    graph.add("decoding", decode, keep=False)
+    graph.add("transcribing", transcribe, deps=["decoding"])
+    graph.add("extracting_prosody", extract_prosody, deps=["decoding"])
+    graph.add("analyzing_speech", analyze_speech, deps=["transcribing"])
+    graph.add("analyzing_audio", analyze_audio, deps=["transcribing", "extracting_prosody"])
+    graph.add("archiving", archive)
+
+    # Cached results skip their stages
+    needs_prosody = not (cached and "emotional_stability" in cached)
+    done: Dict[str, Any] = {}
+    if cached:
+        done["transcribing"] = cached["transcription"]
+        if "analysis" in cached:
+            done["analyzing_speech"] = cached["analysis"]
+        # Only the prosody extractor would use the buffer. Past the streaming threshold
+        # (or with an unknown duration) it reads the file block by block instead
+        if not (needs_prosody and settings.prosody_sample_rate and _under_stream_threshold(file_path)):
+            done["decoding"] = None
+    if not needs_prosody:
+        done["extracting_prosody"] = None
+        done["analyzing_audio"] = cached["emotional_stability"]
+
+    results, stage_timings = graph.run(_stage_executor, done, on_change=on_stage)
+    transcription_result = results["transcribing"]
+    analysis_result = results["analyzing_speech"]
+    emotional_analysis = results["analyzing_audio"]
+    archive = results["archiving"]
+    for stage, timing in stage_timings.items():
+        STAGE_SECONDS.observe(timing["seconds"], stage=stage)
+        record_timing(stage, timing["seconds"])
+
+    if audio_hash and not cached:
+        payload = {"transcription": transcription_result}
+        # Failed audio analysis is not cached, so a retry gets another chance
+        if settings.result_cache_include_analysis and "error" not in emotional_analysis:
+            payload["analysis"] = analysis_result
+            payload["emotional_stability"] = emotional_analysis
+        db = SessionLocal()
+        try:
+            result_cache_service.store_result(
+                db, audio_hash, transcription_service.MODEL_NAME, cache_options(pitch_backend, filler_lexicons), payload
+            )
+        finally:
+            db.close()
+
+    result = {
+        "transcription": transcription_result,
+        "analysis": analysis_result,
+        "emotional_stability": emotional_analysis,
+        # Where the recording is archived (the local path if S3 is off); the upload may still be running
+        "archive_url": archive["archive_url"] if archive else file_path,
+        "archive": archive,  # Upload status to poll via GET /api/v1/archives/{archive_id}
+        "audio_hash": audio_hash,  # Key for the prosody windows/timeline endpoints
+        "cached": cached is not None,
+        "timings": {
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "stages": stage_timings,  # {stage: {"start": offset, "seconds": duration}}
+        },
+    }
+
+    # Keep the result, so it can be reopened later without running the pipeline again
+    result["session_id"] = None
+    if settings.persist_sessions:
+        db = SessionLocal()
+        try:
+            result["session_id"] = session_service.save_session(
+                db, result, interview_id=interview_id, job_id=job_id, filename=filename, candidate_id=candidate_id
+            ).id
+        except Exception as e:
+            # The analysis itself succeeded; a storage problem must not lose it for the caller
+            db.rollback()
+            log_warning(f"Could not store session: {e}", job_id=job_id)
+        finally:
+            db.close()
+    PIPELINE_SECONDS.observe(time.perf_counter() - started, cached=str(cached is not None).lower())
+    return result
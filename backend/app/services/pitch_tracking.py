@@ -0,0 +1,148 @@
+import numpy as np
+import librosa
+from typing import Optional
+from ..utils.metrics import metrics
+
+# Pitch Tracking Backends
+# -----------------------
+# Fundamental frequency (F0) estimation is the slowest step of the upload pipeline.
+# Three interchangeable backends, all returning one F0 value per frame
+# (0.0 = unvoiced / silence), aligned with `librosa.feature.rms(center=True)` frames:
+#
+# - "pyin": librosa.pyin (Probabilistic YIN + HMM smoothing). Most robust, slowest.
+# - "yin":  librosa.yin plus an energy gate for voicing. ~20-30x faster than pyin,
+#           but the energy gate is a crude voicing decision.
+# - "fast": our own YIN over framed NumPy arrays. The difference function is computed
+#           for a whole block of frames at once with FFT autocorrelation; no Python
+#           loop per frame. ~15-20x faster than pyin, and its aperiodicity-based
+#           voicing agrees with pyin far better than the "yin" energy gate.
+#
+# `benchmarks/bench_pitch.py` reports speed and agreement with pyin for each backend.
+
+PITCH_BACKENDS = ("pyin", "yin", "fast")
+
+# Human voice range (50Hz - 500Hz covers most speech)
+DEFAULT_FMIN = 50
+DEFAULT_FMAX = 500
+
+# YIN aperiodicity threshold: a frame is voiced if its normalized difference dips below this
+YIN_THRESHOLD = 0.15
+
+# Frames quieter than this (relative to the loudest frame) are treated as silence by "yin"
+SILENCE_DB = -40.0
+
+# Frames processed per vectorized block in "fast" mode (bounds the temporary matrices)
+FAST_BLOCK_FRAMES = 1024
+
+PITCH_SECONDS = metrics.histogram("pitch_tracking_seconds", "Duration of F0 estimation calls", ["backend"])
+
+def estimate_f0(y: np.ndarray, sr: int, backend: str = "pyin", frame_length: int = 2048, hop_length: int = 512,
+                fmin: float = DEFAULT_FMIN, fmax: float = DEFAULT_FMAX, center: bool = True) -> np.ndarray:
+    """
+    Estimates F0 per frame with the chosen backend.
+
+    Args:
+        y (np.ndarray): Mono float audio.
+        sr (int): Sample rate of `y`.
+        backend (str): One of PITCH_BACKENDS.
+        center (bool): Pad half a frame on both sides (librosa convention).
+
+    Returns:
+        np.ndarray: F0 in Hz per frame, 0.0 where unvoiced.
+    """
+    with PITCH_SECONDS.time(backend=backend):
+        return _estimate_f0(y, sr, backend, frame_length, hop_length, fmin, fmax, center)
+
+def _estimate_f0(y: np.ndarray, sr: int, backend: str, frame_length: int, hop_length: int,
+                 fmin: float, fmax: float, center: bool) -> np.ndarray:
+    if backend == "pyin":
+        f0, voiced_flag, voiced_probs = librosa.pyin(
+            y, fmin=fmin, fmax=fmax, sr=sr, frame_length=frame_length, hop_length=hop_length, center=center
+        )
+        # Replace NaNs (unvoiced segments) with 0 for calculation
+        return np.nan_to_num(f0)
+
+    if backend == "yin":
+        f0 = librosa.yin(
+            y, fmin=fmin, fmax=fmax, sr=sr, frame_length=frame_length, hop_length=hop_length,
+            trough_threshold=YIN_THRESHOLD, center=center
+        )
+        # librosa.yin reports a pitch for every frame, including silence
+        rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length, center=center)[0]
+        silent = librosa.amplitude_to_db(rms, ref=np.max) < SILENCE_DB
+        f0[silent[:len(f0)]] = 0.0
+        return f0
+
+    if backend == "fast":
+        return fast_yin(y, sr, frame_length=frame_length, hop_length=hop_length, fmin=fmin, fmax=fmax, center=center)
+
+    raise ValueError(f"Unknown pitch backend: {backend}. Supported: {', '.join(PITCH_BACKENDS)}")
+
+def fast_yin(y: np.ndarray, sr: int, frame_length: int = 2048, hop_length: int = 512,
+             fmin: float = DEFAULT_FMIN, fmax: float = DEFAULT_FMAX, threshold: float = YIN_THRESHOLD,
+             center: bool = True, block_frames: Optional[int] = None) -> np.ndarray:
+    """
+    Vectorized YIN pitch tracker.
+
+    How it works (per frame, but computed for a block of frames at once):
+    1. Difference function d(tau) = sum_j (x_j - x_{j+tau})^2, expanded into
+       energy terms and an autocorrelation that is computed with one FFT.
+    2. Cumulative mean normalized difference d'(tau) = d(tau) * tau / sum_{k<=tau} d(k).
+    3. The first tau whose d' drops below `threshold` (walked down to its local minimum)
+       is the period. No such tau means the frame is unvoiced.
+    4. Parabolic interpolation around that tau gives sub-sample precision.
+    """
+    y = np.asarray(y, dtype=np.float32)
+    if center:
+        y = np.pad(y, frame_length // 2, mode="constant")
+    if len(y) < frame_length:
+        return np.zeros(0, dtype=np.float32)
+
+    min_lag = max(1, int(np.floor(sr / fmax)))
+    max_lag = min(int(np.ceil(sr / fmin)), frame_length - 2)
+    win = frame_length - max_lag  # samples compared at every lag
+    n_fft = int(2 ** np.ceil(np.log2(frame_length + win)))
+
+    frames = np.lib.stride_tricks.sliding_window_view(y, frame_length)[::hop_length]
+    block = block_frames or FAST_BLOCK_FRAMES
+    f0 = np.zeros(len(frames), dtype=np.float32)
+    lags = np.arange(max_lag + 1)
+
+    for start in range(0, len(frames), block):
+        x = frames[start:start + block].astype(np.float64)
+
+        # 1. Autocorrelation acf[tau] = sum_{j<win} x_j * x_{j+tau}
+        spectrum = np.fft.rfft(x, n_fft, axis=1)
+        window_spectrum = np.fft.rfft(x[:, :win], n_fft, axis=1)
+        acf = np.fft.irfft(spectrum * np.conj(window_spectrum), n_fft, axis=1)[:, :max_lag + 1]
+
+        # Energy of x[tau : tau+win] for each tau, from a cumulative sum of squares
+        energy = np.cumsum(np.pad(x ** 2, ((0, 0), (1, 0))), axis=1)
+        window_energy = energy[:, lags + win] - energy[:, lags]
+        diff = np.maximum(window_energy[:, :1] + window_energy - 2.0 * acf, 0.0)
+
+        # 2. Cumulative mean normalized difference
+        cumulative = np.cumsum(diff[:, 1:], axis=1)
+        cmndf = np.ones_like(diff)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cmndf[:, 1:] = np.where(cumulative > 0, diff[:, 1:] * lags[1:] / cumulative, 1.0)
+
+        # 3. First dip below threshold that is a local minimum, searched in [min_lag, max_lag)
+        search = cmndf[:, min_lag:max_lag + 1]
+        is_candidate = (search[:, :-1] < threshold) & (search[:, 1:] >= search[:, :-1])
+        voiced = is_candidate.any(axis=1) & (window_energy[:, 0] > 1e-8)
+        tau = np.argmax(is_candidate, axis=1) + min_lag
+
+        # 4. Parabolic interpolation around tau
+        rows = np.arange(len(x))
+        left = cmndf[rows, np.maximum(tau - 1, 0)]
+        mid = cmndf[rows, tau]
+        right = cmndf[rows, np.minimum(tau + 1, max_lag)]
+        denom = left - 2.0 * mid + right
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / denom, 0.0)
+        period = tau + np.clip(shift, -1.0, 1.0)
+
+        f0[start:start + len(x)] = np.where(voiced, sr / period, 0.0)
+
+    return f0
@@ -0,0 +1,189 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+# Prosody Index
+# -------------
+# Mean/std of pitch and energy for ANY time range, in O(1), without touching the audio.
+#
+# Built once per recording from the frame-level arrays (f0, rms). We keep prefix
+# (cumulative) sums of: voiced frame count, f0, f0^2, energy, energy^2.
+# For frames [a, b):
+#     count = C[b] - C[a]
+#     mean  = (S[b] - S[a]) / count
+#     var   = (Q[b] - Q[a]) / count - mean^2
+# so the per-segment loop, the 30-second semantic chunks and any user-selected
+# range in the UI are all simple array lookups.
+#
+# Indexes are saved as .npz files keyed by the recording's SHA-256 (and the
+# pitch backend), so the windows endpoint can answer later requests.
+
+# Score given when there is nothing to measure (no voiced frames / no frames)
+NEUTRAL_STABILITY = 0.5
+
+class ProsodyIndex:
+    """
+    Prefix-sum statistics over frame-level pitch and energy.
+    """
+    def __init__(self, frame_time: float, voiced_count: np.ndarray, f0_sum: np.ndarray, f0_sq_sum: np.ndarray,
+                 energy_sum: np.ndarray, energy_sq_sum: np.ndarray):
+        self.frame_time = float(frame_time)
+        self.voiced_count = voiced_count
+        self.f0_sum = f0_sum
+        self.f0_sq_sum = f0_sq_sum
+        self.energy_sum = energy_sum
+        self.energy_sq_sum = energy_sq_sum
+
+    @classmethod
+    def from_frames(cls, f0: np.ndarray, energy: np.ndarray, frame_time: float) -> "ProsodyIndex":
+        """
+        Args:
+            f0 (np.ndarray): Pitch per frame, 0 where unvoiced.
+            energy (np.ndarray): RMS energy per frame.
+            frame_time (float): Seconds per frame (hop_length / sr).
+        """
+        n = min(len(f0), len(energy))
+        f0 = np.asarray(f0[:n], dtype=np.float64)
+        energy = np.asarray(energy[:n], dtype=np.float64)
+
+        def prefix(values: np.ndarray) -> np.ndarray:
+            # Leading 0 so that sum of frames [a, b) is P[b] - P[a]
+            out = np.zeros(n + 1, dtype=np.float64)
+            np.cumsum(values, out=out[1:])
+            return out
+
+        return cls(
+            frame_time=frame_time,
+            voiced_count=prefix(f0 > 0),
+            f0_sum=prefix(f0),
+            f0_sq_sum=prefix(f0 ** 2),
+            energy_sum=prefix(energy),
+            energy_sq_sum=prefix(energy ** 2),
+        )
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.energy_sum) - 1
+
+    @property
+    def duration(self) -> float:
+        return self.num_frames * self.frame_time
+
+    def frame_range(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """Converts times to frame indices (same truncation as the original segment loop)."""
+        return int(start_time / self.frame_time), int(end_time / self.frame_time)
+
+    def window_stats(self, start_frames: np.ndarray, end_frames: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized statistics for many frame ranges [start, end) at once.
+        Ranges are clipped to the recording.
+        """
+        a = np.clip(np.asarray(start_frames, dtype=np.int64), 0, self.num_frames)
+        b = np.clip(np.asarray(end_frames, dtype=np.int64), 0, self.num_frames)
+        b = np.maximum(a, b)
+
+        frames = (b - a).astype(np.float64)
+        voiced = self.voiced_count[b] - self.voiced_count[a]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pitch_mean = np.where(voiced > 0, (self.f0_sum[b] - self.f0_sum[a]) / voiced, 0.0)
+            pitch_var = np.where(voiced > 0, (self.f0_sq_sum[b] - self.f0_sq_sum[a]) / voiced - pitch_mean ** 2, 0.0)
+            energy_mean = np.where(frames > 0, (self.energy_sum[b] - self.energy_sum[a]) / frames, 0.0)
+            energy_var = np.where(frames > 0, (self.energy_sq_sum[b] - self.energy_sq_sum[a]) / frames - energy_mean ** 2, 0.0)
+
+        # Cancellation can leave tiny negative variances
+        pitch_std = np.sqrt(np.maximum(pitch_var, 0.0))
+        energy_std = np.sqrt(np.maximum(energy_var, 0.0))
+
+        # Coefficient of Variation (CV) - Normalized variance
+        pitch_stability = np.where(
+            voiced > 0, 1.0 - np.minimum(pitch_std / (pitch_mean + 1e-6), 1.0), NEUTRAL_STABILITY
+        )
+        energy_stability = np.where(
+            frames > 0, 1.0 - np.minimum(energy_std / (energy_mean + 1e-6), 1.0), NEUTRAL_STABILITY
+        )
+
+        return {
+            "frames": frames,
+            "voiced_frames": voiced,
+            "pitch_mean": pitch_mean,
+            "pitch_std": pitch_std,
+            "energy_mean": energy_mean,
+            "energy_std": energy_std,
+            "pitch_stability": pitch_stability,
+            "energy_stability": energy_stability,
+        }
+
+    def windows(self, ranges: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """Stability for arbitrary (start, end) time ranges in seconds."""
+        if not ranges:
+            return []
+        starts, ends = zip(*(self.frame_range(s, e) for s, e in ranges))
+        stats = self.window_stats(np.array(starts), np.array(ends))
+        return [
+            _window_result(start, end, stats, i)
+            for i, (start, end) in enumerate(ranges)
+        ]
+
+    def timeline(self, window_seconds: float, step_seconds: float,
+                 start_time: float = 0.0, end_time: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Sliding-window stability timeline, e.g. 30s windows every 5s."""
+        end_time = self.duration if end_time is None else min(end_time, self.duration)
+        starts = np.arange(start_time, max(end_time - window_seconds, start_time) + 1e-9, step_seconds)
+        ranges = [(float(s), float(min(s + window_seconds, end_time))) for s in starts]
+        return self.windows(ranges)
+
+    def save(self, path: str):
+        np.savez(
+            path, frame_time=self.frame_time, voiced_count=self.voiced_count, f0_sum=self.f0_sum,
+            f0_sq_sum=self.f0_sq_sum, energy_sum=self.energy_sum, energy_sq_sum=self.energy_sq_sum,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ProsodyIndex":
+        with np.load(path) as data:
+            return cls(
+                frame_time=float(data["frame_time"]), voiced_count=data["voiced_count"], f0_sum=data["f0_sum"],
+                f0_sq_sum=data["f0_sq_sum"], energy_sum=data["energy_sum"], energy_sq_sum=data["energy_sq_sum"],
+            )
+
+def _window_result(start: float, end: float, stats: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+    pitch_stability = float(stats["pitch_stability"][i])
+    energy_stability = float(stats["energy_stability"][i])
+    return {
+        "start": round(start, 2),
+        "end": round(end, 2),
+        "pitch_stability": round(pitch_stability, 2),
+        "energy_stability": round(energy_stability, 2),
+        "pitch_mean_hz": round(float(stats["pitch_mean"][i]), 1),
+        "voiced_ratio": round(float(stats["voiced_frames"][i] / stats["frames"][i]), 2) if stats["frames"][i] else 0.0,
+        "emotional_state": "Stable" if (pitch_stability > 0.7 and energy_stability > 0.7) else "Variable",
+    }
+
+# --- Storage ---
+
+def _index_path(audio_hash: str, variant: str) -> str:
+    safe_variant = re.sub(r"[^A-Za-z0-9_-]", "_", variant)
+    return os.path.join(settings.prosody_index_dir, f"{audio_hash}_{safe_variant}.npz")
+
+def save_index(index: ProsodyIndex, audio_hash: str, variant: str):
+    """Stores the index for a recording. `variant` distinguishes analysis settings (e.g. pitch backend)."""
+    os.makedirs(settings.prosody_index_dir, exist_ok=True)
+    index.save(_index_path(audio_hash, variant))
+
+def load_index(audio_hash: str, variant: str) -> Optional[ProsodyIndex]:
+    """Loads a stored index (recently used ones stay in memory). None if it was never built."""
+    path = _index_path(audio_hash, variant)
+    if not os.path.exists(path):
+        return None
+    return _load_cached(path)
+
+@lru_cache(maxsize=32)
+def _load_cached(path: str) -> ProsodyIndex:
+    # Safe to cache: a path always holds the same content (keyed by the audio hash)
+    return ProsodyIndex.load(path)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, Any, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.cache import CachedTranscription
+from ..utils.helpers import log_debug_message, log_warning
+from ..utils.metrics import metrics
+
+# Transcription Result Cache
+# --------------------------
+# Candidates re-upload the same recording and the frontend retries on timeouts.
+# Results are stored under a key built from the recording's SHA-256 (computed
+# while the upload streams to disk) plus everything that changes the output:
+# the model name and the processing options. A repeat upload is then a single
+# primary-key lookup instead of a full Whisper run.
+#
+# The table is capped at `result_cache_max_bytes`; the least recently used
+# entries are evicted first.
+
+CACHE_LOOKUPS = metrics.counter("cache_lookups_total", "Cache lookups by cache and outcome (hit/miss)", ["cache", "result"])
+
+def make_cache_key(audio_hash: str, model_name: str, options: Dict[str, Any]) -> str:
+    """Builds a deterministic key. Options are serialized with sorted keys."""
+    raw = f"{audio_hash}|{model_name}|{json.dumps(options, sort_keys=True)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def get_cached_result(db: Session, audio_hash: str, model_name: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Looks up a cached result and refreshes its LRU timestamp.
+
+    Returns:
+        dict or None: The cached payload on a hit.
+    """
+    if not settings.result_cache_enabled:
+        return None
+
+    entry = db.get(CachedTranscription, make_cache_key(audio_hash, model_name, options))
+    if entry is None:
+        CACHE_LOOKUPS.inc(cache="result", result="miss")
+        return None
+    CACHE_LOOKUPS.inc(cache="result", result="hit")
+
+    entry.last_accessed_at = datetime.utcnow()
+    entry.hit_count = (entry.hit_count or 0) + 1
+    db.commit()
+    return json.loads(entry.payload)
+
+def store_result(db: Session, audio_hash: str, model_name: str, options: Dict[str, Any], payload: Dict[str, Any]):
+    """
+    Saves a result in the cache and evicts old entries if the size cap is exceeded.
+
+    Two requests for the same recording can finish at the same time, so the row is
+    upserted. The cache is best effort: a failed write is logged and rolled back,
+    never raised to the caller (the transcription itself already succeeded).
+    """
+    if not settings.result_cache_enabled:
+        return
+
+    encoded = json.dumps(payload)
+    key = make_cache_key(audio_hash, model_name, options)
+    values = {
+        "audio_hash": audio_hash,
+        "model_name": model_name,
+        "options": json.dumps(options, sort_keys=True),
+        "payload": encoded,
+        "size_bytes": len(encoded),
+        "last_accessed_at": datetime.utcnow(),
+    }
+    try:
+        _upsert(db, key, values)
+        db.commit()
+        _evict_lru(db, settings.result_cache_max_bytes)
+    except SQLAlchemyError as e:
+        db.rollback()
+        log_warning("Could not store result in cache", cache_key=key, error=str(e))
+
+def _upsert(db: Session, key: str, values: Dict[str, Any]):
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        db.execute(
+            insert(CachedTranscription)
+            .values(cache_key=key, hit_count=0, **values)
+            .on_conflict_do_update(index_elements=["cache_key"], set_=values)
+        )
+        return
+    entry = db.get(CachedTranscription, key) or CachedTranscription(cache_key=key)
+    for name, value in values.items():
+        setattr(entry, name, value)
+    db.add(entry)
+
+def _evict_lru(db: Session, max_bytes: int):
+    total = db.query(func.coalesce(func.sum(CachedTranscription.size_bytes), 0)).scalar()
+    if total <= max_bytes:
+        return
+
+    # Walk from least to most recently used, deleting until we are under the cap
+    oldest_first = (
+        db.query(CachedTranscription.cache_key, CachedTranscription.size_bytes)
+        .order_by(CachedTranscription.last_accessed_at)
+        .all()
+    )
+    to_delete = []
+    for key, size in oldest_first:
+        if total <= max_bytes:
+            break
+        to_delete.append(key)
+        total -= size
+
+    db.query(CachedTranscription).filter(CachedTranscription.cache_key.in_(to_delete)).delete(synchronize_session=False)
+    db.commit()
+    log_debug_message(f"Result cache evicted {len(to_delete)} entries")
+
+def purge_cache(db: Session) -> int:
+    """Deletes every cached result. Returns the number of entries removed."""
+    deleted = db.query(CachedTranscription).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def cache_stats(db: Session) -> Dict[str, Any]:
+    entries, total_bytes, hits = db.query(
+        func.count(CachedTranscription.cache_key),
+        func.coalesce(func.sum(CachedTranscription.size_bytes), 0),
+        func.coalesce(func.sum(CachedTranscription.hit_count), 0),
+    ).one()
+    return {
+        "enabled": settings.result_cache_enabled,
+        "entries": entries,
+        "total_bytes": total_bytes,
+        "max_bytes": settings.result_cache_max_bytes,
+        "total_hits": hits,
+    }
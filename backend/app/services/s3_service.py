@@ -1,36 +1,90 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError
-from fastapi import HTTPException
 import os
 from ..config import settings
-from ..utils.helpers import log_debug_message
+from ..utils.helpers import log_debug_message, log_info, log_warning, log_error
 
 class S3Service:
     """
-    Handles uploading files to AWS S3.
+    Handles uploading files to AWS S3 (or an S3-compatible store such as MinIO
+    or moto, via settings.s3_endpoint_url).
+
+    One client is shared by every upload: boto3 clients are thread-safe, and
+    reusing it keeps its HTTP connections (and TLS sessions) alive. Files above
+    settings.s3_multipart_threshold are sent as multipart uploads whose parts
+    go out in parallel. Uploads normally run in the background, see archive_service.py.
     """
     def __init__(self):
         self.s3_client = None
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.s3_multipart_threshold,
+            multipart_chunksize=settings.s3_multipart_chunksize,
+            max_concurrency=settings.s3_transfer_concurrency,
+            use_threads=True,
+        )
         if settings.use_s3_storage:
             try:
                 self.s3_client = boto3.client(
                     's3',
                     aws_access_key_id=settings.aws_access_key_id,
                     aws_secret_access_key=settings.aws_secret_access_key,
-                    region_name=settings.aws_region
+                    region_name=settings.aws_region,
+                    endpoint_url=settings.s3_endpoint_url or None,
+                    config=Config(
+                        # Every upload worker sends up to s3_transfer_concurrency parts at once
+                        max_pool_connections=max(
+                            settings.s3_max_pool_connections,
+                            settings.s3_upload_workers * settings.s3_transfer_concurrency
+                        ),
+                        connect_timeout=settings.s3_connect_timeout_seconds,
+                        read_timeout=settings.s3_read_timeout_seconds,
+                        # Quick retries of single requests; whole uploads are retried by the archive queue
+                        retries={"max_attempts": 3, "mode": "standard"},
+                    ),
                 )
-                log_debug_message("Initialized S3 Client")
+                log_info("Initialized S3 Client")
             except Exception as e:
-                log_debug_message(f"Failed to initialize S3 client: {e}")
+                log_error(f"Failed to initialize S3 client: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.s3_client is not None
+
+    def uri(self, object_name: str) -> str:
+        # For simplicity, we return the s3:// URI as a reference (bucket may be private).
+        return f"s3://{settings.s3_bucket_name}/{object_name}"
+
+    def upload(self, file_path: str, object_name: str = None) -> str:
+        """
+        Uploads a file to the S3 bucket (multipart for large files). Raises on failure.
+
+        Args:
+            file_path: File to upload
+            object_name: S3 object name. If not specified then file_name is used
+
+        Returns:
+            The S3 URI of the stored object
+        """
+        if not self.s3_client:
+            raise RuntimeError("S3 storage is not configured")
+        if object_name is None:
+            object_name = os.path.basename(file_path)
+
+        self.s3_client.upload_file(file_path, settings.s3_bucket_name, object_name, Config=self.transfer_config)
+        s3_uri = self.uri(object_name)
+        log_info(f"Uploaded to S3: {s3_uri}")
+        return s3_uri
 
     def upload_file(self, file_path: str, object_name: str = None) -> str:
         """
-        Uploads a file to an S3 bucket.
-        
+        Uploads a file to an S3 bucket, in the calling thread.
+
         Args:
             file_path: File to upload
             object_name: S3 object name. If not specified then file_name is used
-            
+
         Returns:
             The public URL or S3 URI if successful
         """
@@ -38,26 +92,17 @@ class S3Service:
             log_debug_message("S3 upload skipped (not configured)")
             return file_path # Keep local path if S3 is off
 
-        if object_name is None:
-            object_name = os.path.basename(file_path)
-
         try:
-            self.s3_client.upload_file(file_path, settings.s3_bucket_name, object_name)
-            
-            # Construct a simpler URL if bucket is public, or pre-signed URL if private.
-            # For simplicity, we return the s3:// URI for now as a reference.
-            s3_uri = f"s3://{settings.s3_bucket_name}/{object_name}"
-            log_debug_message(f"Uploaded to S3: {s3_uri}")
-            return s3_uri
-            
+            return self.upload(file_path, object_name)
+
         except FileNotFoundError:
-            log_debug_message("The file was not found")
+            log_warning("The file was not found", file_path=file_path)
             return None
         except NoCredentialsError:
-            log_debug_message("Credentials not available")
+            log_error("Credentials not available")
             return None
         except Exception as e:
-            log_debug_message(f"S3 Upload Error: {e}")
+            log_warning(f"S3 Upload Error: {e}", file_path=file_path)
             return None
 
 # Singleton instance
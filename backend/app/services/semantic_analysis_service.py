@@ -1,24 +1,35 @@
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
-# Global variable to hold the model instance (Singleton pattern)
-# We load this once to avoid high latency on every request.
+from ..config import settings
+from .model_registry import model_registry
+from .embedding_cache import embedding_cache
+
+# The model instance is owned by the model registry (Singleton pattern).
+# It is preloaded and warmed up at startup to avoid high latency on the first request.
 # 'all-MiniLM-L6-v2' is a fast, lightweight, and high-performance model for semantic similarity.
-_model = None
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+model_registry.register(
+    "sentence-transformer",
+    lambda: SentenceTransformer(MODEL_NAME),
+    warmup=lambda m: m.encode(["warmup sentence"]),
+)
 
 def get_model():
     """
-    Lazy-loads the Sentence Transformer model.
-    This ensures we only load the heavy model when we actually need it.
+    Returns the Sentence Transformer model from the registry.
+    If it was never preloaded (or was unloaded while idle) it is loaded here.
+    """
+    return model_registry.get("sentence-transformer")
+
+def encode_texts(texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Embeds texts through the embedding cache.
+    Only texts never seen before (for this model) are sent to `model.encode`.
     """
-    global _model
-    if _model is None:
-        print("Loading Semantic Model (all-MiniLM-L6-v2)...")
-        _model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("Model loaded successfully.")
-    return _model
+    return embedding_cache.encode(get_model(), MODEL_NAME, texts, batch_size=batch_size or settings.semantic_encode_batch_size)
 
 def chunk_transcript(transcript_segments: List[Dict], chunk_duration: int = 30) -> List[Dict]:
     """
@@ -91,6 +102,15 @@ def segment_resume(resume_text: str) -> List[str]:
     sections = [s.strip() for s in resume_text.split('\n\n') if s.strip()]
     return sections
 
+def l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Scales every row to unit length.
+    After this, a plain dot product between two rows IS their cosine similarity.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
 def compute_similarity(text_list_1: List[str], text_list_2: List[str]) -> np.ndarray:
     """
     Computes the cosine similarity matrix between two lists of strings.
@@ -101,101 +121,178 @@ def compute_similarity(text_list_1: List[str], text_list_2: List[str]) -> np.nda
        1.0 = Identical meaning
        0.0 = Unrelated
     """
-    model = get_model()
-    
-    # 1. Encode text into embeddings
+    # 1. Encode text into unit-length embeddings (cached across requests)
     # embeddings_1 shape: (num_texts_1, embedding_dim)
-    embeddings_1 = model.encode(text_list_1)
-    embeddings_2 = model.encode(text_list_2)
+    embeddings_1 = l2_normalize(encode_texts(text_list_1))
+    embeddings_2 = l2_normalize(encode_texts(text_list_2))
     
     # 2. Compute Cosine Similarity
     # Result is a matrix of shape (num_texts_1, num_texts_2)
-    return cosine_similarity(embeddings_1, embeddings_2)
+    return embeddings_1 @ embeddings_2.T
 
-def analyze_semantic_relevance(transcript_data: Dict, resume_text: str) -> Dict[str, Any]:
+def max_previous_similarity(embeddings: np.ndarray, block_size: int) -> np.ndarray:
     """
-    Main orchestration function for semantic analysis.
-    
-    1. Chunks the interview into 30s segments.
-    2. Segments the resume.
-    3. Compares each interview chunk against ALL resume sections.
-    4. Calculates Topic Drift and Redundancy.
+    For every row i, the highest cosine similarity with any earlier row j < i.
+    Row 0 has no earlier rows and gets -inf.
+
+    The full n x n similarity matrix is never built. We walk it in
+    (block_size x block_size) tiles below the diagonal and keep a running
+    maximum per row, so memory stays O(block_size^2) even for 90-minute interviews.
     """
-    # 1. Prepare Data
-    chunks = chunk_transcript(transcript_data.get("segments", []), chunk_duration=30)
-    resume_sections = segment_resume(resume_text)
-    
-    if not chunks or not resume_sections:
-        return {"error": "Insufficient data for analysis"}
+    block_size = max(1, int(block_size))  # A zero/negative setting would make range() fail
+    n = embeddings.shape[0]
+    result = np.full(n, -np.inf, dtype=np.float32)
 
-    model = get_model()
-    
-    # Pre-compute text lists specifically for embedding
-    chunk_texts = [c["text"] for c in chunks]
-    
+    for row_start in range(0, n, block_size):
+        row_end = min(row_start + block_size, n)
+        rows = embeddings[row_start:row_end]
+        row_ids = np.arange(row_start, row_end)[:, None]
+
+        # Only tiles that contain some j < i (columns up to the end of this row block)
+        for col_start in range(0, row_end, block_size):
+            col_end = min(col_start + block_size, row_end)
+            tile = rows @ embeddings[col_start:col_end].T
+            col_ids = np.arange(col_start, col_end)[None, :]
+
+            # Strictly lower-triangular mask: keep only "previous" chunks
+            tile = np.where(col_ids < row_ids, tile, -np.inf)
+            np.maximum(result[row_start:row_end], tile.max(axis=1), out=result[row_start:row_end])
+
+    return result
+
+def score_chunks(chunks: List[Dict], chunk_embeddings: np.ndarray,
+                 resume_sections: List[str], resume_embeddings: np.ndarray) -> Dict[str, Any]:
+    """
+    Computes relevance, coherence (topic drift) and redundancy from precomputed,
+    L2-normalized embeddings. Everything is a handful of matrix operations.
+
+    Args:
+        chunks (list): Output of `chunk_transcript`. Updated in place with the scores.
+        chunk_embeddings (np.ndarray): (num_chunks, dim), unit length rows.
+        resume_sections (list): Output of `segment_resume`.
+        resume_embeddings (np.ndarray): (num_sections, dim), unit length rows.
+    """
     # --- A. Relevance Analysis (Interview vs Resume) ---
-    # We compare every chunk to every resume section to find the "best match"
-    similarity_matrix = compute_similarity(chunk_texts, resume_sections)
-    
-    # Update chunks with relevance scores
-    for i, chunk in enumerate(chunks):
-        # extraction row i from matrix (this chunks correlation with all resume sections)
-        similarities = similarity_matrix[i]
-        
-        # Max score = how well this chunk matches the *most relevant* part of the resume
-        best_match_idx = np.argmax(similarities)
-        max_score = similarities[best_match_idx]
-        
-        chunk["relevance_score"] = round(float(max_score), 2)
-        chunk["matched_resume_section"] = resume_sections[best_match_idx][:100] + "..." # Snippet
-        
+    # Every chunk against every resume section in one product: (num_chunks, num_sections)
+    similarity_matrix = chunk_embeddings @ resume_embeddings.T
+
+    # Max score = how well each chunk matches the *most relevant* part of the resume
+    best_match_idx = np.argmax(similarity_matrix, axis=1)
+    max_scores = similarity_matrix[np.arange(len(chunks)), best_match_idx]
+
     # --- B. Topic Drift (Chunk vs Previous Chunk) ---
-    # We compare chunk[i] with chunk[i-1] to see if the conversation flows logically
+    # Row-wise dot product of each chunk with the one before it.
     # Low similarity might indicate a sudden topic switch (Drift).
-    chunk_embeddings = model.encode(chunk_texts)
-    drift_scores = []
-    
-    # We start from index 1 since 0 has no previous chunk
-    for i in range(1, len(chunks)):
-        # Reshape for sklearn (1, dim)
-        current_emb = chunk_embeddings[i].reshape(1, -1)
-        prev_emb = chunk_embeddings[i-1].reshape(1, -1)
-        
-        sim = cosine_similarity(current_emb, prev_emb)[0][0]
-        drift_scores.append(round(float(sim), 2))
-        
-        chunks[i]["coherence_with_prev"] = round(float(sim), 2)
-        
-    # First chunk gets a default value
-    if chunks:
-        chunks[0]["coherence_with_prev"] = 1.0
+    coherence = np.einsum("ij,ij->i", chunk_embeddings[1:], chunk_embeddings[:-1])
 
     # --- C. Redundancy (Chunk vs All Previous Chunks) ---
     # Check if the candidate is repeating themselves.
+    max_redundancy = max_previous_similarity(chunk_embeddings, settings.semantic_block_size)
+
+    # Round once, vectorized, then write into the chunk dicts
+    relevance_scores = np.round(max_scores.astype(np.float64), 2).tolist()
+    drift_scores = np.round(coherence.astype(np.float64), 2).tolist()
+    redundancy_scores = np.round(max_redundancy[1:].astype(np.float64), 2).tolist()
+
     redundancy_alerts = []
-    for i in range(1, len(chunks)):
-        current_emb = chunk_embeddings[i].reshape(1, -1)
-        # Compare with ALL previous chunks (0 to i-1)
-        prev_embeddings = chunk_embeddings[:i]
-        
-        sims = cosine_similarity(current_emb, prev_embeddings)[0]
-        max_redundancy = np.max(sims)
-        
-        chunks[i]["max_redundancy_score"] = round(float(max_redundancy), 2)
-        
-        if max_redundancy > 0.85: # Threshold for "highly repetitive"
+    for i, chunk in enumerate(chunks):
+        chunk["relevance_score"] = relevance_scores[i]
+        chunk["matched_resume_section"] = resume_sections[best_match_idx[i]][:100] + "..." # Snippet
+
+        if i == 0:
+            # First chunk has no previous chunk
+            chunk["coherence_with_prev"] = 1.0
+            chunk["max_redundancy_score"] = 0.0
+            continue
+
+        chunk["coherence_with_prev"] = drift_scores[i - 1]
+        chunk["max_redundancy_score"] = redundancy_scores[i - 1]
+
+        if max_redundancy[i] > 0.85: # Threshold for "highly repetitive"
             redundancy_alerts.append({
                 "chunk_index": i,
-                "timestamp": chunks[i]["timestamp"],
+                "timestamp": chunk["timestamp"],
                 "message": "Candidate repeated a previously discussed point."
             })
-    
-    if chunks:
-         chunks[0]["max_redundancy_score"] = 0.0
 
     return {
-        "overall_relevance": round(float(np.mean([c["relevance_score"] for c in chunks])), 2),
+        "overall_relevance": round(float(np.mean(relevance_scores)), 2),
         "chunk_analysis": chunks,
         "redundancy_alerts": redundancy_alerts,
         "topic_drift_timeline": drift_scores
     }
+
+def analyze_semantic_relevance(transcript_data: Dict, resume_text: str) -> Dict[str, Any]:
+    """
+    Main orchestration function for semantic analysis.
+    
+    1. Chunks the interview into 30s segments.
+    2. Segments the resume.
+    3. Embeds every chunk and resume section exactly once.
+    4. Compares each interview chunk against ALL resume sections,
+       and calculates Topic Drift and Redundancy (see `score_chunks`).
+    """
+    # 1. Prepare Data
+    chunks = chunk_transcript(transcript_data.get("segments", []), chunk_duration=30)
+    resume_sections = segment_resume(resume_text)
+    
+    if not chunks or not resume_sections:
+        return {"error": "Insufficient data for analysis"}
+
+    # 2. One encode for all texts (chunks first, then resume sections)
+    chunk_texts = [c["text"] for c in chunks]
+    embeddings = l2_normalize(encode_texts(chunk_texts + resume_sections))
+
+    return score_chunks(chunks, embeddings[:len(chunks)], resume_sections, embeddings[len(chunks):])
+
+def analyze_batch(transcripts: Dict[str, Dict], resumes: Dict[str, str],
+                  pairs: Optional[List[Tuple[str, str]]] = None,
+                  batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Semantic analysis for many transcripts against many resumes.
+
+    Instead of one encode per (transcript, resume) request, all chunk and resume
+    texts are collected, de-duplicated and embedded in large batched calls.
+    Each pair is then only a few matrix products on the shared embeddings.
+
+    Args:
+        transcripts (dict): transcript_id -> transcription JSON (with "segments").
+        resumes (dict): resume_id -> plain text resume.
+        pairs (list): (transcript_id, resume_id) pairs to score. Defaults to every combination.
+        batch_size (int): `model.encode` batch size.
+
+    Yields:
+        dict: One result per pair, `{"transcript_id", "resume_id", "result"}` on success
+        or `{"transcript_id", "resume_id", "error"}`.
+    """
+    if pairs is None:
+        pairs = [(t, r) for t in transcripts for r in resumes]
+
+    # 1. Prepare Data (once per transcript / resume, not once per pair)
+    chunks_by_id = {t: chunk_transcript(transcripts[t].get("segments", []), chunk_duration=30) for t in transcripts}
+    sections_by_id = {r: segment_resume(resumes[r]) for r in resumes}
+
+    # 2. Embed every distinct text exactly once
+    row_of = {}
+    for text_list in [[c["text"] for c in chunks] for chunks in chunks_by_id.values()] + list(sections_by_id.values()):
+        for text in text_list:
+            row_of.setdefault(text, len(row_of))
+    embeddings = l2_normalize(encode_texts(list(row_of), batch_size=batch_size)) if row_of else None
+
+    # 3. Score each pair from the shared embedding matrix
+    for transcript_id, resume_id in pairs:
+        if transcript_id not in chunks_by_id or resume_id not in sections_by_id:
+            yield {"transcript_id": transcript_id, "resume_id": resume_id, "error": "Unknown transcript or resume id"}
+            continue
+
+        chunks = chunks_by_id[transcript_id]
+        sections = sections_by_id[resume_id]
+        if not chunks or not sections:
+            yield {"transcript_id": transcript_id, "resume_id": resume_id, "error": "Insufficient data for analysis"}
+            continue
+
+        chunk_rows = [row_of[c["text"]] for c in chunks]
+        section_rows = [row_of[s] for s in sections]
+        # score_chunks writes into the chunk dicts, so each pair gets its own copies
+        result = score_chunks([dict(c) for c in chunks], embeddings[chunk_rows], sections, embeddings[section_rows])
+        yield {"transcript_id": transcript_id, "resume_id": resume_id, "result": result}
@@ -1,5 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Union
 import math
+import numpy as np
 
 # --- SCORING WEIGHTS ---
 # We define these constants to make the scoring logic transparent and easy to tune.
@@ -92,6 +93,21 @@ def calculate_session_score(metrics: Dict[str, Any]) -> Dict[str, Any]:
         }
     }
 
+def classify_delta(delta: float) -> Tuple[str, str]:
+    """
+    Labels the score change between two sessions.
+
+    Returns:
+        Tuple[str, str]: The trend ("improving", "declining" or "stagnant") and a message.
+    """
+    # Define thresholds for meaningful change
+    if delta > 5.0:
+        return "improving", "Great job! You represent a significant improvement."
+    elif delta < -5.0:
+        return "declining", "Performance dropped compared to last time. Check your stability."
+    else:
+        return "stagnant", "Consistent performance. Try to focus on clarity to break through."
+
 def compare_sessions(current_session: Dict, previous_session: Optional[Dict]) -> Dict[str, Any]:
     """
     Compares the current session against a previous one to identify trends.
@@ -109,17 +125,7 @@ def compare_sessions(current_session: Dict, previous_session: Optional[Dict]) ->
     previous_results = calculate_session_score(previous_session)
     
     delta = current_results["final_score"] - previous_results["final_score"]
-    
-    # Define thresholds for meaningful change
-    if delta > 5.0:
-        trend = "improving"
-        msg = "Great job! You represent a significant improvement."
-    elif delta < -5.0:
-        trend = "declining"
-        msg = "Performance dropped compared to last time. Check your stability."
-    else:
-        trend = "stagnant"
-        msg = "Consistent performance. Try to focus on clarity to break through."
+    trend, msg = classify_delta(delta)
         
     return {
         "current_score": current_results["final_score"],
@@ -129,3 +135,122 @@ def compare_sessions(current_session: Dict, previous_session: Optional[Dict]) ->
         "message": msg,
         "component_breakdown": current_results["components"]
     }
+
+
+# --- COHORT SCORING (vectorized) ---
+# Ranking a cohort of thousands of sessions with `calculate_session_score` in a
+# loop spends most of its time in Python branches. `score_sessions` applies the
+# same normalization to whole columns at once with NumPy. Every operation is
+# done in the same order as the scalar version, so the results are identical
+# (not just close); see benchmarks/bench_scoring.py.
+
+# Input columns and their defaults (the same keys and defaults as calculate_session_score)
+SCORE_INPUTS = {
+    "overall_relevance": 0.0,
+    "overall_emotional_stability_score": 0.0,
+    "speaking_rate_wpm": 0,
+    "filler_words_count": 0,
+    "duration_seconds": 0,
+}
+
+def metrics_to_columns(metrics_list: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Turns a list of metrics dicts (calculate_session_score input) into float64 columns."""
+    return {
+        key: np.array([m.get(key, default) for m in metrics_list], dtype=np.float64)
+        for key, default in SCORE_INPUTS.items()
+    }
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """
+    Same result as Python's round(x, 1) for every element.
+    np.round(x, 1) rounds x * 10 in binary and differs from round() on values that
+    sit (almost) exactly on a tie; those rare elements are rounded with round().
+    """
+    scaled = values * 10.0
+    rounded = np.rint(scaled) / 10.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+def score_sessions(columns: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized `calculate_session_score` for a whole cohort.
+
+    Args:
+        columns: One array per input (see SCORE_INPUTS; missing columns use the default).
+
+    Returns:
+        Dict of arrays: final_score (0-100) and the component scores relevance, stability,
+        pace and clarity (0-100), all rounded to one decimal like the scalar version.
+    """
+    lengths = {len(np.atleast_1d(v)) for v in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    n = lengths.pop() if lengths else 0
+
+    def column(key):
+        if key not in columns:
+            return np.full(n, SCORE_INPUTS[key], dtype=np.float64)
+        return np.asarray(columns[key], dtype=np.float64).reshape(-1)
+
+    # 1-2. Relevance and stability are already 0-1
+    score_relevance = column("overall_relevance")
+    score_stability = column("overall_emotional_stability_score")
+
+    # 3. Speaking pace: 1.0 inside the ideal range, minus 0.02 per WPM outside it
+    wpm = column("speaking_rate_wpm")
+    distance = np.where(wpm < IDEAL_WPM_MIN, IDEAL_WPM_MIN - wpm, wpm - IDEAL_WPM_MAX)
+    score_pace = np.maximum(0.0, 1.0 - distance * 0.02)
+    score_pace = np.where((wpm >= IDEAL_WPM_MIN) & (wpm <= IDEAL_WPM_MAX), 1.0, score_pace)
+    score_pace = np.where(wpm == 0, 0.0, score_pace)
+
+    # 4. Clarity: fillers per minute, linear between ideal (1.0) and max (0.0)
+    duration_min = column("duration_seconds") / 60.0
+    fillers_per_min = np.zeros(n)
+    np.divide(column("filler_words_count"), duration_min, out=fillers_per_min, where=duration_min > 0)
+    score_clarity = 1.0 - ((fillers_per_min - IDEAL_FILLERS_PER_MIN) / (MAX_FILLERS_PER_MIN - IDEAL_FILLERS_PER_MIN))
+    score_clarity = np.where(fillers_per_min >= MAX_FILLERS_PER_MIN, 0.0, score_clarity)
+    score_clarity = np.where(fillers_per_min <= IDEAL_FILLERS_PER_MIN, 1.0, score_clarity)
+
+    # 5. Weighted score (same operation order as the scalar version)
+    final_score = (
+        (score_relevance * WEIGHT_RELEVANCE) +
+        (score_stability * WEIGHT_STABILITY) +
+        (score_pace * WEIGHT_PACE) +
+        (score_clarity * WEIGHT_CLARITY)
+    ) * 100
+
+    return {
+        "final_score": _round1(final_score),
+        "relevance": _round1(score_relevance * 100),
+        "stability": _round1(score_stability * 100),
+        "pace": _round1(score_pace * 100),
+        "clarity": _round1(score_clarity * 100),
+    }
+
+class PercentileIndex:
+    """
+    Sorted scores of a cohort. Percentile lookups are binary searches (O(log n)).
+
+    The percentile rank of a score is the share of the cohort scoring below it,
+    counting equal scores as half: 100 * (below + 0.5 * equal) / n.
+    """
+    def __init__(self, scores: Sequence[float]):
+        self.sorted_scores = np.sort(np.asarray(scores, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.sorted_scores)
+
+    def percentile(self, score: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """Percentile rank (0-100) of one score or an array of scores."""
+        if not len(self.sorted_scores):
+            raise ValueError("Empty cohort")
+        below = np.searchsorted(self.sorted_scores, score, side="left")
+        at_or_below = np.searchsorted(self.sorted_scores, score, side="right")
+        ranks = 100.0 * (below + 0.5 * (at_or_below - below)) / len(self.sorted_scores)
+        return float(ranks) if np.ndim(ranks) == 0 else ranks
+
+    def quantile(self, q: float) -> float:
+        """Score at quantile q (0-1), e.g. 0.5 for the cohort median."""
+        return float(np.quantile(self.sorted_scores, q))
@@ -0,0 +1,195 @@
+import json
+import uuid
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, joinedload
+
+from ..models.analytics import SessionScore
+from ..models.interview import Interview
+from ..models.session import InterviewSession, TranscriptSegment, TranscriptWord, MetricResult
+from . import trend_service
+from .feedback_service import generate_insights
+
+# Session Storage
+# ---------------
+# Pipeline results are written once (`save_session`) into normalized tables
+# (see models/session.py) and served from there afterwards. Reading a stored
+# session never touches Whisper, librosa or the embedding model.
+
+def interview_exists(db: Session, interview_id: int) -> bool:
+    return db.query(Interview.id).filter(Interview.id == interview_id).first() is not None
+
+def save_session(db: Session, result: Dict[str, Any], interview_id: Optional[int] = None,
+                 job_id: Optional[str] = None, filename: Optional[str] = None,
+                 candidate_id: Optional[str] = None) -> InterviewSession:
+    """
+    Stores a pipeline result (see pipeline_service.run_transcription_pipeline).
+
+    Args:
+        db (Session): The database session.
+        result (dict): Transcription, analysis and emotional_stability of one recording.
+        interview_id (int): Interview the recording belongs to (optional).
+        job_id (str): Background job that produced the result (optional).
+        filename (str): Original filename from the client.
+        candidate_id (str): Caller's ID for the person interviewed; updates their trend rollup.
+
+    Returns:
+        InterviewSession: The new session row.
+    """
+    transcription = result.get("transcription") or {}
+    analysis = result.get("analysis") or {}
+    emotional = result.get("emotional_stability") or {}
+    segments = transcription.get("segments", [])
+
+    session = InterviewSession(
+        id=str(uuid.uuid4()),
+        interview_id=interview_id,
+        candidate_id=candidate_id,
+        job_id=job_id,
+        filename=filename,
+        audio_hash=result.get("audio_hash"),
+        full_text=transcription.get("full_text", ""),
+        duration_seconds=segments[-1]["end"] if segments else 0.0,
+        word_count=sum(len(s.get("words", [])) for s in segments),
+        speaking_rate_wpm=analysis.get("speaking_rate_wpm"),
+        filler_count=analysis.get("filler_words", {}).get("total_count"),
+        pause_count=analysis.get("pause_analysis", {}).get("count"),
+        emotional_stability_score=emotional.get("overall_emotional_stability_score"),
+        archive_url=result.get("archive_url"),
+    )
+    db.add(session)
+
+    segment_rows = [
+        TranscriptSegment(session_id=session.id, position=i, start=s["start"], end=s["end"], text=s["text"])
+        for i, s in enumerate(segments)
+    ]
+    db.add_all(segment_rows)
+    db.flush()  # Assigns the segment IDs the words refer to
+
+    # Words are the bulk of the data (~150 per minute): one executemany instead of ORM objects
+    word_rows = []
+    for segment, row in zip(segments, segment_rows):
+        for w in segment.get("words", []):
+            word_rows.append({
+                "session_id": session.id, "segment_id": row.id, "position": len(word_rows),
+                "word": w["word"], "start": w["start"], "end": w["end"],
+            })
+    if word_rows:
+        db.execute(insert(TranscriptWord), word_rows)
+
+    metrics = {"speech": analysis, "emotional_stability": emotional, "timings": result.get("timings")}
+    for kind, payload in metrics.items():
+        if payload:
+            db.add(MetricResult(session_id=session.id, kind=kind, payload=json.dumps(payload)))
+
+    db.flush()
+    trend_service.record_session(db, session)  # Stores the score, updates the rollup and commits
+    db.refresh(session)
+    return session
+
+def save_metric(db: Session, session: InterviewSession, kind: str, payload: Dict[str, Any]):
+    """Stores (or replaces) one analysis result of a session, e.g. a later semantic analysis."""
+    metric = db.query(MetricResult).filter(MetricResult.session_id == session.id, MetricResult.kind == kind).first()
+    if metric is None:
+        db.add(MetricResult(session_id=session.id, kind=kind, payload=json.dumps(payload)))
+    else:
+        metric.payload = json.dumps(payload)
+    if kind == "semantic":
+        # Relevance is part of the score: rescore the session (and its candidate's trend)
+        session.semantic_relevance = payload.get("overall_relevance")
+        trend_service.record_session(db, session)
+    else:
+        db.commit()
+
+def get_session(db: Session, session_id: str, with_metrics: bool = False) -> Optional[InterviewSession]:
+    query = db.query(InterviewSession)
+    if with_metrics:
+        # One query: the session row joined with its metric rows
+        query = query.options(joinedload(InterviewSession.metrics))
+    return query.filter(InterviewSession.id == session_id).first()
+
+def list_sessions(db: Session, interview_id: Optional[int] = None, candidate_id: Optional[str] = None,
+                  skip: int = 0, limit: int = 100) -> List[InterviewSession]:
+    """Stored sessions, newest first (optionally of one interview / candidate)."""
+    query = db.query(InterviewSession)
+    if interview_id is not None:
+        query = query.filter(InterviewSession.interview_id == interview_id)
+    if candidate_id is not None:
+        query = query.filter(InterviewSession.candidate_id == candidate_id)
+    return query.order_by(InterviewSession.created_at.desc()).offset(skip).limit(limit).all()
+
+def load_transcript(db: Session, session: InterviewSession) -> Dict[str, Any]:
+    """
+    Rebuilds the transcription in the pipeline's shape ({"full_text", "segments": [... "words"]})
+    with two indexed queries (segments, then words), however long the session is.
+    """
+    segments = (
+        db.query(TranscriptSegment)
+        .filter(TranscriptSegment.session_id == session.id)
+        .order_by(TranscriptSegment.position)
+        .all()
+    )
+    words = (
+        db.query(TranscriptWord.segment_id, TranscriptWord.word, TranscriptWord.start, TranscriptWord.end)
+        .filter(TranscriptWord.session_id == session.id)
+        .order_by(TranscriptWord.position)
+        .all()
+    )
+    by_id = {}
+    output = []
+    for segment in segments:
+        segment_data = {"start": segment.start, "end": segment.end, "text": segment.text, "words": []}
+        by_id[segment.id] = segment_data["words"]
+        output.append(segment_data)
+    for segment_id, word, start, end in words:
+        by_id[segment_id].append({"word": word, "start": start, "end": end})
+    return {"full_text": session.full_text, "segments": output}
+
+def session_metrics(session: InterviewSession) -> Dict[str, Any]:
+    return {metric.kind: json.loads(metric.payload) for metric in session.metrics}
+
+def session_feedback(db: Session, session: InterviewSession) -> Dict[str, Any]:
+    """Stored score and written feedback for a session (plain arithmetic, no models)."""
+    stored = db.query(SessionScore).filter(SessionScore.session_id == session.id).first()
+    if stored is None:
+        # Sessions saved before scores were stored
+        stored = trend_service.record_session(db, session)
+    speech = session_metrics(session).get("speech", {})
+    return {
+        "session_id": session.id,
+        "score": {
+            "final_score": stored.final_score,
+            "components": {
+                "relevance": stored.relevance, "stability": stored.stability,
+                "pace": stored.pace, "clarity": stored.clarity,
+            },
+        },
+        "feedback": generate_insights(
+            speech, session.semantic_relevance or 0.0, session.emotional_stability_score or 0.0
+        ),
+    }
+
+def session_to_response(session: InterviewSession, include_metrics: bool = False) -> dict:
+    """Converts an InterviewSession row into the SessionSummary / SessionDetail shape."""
+    response = {
+        "session_id": session.id,
+        "interview_id": session.interview_id,
+        "candidate_id": session.candidate_id,
+        "job_id": session.job_id,
+        "filename": session.filename,
+        "audio_hash": session.audio_hash,
+        "duration_seconds": session.duration_seconds,
+        "word_count": session.word_count,
+        "speaking_rate_wpm": session.speaking_rate_wpm,
+        "filler_count": session.filler_count,
+        "pause_count": session.pause_count,
+        "emotional_stability_score": session.emotional_stability_score,
+        "semantic_relevance": session.semantic_relevance,
+        "archive_url": session.archive_url,
+        "created_at": session.created_at,
+    }
+    if include_metrics:
+        response["full_text"] = session.full_text
+        response["metrics"] = session_metrics(session)
+    return response
@@ -1,10 +1,18 @@
-from typing import List, Dict
+from collections import Counter
+from itertools import chain
+from typing import List, Dict, Any, Optional
+from .filler_matcher import get_matcher, normalize_token
 
 # Speech Analysis Metrics
 # -----------------------
 # This service file contains functions to analyze speech patterns
 # based on word-level timestamps provided by the transcription service.
 
+# Part of the result cache key: bump whenever the output of `analyze_speech`
+# changes, so analyses cached by an older version are not served again.
+# 2: multi-word fillers with timestamped occurrences (filler_matcher.py)
+ANALYSIS_VERSION = 2
+
 def calculate_speaking_rate(transcript_segments: List[Dict]) -> float:
     """
     Computes the speaking rate in Words Per Minute (WPM).
@@ -69,37 +77,193 @@ def detect_pauses(transcript_segments: List[Dict], min_pause_duration: float = 0
         "details": pauses
     }
 
-def count_filler_words(transcript_segments: List[Dict]) -> Dict:
+def count_filler_words(transcript_segments: List[Dict], lexicon: Optional[str] = None) -> Dict:
     """
-    Counts occurrences of common filler words.
+    Counts occurrences of common filler words and phrases ("um", "you know", ...).
     
     Why it matters: Frequent use of 'um', 'uh', 'like' reduces credibility and clarity.
+    
+    `lexicon` selects the filler list (see filler_matcher.py); each hit comes with
+    its timestamps so the UI can highlight it.
     """
-    filler_words_list = {"um", "uh", "er", "ah", "like", "you know", "i mean", "sort of"}
-    detected_fillers = {}
-    total_count = 0
+    words = list(chain.from_iterable(segment.get("words", []) for segment in transcript_segments))
+    hits = get_matcher(lexicon).find(words)
     
-    for segment in transcript_segments:
-        for word_data in segment.get("words", []):
-            word = word_data["word"].lower().strip(".,?!")
-            
-            if word in filler_words_list:
-                detected_fillers[word] = detected_fillers.get(word, 0) + 1
-                total_count += 1
-                
     return {
-        "total_count": total_count,
-        "breakdown": detected_fillers
+        "total_count": len(hits),
+        "breakdown": dict(Counter(hit["phrase"] for hit in hits)),
+        "occurrences": hits
     }
 
-def analyze_speech(transcription_result: Dict) -> Dict:
+class SpeechMetricsAccumulator:
     """
-    Main function to run all analysis metrics on the transcription result.
+    Computes the same metrics as the functions above, but incrementally.
+    
+    Segments are added as they arrive (live transcription, chunked jobs) and each
+    update only looks at the new words: O(new words) instead of re-reading the
+    whole transcript. `result()` returns exactly what `analyze_speech` would return
+    for all segments added so far, at any moment.
+    
+    The state is plain JSON (`get_state` / `from_state`), so a job can checkpoint it.
     """
-    segments = transcription_result.get("segments", [])
+    def __init__(self, min_pause_duration: float = 0.5, lexicon: Optional[str] = None):
+        self.min_pause_duration = min_pause_duration
+        self.lexicon = lexicon
+        self._matcher = get_matcher(lexicon)
+        # Speaking rate
+        self.first_start: Optional[float] = None  # Start of the first segment
+        self.last_end: Optional[float] = None  # End of the latest segment
+        self.word_count = 0
+        # Pauses
+        self.last_word_end: Optional[float] = None  # The next word's gap is measured from here
+        self.pauses: List[Dict] = []
+        self.total_pause_duration = 0.0
+        # Fillers
+        self.filler_hits: List[Dict] = []
+        self.filler_breakdown: Dict[str, int] = {}
+        self.pending_words: List[Dict] = []  # Words that may still become part of a multi-word filler
     
-    return {
-        "speaking_rate_wpm": calculate_speaking_rate(segments),
-        "pause_analysis": detect_pauses(segments),
-        "filler_words": count_filler_words(segments)
-    }
+    def add_segment(self, segment: Dict):
+        if self.first_start is None:
+            self.first_start = segment["start"]
+        self.last_end = segment["end"]
+        
+        for word_data in segment.get("words", []):
+            self.word_count += 1
+            
+            # Gap between the previous word (possibly in an earlier segment) and this one
+            if self.last_word_end is not None:
+                gap = word_data["start"] - self.last_word_end
+                if gap > self.min_pause_duration:
+                    self.pauses.append({
+                        "start": self.last_word_end,
+                        "end": word_data["start"],
+                        "duration": round(gap, 2)
+                    })
+                    self.total_pause_duration += gap
+            self.last_word_end = word_data["end"]
+            
+            # Most words start no filler phrase: one dict lookup and done
+            token = normalize_token(word_data["word"])
+            if self.pending_words or self._matcher.starts_phrase(token):
+                self.pending_words.append({"token": token, "start": word_data["start"], "end": word_data["end"]})
+                hits, consumed = self._matcher.resolve(self.pending_words, final=False)
+                self._add_fillers(hits)
+                del self.pending_words[:consumed]
+    
+    def _add_fillers(self, hits: List[Dict]):
+        for hit in hits:
+            self.filler_hits.append(hit)
+            self.filler_breakdown[hit["phrase"]] = self.filler_breakdown.get(hit["phrase"], 0) + 1
+    
+    def add_segments(self, segments: List[Dict]):
+        for segment in segments:
+            self.add_segment(segment)
+    
+    def result(self, details: bool = True) -> Dict:
+        """
+        The metrics for everything added so far (same dict as `analyze_speech`).
+        With details=False, the pause list and filler occurrences are left out: the
+        counts, totals and breakdown are built without copying the session's history.
+        """
+        return self._result(None, details)
+    
+    def _result(self, earlier: Optional["SpeechMetricsAccumulator"], details: bool) -> Dict:
+        # `earlier` holds the pauses / fillers found before this accumulator's (see `preview`)
+        wpm = 0.0
+        if self.first_start is not None:
+            total_duration = self.last_end - self.first_start
+            if total_duration > 0:
+                wpm = round((self.word_count / total_duration) * 60, 2)
+        
+        earlier_pauses = earlier.pauses if earlier else []
+        if self.word_count:
+            pause_analysis = {
+                "count": len(earlier_pauses) + len(self.pauses),
+                "total_duration": round(self.total_pause_duration, 2),
+            }
+            if details:
+                pause_analysis["details"] = earlier_pauses + self.pauses
+        else:
+            pause_analysis = {"count": 0, "total_duration": 0.0}
+            if details:
+                pause_analysis["details"] = []
+        
+        # A phrase still waiting for its next word is resolved as if the transcript ended here
+        pending_hits, _ = self._matcher.resolve(self.pending_words, final=True)
+        breakdown = dict(earlier.filler_breakdown) if earlier else {}
+        for phrase, count in self.filler_breakdown.items():
+            breakdown[phrase] = breakdown.get(phrase, 0) + count
+        for hit in pending_hits:
+            breakdown[hit["phrase"]] = breakdown.get(hit["phrase"], 0) + 1
+        
+        earlier_hits = earlier.filler_hits if earlier else []
+        filler_words = {
+            "total_count": len(earlier_hits) + len(self.filler_hits) + len(pending_hits),
+            "breakdown": breakdown,
+        }
+        if details:
+            filler_words["occurrences"] = earlier_hits + self.filler_hits + pending_hits
+        
+        return {
+            "speaking_rate_wpm": wpm,
+            "pause_analysis": pause_analysis,
+            "filler_words": filler_words
+        }
+    
+    def preview(self, segments: List[Dict], details: bool = True) -> Dict:
+        """
+        The metrics as if `segments` were added, without adding them (e.g. tentative live segments).
+        Only the new words are processed: the draft starts from this accumulator's running
+        totals with empty pause / filler lists, so the history is not copied (it is only
+        concatenated into the result when `details` is requested).
+        """
+        if not segments:
+            return self.result(details)
+        draft = SpeechMetricsAccumulator(min_pause_duration=self.min_pause_duration, lexicon=self.lexicon)
+        draft.first_start = self.first_start
+        draft.last_end = self.last_end
+        draft.word_count = self.word_count
+        draft.last_word_end = self.last_word_end
+        draft.total_pause_duration = self.total_pause_duration
+        draft.pending_words = list(self.pending_words)  # At most one phrase long
+        draft.add_segments(segments)
+        return draft._result(self, details)
+    
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "min_pause_duration": self.min_pause_duration,
+            "lexicon": self.lexicon,
+            "first_start": self.first_start,
+            "last_end": self.last_end,
+            "word_count": self.word_count,
+            "last_word_end": self.last_word_end,
+            "pauses": list(self.pauses),
+            "total_pause_duration": self.total_pause_duration,
+            "filler_hits": list(self.filler_hits),
+            "filler_breakdown": dict(self.filler_breakdown),
+            "pending_words": list(self.pending_words),
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SpeechMetricsAccumulator":
+        accumulator = cls(min_pause_duration=state["min_pause_duration"], lexicon=state["lexicon"])
+        accumulator.first_start = state["first_start"]
+        accumulator.last_end = state["last_end"]
+        accumulator.word_count = state["word_count"]
+        accumulator.last_word_end = state["last_word_end"]
+        accumulator.pauses = list(state["pauses"])
+        accumulator.total_pause_duration = state["total_pause_duration"]
+        accumulator.filler_hits = list(state["filler_hits"])
+        accumulator.filler_breakdown = dict(state["filler_breakdown"])
+        accumulator.pending_words = list(state["pending_words"])
+        return accumulator
+
+def analyze_speech(transcription_result: Dict, lexicon: Optional[str] = None) -> Dict:
+    """
+    Main function to run all analysis metrics on the transcription result.
+    All three metrics are computed in a single pass over the words.
+    """
+    accumulator = SpeechMetricsAccumulator(lexicon=lexicon)
+    accumulator.add_segments(transcription_result.get("segments", []))
+    return accumulator.result()
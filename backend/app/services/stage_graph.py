@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Stage Graph
+# -----------
+# A tiny dependency-graph runner for the transcription pipeline.
+#
+# Each stage is a function that receives the results of the stages it depends on
+# (as a dict keyed by stage name). A stage is submitted to the executor as soon as
+# all of its dependencies have finished, so stages that do not depend on each other
+# (Whisper and the pitch tracker, archiving and everything else) run at the same time.
+# Wall-clock time is then the longest chain of dependencies instead of the sum.
+#
+# The runner itself only waits on futures: all callbacks (`on_change`) run in the
+# calling thread, so they may safely use that thread's database session.
+
+StageFn = Callable[[Dict[str, Any]], Any]
+
+class StageGraph:
+    """
+    A set of named stages and their dependencies.
+    """
+    def __init__(self):
+        self._stages: Dict[str, Tuple[StageFn, Tuple[str, ...], bool]] = {}
+
+    def add(self, name: str, fn: StageFn, deps: Iterable[str] = (), keep: bool = True):
+        """
+        Adds a stage.
+
+        Args:
+            name (str): Unique stage name (reported as progress and in the timings).
+            fn (callable): Called with {dependency name: result}; returns the stage result.
+            deps (iterable): Stages that must finish first.
+            keep (bool): Return the result from `run`. If False the result is released as
+                soon as every dependent stage has finished (e.g. a large audio buffer).
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self._stages[name] = (fn, tuple(deps), keep)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._stages)
+
+    def run(self, executor: Executor, done: Optional[Dict[str, Any]] = None,
+            on_change: Optional[Callable[[List[str], int], None]] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """
+        Runs every stage not already in `done`, each as early as its dependencies allow.
+
+        Args:
+            executor (Executor): Pool the stages run on.
+            done (dict): Results known up front (e.g. from the cache); these stages are skipped.
+            on_change (callable): Called with (running stage names, number of finished stages)
+                whenever a stage starts or finishes.
+
+        Returns:
+            Tuple[dict, dict]: Results by stage name, and {stage: {"start", "seconds"}} for the
+            stages that ran ("start" is the offset from the beginning of the run).
+
+        If a stage raises, the stages already running are allowed to finish (so nothing is
+        still using the input files when the caller cleans up), then the error is re-raised.
+        """
+        results: Dict[str, Any] = dict(done or {})
+        for name, (_, deps, _) in self._stages.items():
+            unknown = [d for d in deps if d not in self._stages and d not in results]
+            if unknown:
+                raise ValueError(f"Stage {name} depends on unknown stages: {unknown}")
+
+        pending = {name: stage for name, stage in self._stages.items() if name not in results}
+        running: Dict[Future, str] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        finished = set(results)
+        error: Optional[BaseException] = None
+        t0 = time.perf_counter()
+
+        def timed(fn: StageFn, inputs: Dict[str, Any]):
+            start = time.perf_counter()
+            value = fn(inputs)
+            return value, start, time.perf_counter()
+
+        def notify():
+            if on_change:
+                on_change(sorted(running.values(), key=self.names.index), len(finished))
+
+        def submit_ready() -> bool:
+            submitted = False
+            for name, (fn, deps, _) in list(pending.items()):
+                if all(d in finished for d in deps):
+                    del pending[name]
+                    running[executor.submit(timed, fn, {d: results.get(d) for d in deps})] = name
+                    submitted = True
+            return submitted
+
+        def release_inputs():
+            # Drop results nobody needs any more (keep=False stages whose dependents all finished)
+            for name, (_, _, keep) in self._stages.items():
+                if keep or name not in results:
+                    continue
+                dependents = [n for n, (_, deps, _) in self._stages.items() if name in deps]
+                if all(d in finished for d in dependents):
+                    del results[name]
+
+        if submit_ready():
+            notify()
+        while running:
+            completed, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in completed:
+                name = running.pop(future)
+                try:
+                    value, start, end = future.result()
+                except BaseException as e:
+                    error = error or e
+                    continue
+                results[name] = value
+                finished.add(name)
+                timings[name] = {"start": round(start - t0, 3), "seconds": round(end - start, 3)}
+            if error is None:
+                release_inputs()
+                submit_ready()
+            notify()
+
+        if error is not None:
+            raise error
+        if pending:
+            raise ValueError(f"Stages never became ready (dependency cycle?): {list(pending)}")
+        return results, timings
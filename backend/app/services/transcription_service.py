@@ -1,12 +1,16 @@
 import whisper
+import numpy as np
 import os
-import shutil
-from fastapi import UploadFile, HTTPException
-from ..utils.helpers import log_debug_message
+from typing import Optional
+from fastapi import HTTPException
+from ..config import settings
+from ..utils.helpers import log_debug_message, log_warning, log_error
+from .model_registry import model_registry
+from .whisper_pool import whisper_pool, WhisperPoolBusy
 
 # Configuration:
-# We are using the "base" model as requested.
-MODEL_NAME = "base"
+# We are using the "base" model as requested (see whisper_model_name in config).
+MODEL_NAME = settings.whisper_model_name
 
 # FORCE FFMPEG PATH (Robust Fix for Windows)
 # We search for the ffmpeg binary and add it to PATH programmatically
@@ -20,94 +24,100 @@ if found_ffmpeg_dirs:
     os.environ["PATH"] += os.pathsep + found_ffmpeg_dirs[0]
     log_debug_message(f"Added FFmpeg to PATH: {found_ffmpeg_dirs[0]}")
 else:
-    log_debug_message("WARNING: Could not auto-locate FFmpeg. Relying on system PATH.")
+    log_warning("Could not auto-locate FFmpeg. Relying on system PATH.")
 
-# Load the Whisper model into memory when this service is imported.
-try:
-    log_debug_message(f"Loading Whisper model: {MODEL_NAME}...")
-    model = whisper.load_model(MODEL_NAME)
-    log_debug_message("Whisper model loaded successfully.")
-except Exception as e:
-    log_debug_message(f"Error loading Whisper model: {e}")
-    # We don't crash here, but transcription will fail if model isn't loaded.
-    model = None
+def _load_whisper():
+    return whisper.load_model(MODEL_NAME)
 
-# Directory to save uploaded files temporarily
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+def _warmup_whisper(whisper_model):
+    # One second of silence exercises the encoder/decoder once so the first
+    # real request does not pay for lazy allocations.
+    whisper_model.transcribe(np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32))
 
-def save_upload_file(upload_file: UploadFile) -> str:
+# The Whisper model is owned by the model registry (loaded + warmed up at startup).
+# When the worker pool is enabled, the model lives in the worker processes instead,
+# so the API process does not preload it.
+model_registry.register("whisper", _load_whisper, warmup=_warmup_whisper, preload=not whisper_pool.enabled)
+
+def get_model():
+    """Returns the in-process Whisper model, loading it on first use if needed."""
+    try:
+        return model_registry.get("whisper")
+    except Exception as e:
+        log_error(f"Error loading Whisper model: {e}")
+        raise HTTPException(status_code=500, detail="Whisper model not loaded.")
+
+def format_whisper_result(result: dict) -> dict:
     """
-    Saves an uploaded file to the local disk.
+    Converts raw Whisper output into the structure we return to the frontend.
+    We perform some cleanup to make the JSON cleaner.
+    """
+    structured_output = {
+        "full_text": result["text"].strip(),
+        "segments": []
+    }
     
-    Args:
-        upload_file (UploadFile): The file uploaded by the user.
+    for segment in result["segments"]:
+        segment_data = {
+            "start": segment["start"],
+            "end": segment["end"],
+            "text": segment["text"].strip(),
+            "words": []
+        }
         
-    Returns:
-        str: The absolute path to the saved file.
-    """
-    try:
-        # Create a safe file path
-        file_path = os.path.join(UPLOAD_DIR, upload_file.filename)
+        # Extract word-level details if available
+        if "words" in segment:
+            for word in segment["words"]:
+                segment_data["words"].append({
+                    "word": word["word"].strip(),
+                    "start": word["start"],
+                    "end": word["end"]
+                })
         
-        # Write the file to disk chunk by chunk to handle large files efficiently
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-            
-        return file_path
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Could not save file: {e}")
+        structured_output["segments"].append(segment_data)
+        
+    return structured_output
 
-def transcribe(file_path: str, cleanup: bool = True):
+def transcribe(file_path: Optional[str], cleanup: bool = True, block: bool = False, audio: Optional[np.ndarray] = None):
     """
     Transcribes an audio file and extracts word-level timestamps.
     
     Args:
-        file_path (str): Path to the audio file.
+        file_path (str): Path to the audio file (None when `audio` is given and there is no file).
+        block (bool): Only used with the worker pool. If False and the pool queue is full,
+            a 503 with a Retry-After header is raised instead of waiting.
+        audio (np.ndarray): The recording already decoded to float32 mono at 16 kHz
+            (see audio_decode.py). When given, Whisper uses it instead of decoding the file.
         
     Returns:
         dict: Structured transcription data.
     """
-    if not model:
-        raise HTTPException(status_code=500, detail="Whisper model not loaded.")
-        
     try:
+        if whisper_pool.enabled:
+            if audio is not None:
+                return whisper_pool.transcribe_audio(audio, block=block)
+            return whisper_pool.transcribe(file_path, block=block)
+
+        model = get_model()
+
         # The core Whisper transcription call
         # word_timestamps=True tells Whisper to extract timing for each word
-        result = model.transcribe(file_path, word_timestamps=True)
-        
-        # Structure the output for the frontend
-        # We perform some cleanup to make the JSON cleaner
-        structured_output = {
-            "full_text": result["text"].strip(),
-            "segments": []
-        }
-        
-        for segment in result["segments"]:
-            segment_data = {
-                "start": segment["start"],
-                "end": segment["end"],
-                "text": segment["text"].strip(),
-                "words": []
-            }
-            
-            # Extract word-level details if available
-            if "words" in segment:
-                for word in segment["words"]:
-                    segment_data["words"].append({
-                        "word": word["word"].strip(),
-                        "start": word["start"],
-                        "end": word["end"]
-                    })
-            
-            structured_output["segments"].append(segment_data)
-            
-        return structured_output
+        # Whisper accepts a path (decoded with ffmpeg) or a 16 kHz float32 array
+        result = model.transcribe(file_path if audio is None else audio, word_timestamps=True)
+        return format_whisper_result(result)
         
+    except HTTPException:
+        raise
+    except WhisperPoolBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="All transcription workers are busy. Please retry later.",
+            headers={"Retry-After": str(settings.whisper_retry_after_seconds)}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transcription failed: {e}")
     finally:
         # Cleanup: Remove the file after processing to save space
         # In a real app, you might want to keep it in S3 or similar.
-        if cleanup and os.path.exists(file_path):
+        if cleanup and file_path and os.path.exists(file_path):
             os.remove(file_path)
@@ -0,0 +1,212 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.analytics import SessionScore, CandidateRollup
+from ..models.session import InterviewSession
+from ..utils.helpers import log_warning
+from .session_comparison_service import calculate_session_score, classify_delta
+
+# Candidate Trends
+# ----------------
+# A dashboard showing a candidate's progress over many sessions must not
+# rescore every session on every page load. Instead:
+#
+# - Each session's score is computed once when it is saved (SessionScore). The
+#   row also keeps the session's trend point (delta, moving averages).
+# - A CandidateRollup row per candidate holds the aggregates plus the last
+#   `trend_window` scores, and is advanced by one step per new session: O(1)
+#   work, whatever the number of sessions.
+# - Reading the trend is the rollup row plus one indexed range scan of the
+#   candidate's scores.
+#
+# If an older session's score changes later (e.g. a semantic analysis is added),
+# the rollup is replayed from the stored scores; still no session is rescored.
+#
+# Saves for the same candidate may run in different worker processes: the
+# rollup row is created with an upsert and locked (SELECT ... FOR UPDATE; on
+# SQLite the upsert takes the database write lock) until the update commits.
+
+def score_inputs(session: InterviewSession) -> Dict[str, Any]:
+    """The metrics dict expected by calculate_session_score, from the stored session columns."""
+    return {
+        "overall_relevance": session.semantic_relevance or 0.0,
+        "overall_emotional_stability_score": session.emotional_stability_score or 0.0,
+        "speaking_rate_wpm": session.speaking_rate_wpm or 0,
+        "filler_words_count": session.filler_count or 0,
+        "duration_seconds": session.duration_seconds or 0,
+    }
+
+def _reset(rollup: CandidateRollup):
+    rollup.session_count = 0
+    rollup.average_score = None
+    rollup.moving_average = None
+    rollup.ema_score = None
+    rollup.best_score = None
+    rollup.best_session_id = None
+    rollup.latest_score = None
+    rollup.latest_created_at = None
+    rollup.current_streak = 0
+    rollup.longest_streak = 0
+    rollup.recent_scores = "[]"
+
+def _advance(rollup: CandidateRollup, recent: List[float], score: SessionScore):
+    """
+    Adds one session (the newest) to the rollup and stores its trend point on `score`.
+    `recent` holds the last scores (oldest first), so every aggregate is updated in O(1).
+    """
+    value = score.final_score
+    previous = rollup.latest_score if rollup.session_count else None
+
+    rollup.session_count = (rollup.session_count or 0) + 1
+    mean = rollup.average_score or 0.0
+    rollup.average_score = mean + (value - mean) / rollup.session_count
+    window = recent[-(settings.trend_window - 1):] if settings.trend_window > 1 else []
+    rollup.moving_average = (sum(window) + value) / (len(window) + 1)
+    alpha = settings.trend_ema_alpha
+    rollup.ema_score = value if previous is None else alpha * value + (1 - alpha) * rollup.ema_score
+    if rollup.best_score is None or value > rollup.best_score:
+        rollup.best_score = value
+        rollup.best_session_id = score.session_id
+    rollup.latest_score = value
+    rollup.latest_created_at = score.created_at
+
+    delta = value - previous if previous is not None else 0.0
+    rollup.current_streak = (rollup.current_streak or 0) + 1 if previous is not None and delta > 0 else 0
+    rollup.longest_streak = max(rollup.longest_streak or 0, rollup.current_streak)
+
+    recent.append(value)
+    del recent[:-max(settings.trend_window, 1)]
+    rollup.recent_scores = json.dumps(recent)
+
+    score.delta = round(delta, 1)
+    score.trend = classify_delta(delta)[0] if previous is not None else "baseline"
+    score.moving_average = round(rollup.moving_average, 1)
+    score.ema = round(rollup.ema_score, 1)
+
+def _point(score: SessionScore) -> Dict[str, Any]:
+    return {
+        "session_id": score.session_id,
+        "created_at": score.created_at,
+        "score": score.final_score,
+        "components": {
+            "relevance": score.relevance, "stability": score.stability,
+            "pace": score.pace, "clarity": score.clarity,
+        },
+        "delta": score.delta,
+        "trend": score.trend,
+        "moving_average": score.moving_average,
+        "ema": score.ema,
+    }
+
+def record_session(db: Session, session: InterviewSession) -> SessionScore:
+    """
+    Scores a session and commits it (together with anything else pending in `db`), then
+    folds it into its candidate's rollup. Called when a session is saved and when its
+    inputs change. A failed rollup update is logged; the session and its score stay stored.
+    """
+    result = calculate_session_score(score_inputs(session))
+    components = result["components"]
+    score = db.query(SessionScore).filter(SessionScore.session_id == session.id).first()
+    if score is None:
+        score = SessionScore(session_id=session.id, candidate_id=session.candidate_id, created_at=session.created_at)
+        db.add(score)
+    score.final_score = result["final_score"]
+    score.relevance = components["relevance"]
+    score.stability = components["stability"]
+    score.pace = components["pace"]
+    score.clarity = components["clarity"]
+    db.commit()
+
+    if session.candidate_id:
+        try:
+            _update_rollup(db, score)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            log_warning(f"Could not update the trend of candidate {session.candidate_id}: {e}",
+                        candidate_id=session.candidate_id, session_id=session.id)
+    return score
+
+def _lock_rollup(db: Session, candidate_id: str) -> CandidateRollup:
+    """Creates the candidate's rollup row if needed and returns it locked until the commit."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        db.execute(
+            insert(CandidateRollup)
+            .values(candidate_id=candidate_id, session_count=0, current_streak=0, longest_streak=0, recent_scores="[]")
+            .on_conflict_do_nothing(index_elements=["candidate_id"])
+        )
+    elif db.get(CandidateRollup, candidate_id) is None:
+        rollup = CandidateRollup(candidate_id=candidate_id)
+        _reset(rollup)
+        db.add(rollup)
+        db.flush()
+    return (
+        db.query(CandidateRollup)
+        .filter(CandidateRollup.candidate_id == candidate_id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+
+def _update_rollup(db: Session, score: SessionScore):
+    rollup = _lock_rollup(db, score.candidate_id)
+    db.refresh(score)  # Read after the lock: another process may have replayed this candidate meanwhile
+
+    newest = rollup.latest_created_at is None or score.created_at >= rollup.latest_created_at
+    if score.moving_average is None and newest:
+        # The usual case: a new session, newer than all others
+        _advance(rollup, json.loads(rollup.recent_scores or "[]"), score)
+    else:
+        # A past session changed (or arrived late): replay the stored scores in time order
+        scores = (
+            db.query(SessionScore)
+            .filter(SessionScore.candidate_id == score.candidate_id)
+            .order_by(SessionScore.created_at, SessionScore.session_id)
+            .all()
+        )
+        _reset(rollup)
+        recent: List[float] = []
+        for stored in scores:
+            _advance(rollup, recent, stored)
+
+def get_rollup(db: Session, candidate_id: str) -> Optional[CandidateRollup]:
+    return db.query(CandidateRollup).filter(CandidateRollup.candidate_id == candidate_id).first()
+
+def get_trend_points(db: Session, candidate_id: str) -> List[Dict[str, Any]]:
+    """The candidate's trend points, oldest first (one range scan of ix_session_scores_candidate_created)."""
+    scores = (
+        db.query(SessionScore)
+        .filter(SessionScore.candidate_id == candidate_id, SessionScore.moving_average.isnot(None))
+        .order_by(SessionScore.created_at, SessionScore.session_id)
+        .all()
+    )
+    return [_point(score) for score in scores]
+
+def rollup_to_response(rollup: CandidateRollup, series: List[Dict[str, Any]]) -> dict:
+    """Converts a CandidateRollup row and its trend points into the CandidateTrendResponse shape."""
+    def rounded(value):
+        return round(value, 1) if value is not None else None
+
+    return {
+        "candidate_id": rollup.candidate_id,
+        "session_count": rollup.session_count,
+        "average_score": rounded(rollup.average_score),
+        "moving_average": rounded(rollup.moving_average),
+        "ema_score": rounded(rollup.ema_score),
+        "best_score": rollup.best_score,
+        "best_session_id": rollup.best_session_id,
+        "latest_score": rollup.latest_score,
+        "current_streak": rollup.current_streak,
+        "longest_streak": rollup.longest_streak,
+        "series": series,
+        "updated_at": rollup.updated_at,
+    }
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import re
+import shutil
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import anyio
+from fastapi import UploadFile, HTTPException
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.upload import UploadSession
+from ..utils.metrics import metrics, record_timing
+
+# Uploads
+# -------
+# Recordings are written to disk with non-blocking file I/O (anyio), in chunks,
+# and hashed (SHA-256) as the bytes arrive, so the event loop never waits on
+# the disk and the file is never read a second time just to hash it.
+#
+# Two ways in:
+# 1. A single multipart request (`save_upload_file`), used by /transcribe and /jobs.
+# 2. A resumable upload for large files on flaky (mobile) connections:
+#    initiate -> PUT parts (any order, re-sendable) -> complete.
+#    Parts are stored as separate files; a client that lost its connection asks
+#    which parts arrived and only sends the rest. `complete` stitches the parts
+#    together and hashes the result in the same pass.
+#
+# Both paths enforce settings.max_upload_bytes (413 Payload Too Large).
+
+# Directory to save uploaded files temporarily
+UPLOAD_DIR = "uploads"
+PARTS_DIR = os.path.join(UPLOAD_DIR, "parts")
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Size of each read/write when streaming an upload to disk (1 MB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Slack for multipart boundaries and headers when checking Content-Length against the limit
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Upper bound on part numbers, so a session cannot create unlimited files
+MAX_PARTS = 10000
+
+UPLOAD_SECONDS = metrics.histogram("upload_seconds", "Time to receive and store an upload (or upload part)")
+UPLOAD_BYTES = metrics.counter("upload_bytes_total", "Bytes of uploads stored")
+
+def payload_too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload exceeds the limit of {limit} bytes.")
+
+async def _remove(path: str):
+    if await anyio.Path(path).exists():
+        await anyio.Path(path).unlink()
+
+async def _write_stream(chunks: AsyncIterator[bytes], file_path: str, limit: int) -> Tuple[int, str]:
+    """
+    Writes chunks to `file_path`, hashing them on the way.
+    Stops with a 413 (and removes the partial file) as soon as `limit` is exceeded.
+
+    Returns:
+        Tuple[int, str]: Bytes written and their hex SHA-256.
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    started = time.perf_counter()
+    try:
+        async with await anyio.open_file(file_path, "wb") as buffer:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > limit:
+                    raise payload_too_large(limit)
+                sha256.update(chunk)
+                await buffer.write(chunk)
+    except BaseException:
+        # Never leave a half-written file behind (also on client disconnects)
+        await _remove(file_path)
+        raise
+    elapsed = time.perf_counter() - started
+    UPLOAD_SECONDS.observe(elapsed)
+    UPLOAD_BYTES.inc(size)
+    record_timing("upload", elapsed)
+    return size, sha256.hexdigest()
+
+async def save_upload_file(upload_file: UploadFile, destination_name: str) -> Tuple[str, str]:
+    """
+    Saves an uploaded file to the local disk and computes its SHA-256 on the way.
+
+    Args:
+        upload_file (UploadFile): The file uploaded by the user.
+        destination_name (str): Name to store the file under (e.g. a job ID),
+            so concurrent uploads with the same filename do not overwrite each other.
+
+    Returns:
+        Tuple[str, str]: The path to the saved file and the hex SHA-256 of its content.
+        The hash identifies the recording for the result cache.
+    """
+    async def chunks():
+        while True:
+            chunk = await upload_file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    file_path = os.path.join(UPLOAD_DIR, destination_name)
+    try:
+        _, audio_hash = await _write_stream(chunks(), file_path, settings.max_upload_bytes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not save file: {e}")
+    return file_path, audio_hash
+
+# --- Resumable uploads ---
+
+def _session_dir(upload_id: str) -> str:
+    return os.path.join(PARTS_DIR, upload_id)
+
+def _part_path(upload_id: str, part_number: int) -> str:
+    return os.path.join(_session_dir(upload_id), f"{part_number:05d}.part")
+
+def create_session(db: Session, filename: str, total_size: Optional[int] = None) -> UploadSession:
+    """Starts a resumable upload. Rejects announced sizes above the limit before any data is sent."""
+    if total_size is not None and total_size > settings.max_upload_bytes:
+        raise payload_too_large(settings.max_upload_bytes)
+
+    session = UploadSession(id=str(uuid.uuid4()), filename=filename, status="open", total_size=total_size)
+    os.makedirs(_session_dir(session.id), exist_ok=True)
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+def get_session(db: Session, upload_id: str) -> Optional[UploadSession]:
+    return db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+
+def list_parts(upload_id: str) -> List[Dict[str, int]]:
+    """Parts stored so far, in order. Only fully written parts are visible (see `write_part`)."""
+    directory = _session_dir(upload_id)
+    if not os.path.isdir(directory):
+        return []
+    parts = []
+    for name in sorted(os.listdir(directory)):
+        match = re.fullmatch(r"(\d+)\.part", name)
+        if match:
+            parts.append({"part_number": int(match.group(1)), "size": os.path.getsize(os.path.join(directory, name))})
+    return parts
+
+async def write_part(session: UploadSession, part_number: int, chunks: AsyncIterator[bytes],
+                     expected_sha256: Optional[str] = None) -> Dict[str, object]:
+    """
+    Stores one part of a resumable upload. Sending the same part again replaces it.
+
+    Args:
+        session (UploadSession): An open upload session.
+        part_number (int): 1-based position of the part in the file.
+        chunks (AsyncIterator[bytes]): The request body.
+        expected_sha256 (str): Optional checksum from the client; a mismatch is rejected
+            so a corrupted part can be re-sent.
+    """
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}.")
+    if not 1 <= part_number <= MAX_PARTS:
+        raise HTTPException(status_code=400, detail=f"Part number must be between 1 and {MAX_PARTS}.")
+
+    # Whatever is already stored (except an older copy of this part) counts toward the total limit
+    stored = sum(p["size"] for p in list_parts(session.id) if p["part_number"] != part_number)
+    limit = min(settings.upload_part_size, settings.max_upload_bytes - stored)
+    if limit <= 0:
+        raise payload_too_large(settings.max_upload_bytes)
+
+    # Write under a temporary name and rename at the end: a dropped connection
+    # never leaves a truncated part that looks complete
+    final_path = _part_path(session.id, part_number)
+    tmp_path = f"{final_path}.{uuid.uuid4().hex}.tmp"
+    await anyio.Path(_session_dir(session.id)).mkdir(parents=True, exist_ok=True)
+    size, sha256 = await _write_stream(chunks, tmp_path, limit)
+
+    if expected_sha256 and expected_sha256.lower() != sha256:
+        await _remove(tmp_path)
+        raise HTTPException(status_code=400, detail="Part checksum mismatch. Please resend this part.")
+    if size == 0:
+        await _remove(tmp_path)
+        raise HTTPException(status_code=400, detail="Empty part.")
+
+    await anyio.Path(tmp_path).rename(final_path)
+    return {"part_number": part_number, "size": size, "sha256": sha256}
+
+async def assemble(session: UploadSession, destination_name: str) -> Tuple[str, str]:
+    """
+    Concatenates the parts (1..N, no gaps) into the final file and hashes it in the same pass.
+    The part files are deleted afterwards.
+
+    Returns:
+        Tuple[str, str]: The path to the assembled file and its hex SHA-256.
+    """
+    parts = list_parts(session.id)
+    numbers = [p["part_number"] for p in parts]
+    if not numbers:
+        raise HTTPException(status_code=400, detail="No parts uploaded.")
+    missing = sorted(set(range(1, numbers[-1] + 1)) - set(numbers))
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing parts: {missing[:20]}")
+
+    total = sum(p["size"] for p in parts)
+    if session.total_size is not None and total != session.total_size:
+        raise HTTPException(
+            status_code=400, detail=f"Received {total} bytes but {session.total_size} were announced."
+        )
+
+    async def chunks():
+        for number in numbers:
+            async with await anyio.open_file(_part_path(session.id, number), "rb") as part:
+                while True:
+                    chunk = await part.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+
+    file_path = os.path.join(UPLOAD_DIR, destination_name)
+    _, audio_hash = await _write_stream(chunks(), file_path, settings.max_upload_bytes)
+    await anyio.to_thread.run_sync(shutil.rmtree, _session_dir(session.id), True)
+    return file_path, audio_hash
+
+def abort_session(db: Session, session: UploadSession):
+    """Discards an upload and its stored parts."""
+    shutil.rmtree(_session_dir(session.id), ignore_errors=True)
+    session.status = "aborted"
+    db.commit()
+
+def session_to_response(session: UploadSession, parts: Optional[List[Dict]] = None) -> dict:
+    """Converts an UploadSession row into the API response shape."""
+    parts = list_parts(session.id) if parts is None else parts
+    return {
+        "upload_id": session.id,
+        "filename": session.filename,
+        "status": session.status,
+        "total_size": session.total_size,
+        "received_bytes": sum(p["size"] for p in parts),
+        "part_size": settings.upload_part_size,
+        "parts": parts,
+        "job_id": session.job_id,
+        "created_at": session.created_at,
+    }
@@ -0,0 +1,181 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Optional, Dict, Any, Callable
+
+import numpy as np
+
+from ..config import settings
+from ..utils.helpers import log_info, log_error
+from ..utils.metrics import metrics
+
+# Whisper Worker Farm
+# -------------------
+# Whisper inference is CPU-bound and holds the GIL for long stretches, so one
+# model inside the API process means one transcription at a time.
+# This module runs N separate worker processes. Each one loads the model once
+# (in its initializer) and then serves transcriptions until shutdown.
+#
+# Backpressure: at most `workers + queue_size` recordings may be in flight.
+# Past that, `submit` raises WhisperPoolBusy so the API can answer 503 with
+# a Retry-After header instead of letting requests pile up in memory.
+#
+# Decoded audio is handed to the workers through shared memory: the API process
+# copies the PCM buffer into a SharedMemory block once, and the worker wraps that
+# block in a numpy array (no pickling of the samples, no second decode).
+
+class WhisperPoolBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+    pass
+
+# --- Worker process side ---
+# These functions only run inside the child processes.
+
+def _init_worker(torch_threads: int):
+    """Runs once in each worker process: pins the thread count and loads + warms up the model."""
+    import torch
+    from .model_registry import model_registry
+    from . import transcription_service  # registers the "whisper" model
+
+    # Without this every worker would start one thread per core and they
+    # would all fight over the same CPUs (oversubscription).
+    torch.set_num_threads(torch_threads)
+    model_registry.preload(["whisper"])
+
+def _worker_transcribe(file_path: str) -> Dict[str, Any]:
+    """Runs inside a worker process. Returns the structured transcript (small to pickle)."""
+    from .transcription_service import get_model, format_whisper_result
+
+    result = get_model().transcribe(file_path, word_timestamps=True)
+    return format_whisper_result(result)
+
+def _worker_transcribe_shared(shm_name: str, num_samples: int) -> Dict[str, Any]:
+    """Runs inside a worker process. Transcribes decoded audio placed in shared memory by the API process."""
+    from .transcription_service import get_model, format_whisper_result
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)
+        result = get_model().transcribe(audio, word_timestamps=True)
+        del audio  # release the view before closing the block
+    finally:
+        shm.close()
+    return format_whisper_result(result)
+
+# --- API process side ---
+
+class WhisperWorkerPool:
+    """
+    A bounded pool of Whisper worker processes.
+    """
+    def __init__(self, workers: int, queue_size: int, torch_threads: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        # 0 means "split the cores evenly between workers"
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // max(workers, 1))
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def start(self):
+        with self._lock:
+            if self._executor is not None or not self.enabled:
+                return
+            log_info(
+                f"Starting {self.workers} Whisper workers ({self.torch_threads} torch threads each)"
+            )
+            # 'spawn' gives each worker a clean interpreter; forking a process that
+            # already runs threads (uvicorn, job workers) is unsafe with torch.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.torch_threads,),
+            )
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def transcribe(self, file_path: str, block: bool = False) -> Dict[str, Any]:
+        """
+        Transcribes a file on one of the workers and waits for the result.
+
+        Args:
+            file_path (str): Path to the audio file (workers read it themselves).
+            block (bool): If True, wait for a free slot instead of raising WhisperPoolBusy.
+                Background jobs block; interactive requests should not.
+        """
+        return self._run(block, lambda executor: executor.submit(_worker_transcribe, file_path).result())
+
+    def transcribe_audio(self, audio: np.ndarray, block: bool = False) -> Dict[str, Any]:
+        """
+        Transcribes an already decoded recording (float32 mono, 16 kHz) on one of the workers.
+        The samples travel through shared memory, which is released once the worker is done.
+        """
+        def submit(executor: ProcessPoolExecutor) -> Dict[str, Any]:
+            samples = np.ascontiguousarray(audio, dtype=np.float32)
+            shm = shared_memory.SharedMemory(create=True, size=max(samples.nbytes, 1))
+            try:
+                np.ndarray(samples.shape, dtype=np.float32, buffer=shm.buf)[:] = samples
+                return executor.submit(_worker_transcribe_shared, shm.name, len(samples)).result()
+            finally:
+                shm.close()
+                shm.unlink()
+
+        return self._run(block, submit)
+
+    def _run(self, block: bool, submit: Callable[[ProcessPoolExecutor], Dict[str, Any]]) -> Dict[str, Any]:
+        """Takes a slot (or raises WhisperPoolBusy), runs `submit` against the executor and releases the slot."""
+        if not self._slots.acquire(blocking=block):
+            WHISPER_REJECTED.inc()
+            raise WhisperPoolBusy()
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            if self._executor is None:
+                self.start()
+            return submit(self._executor)
+        except BrokenProcessPool:
+            # A worker died (usually OOM-killed). Replace the pool so later requests work.
+            log_error("Whisper worker pool broke, restarting it")
+            self.shutdown()
+            self.start()
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "torch_threads_per_worker": self.torch_threads,
+            "in_flight": self._in_flight,
+            "waiting": max(0, self._in_flight - self.workers),
+        }
+
+# Singleton instance
+whisper_pool = WhisperWorkerPool(
+    workers=settings.whisper_workers,
+    queue_size=settings.whisper_queue_size,
+    torch_threads=settings.whisper_torch_threads,
+)
+
+WHISPER_REJECTED = metrics.counter("whisper_pool_rejected_total", "Transcriptions refused with 503 because the pool queue was full")
+metrics.gauge("whisper_pool_in_flight", "Transcriptions running or waiting in the worker pool",
+              callback=lambda: whisper_pool.stats()["in_flight"])
+metrics.gauge("whisper_pool_waiting", "Transcriptions waiting for a free Whisper worker",
+              callback=lambda: whisper_pool.stats()["waiting"])
@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime
 
 # Introduction to Utility Functions:
@@ -8,6 +9,19 @@ def format_date(dt: datetime) -> str:
     """Format a datetime object to a user-friendly string."""
     return dt.strftime('%Y-%m-%d %H:%M:%S')
 
-def log_debug_message(message: str):
-    """Simple debugging utility (just prints to console for now)."""
-    print(f"[DEBUG]: {message}")
+# Application logger; handlers and format are set up in utils/logging_config.py.
+# Extra keyword arguments become structured fields of the log line.
+logger = logging.getLogger("app")
+
+def log_debug_message(message: str, **fields):
+    """Debug-level log line (hidden unless LOG_LEVEL=DEBUG)."""
+    logger.debug(message, extra={"fields": fields})
+
+def log_info(message: str, **fields):
+    logger.info(message, extra={"fields": fields})
+
+def log_warning(message: str, **fields):
+    logger.warning(message, extra={"fields": fields})
+
+def log_error(message: str, **fields):
+    logger.error(message, extra={"fields": fields})
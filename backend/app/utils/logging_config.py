@@ -0,0 +1,68 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from typing import Optional
+
+from ..config import settings
+
+# Logging
+# -------
+# All application logs go through the "app" logger. Calls only put the record
+# on an in-memory queue (QueueHandler); a background thread (QueueListener)
+# formats it and writes it to stderr, so a slow terminal or log collector never
+# stalls a request. With log_format="json" every line is one JSON object with
+# the level, logger, message and any extra fields passed to the log helpers.
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", {})
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging():
+    """Configures the "app" logger once (level and format from settings)."""
+    global _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    logger = logging.getLogger("app")
+    logger.setLevel(settings.log_level.upper())
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """Writes out whatever is still queued and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
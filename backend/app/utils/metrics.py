@@ -0,0 +1,226 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Metrics
+# -------
+# In-process counters, gauges and histograms, rendered in the Prometheus text
+# format at GET /metrics. Recording a value is a dict lookup and an addition
+# under a per-metric lock, cheap enough for every request and pipeline stage.
+#
+# Durations recorded during a request are also collected for its Server-Timing
+# header (see `record_timing` and the middleware in main.py).
+
+# Latency buckets (seconds) from a fast DB read up to a long Whisper run
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    """A value that only goes up (requests, cache hits, failed uploads)."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down (queue depth, jobs running). Either updated with
+    set/inc/dec, or computed at scrape time by `callback` (returns {label values: value}
+    for labelled gauges, a number otherwise).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], object]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                current = self._callback()
+            except Exception:
+                return []  # A failing callback must not break the whole scrape
+            items = list(current.items()) if isinstance(current, dict) else [((), current)]
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, tuple(k) if isinstance(k, tuple) else (k,))} {_format_value(v)}"
+            for k, v in items
+        ]
+
+class Histogram(_Metric):
+    """Distribution of durations (or sizes) in cumulative buckets, plus their sum and count."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # bucket counts..., +Inf count, sum
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, timing: Optional[str] = None, **labels):
+        """Observes the duration of the block; with `timing`, also adds it to the Server-Timing header."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe(elapsed, **labels)
+            if timing:
+                record_timing(timing, elapsed)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Creates metrics once (by name) and renders all of them for /metrics."""
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              callback: Optional[Callable[[], object]] = None) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames, callback)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Singleton registry used by the whole app
+metrics = MetricsRegistry(prefix="interview_analyzer_")
+
+# Server-Timing
+# -------------
+# The middleware puts a fresh list into `_request_timings` for every request.
+# Code running for that request (including run_in_threadpool, which copies the
+# context) appends (name, seconds) to it; background threads have no list and
+# their timings only go to the histograms.
+
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+def record_timing(name: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+def server_timing_header(timings: List[Tuple[str, float]], total_seconds: float) -> str:
+    """e.g. 'upload;dur=812.4, transcribing;dur=5321.0, total;dur=6401.7' (milliseconds)."""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings]
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,119 @@
+"""
+Database concurrency benchmark for the interview endpoints.
+
+Sends a mix of concurrent reads (GET /api/v1/interviews/example) and writes
+(POST) to the interviews router, backed by a fresh SQLite file, in three setups:
+
+    before  sync engine, rollback journal, synchronous=FULL (SQLite defaults)
+    wal     sync engine, WAL journal, synchronous=NORMAL
+    async   async engine (aiosqlite), WAL journal, synchronous=NORMAL
+
+Settings are read when the app is imported, so every setup runs in its own
+subprocess. The requests go through httpx's ASGI transport (no network), which
+keeps the numbers about the database layer.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_db [requests] [concurrency] [write_percent]
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+SETUPS = {
+    "before": {"USE_ASYNC_DB": "false", "SQLITE_WAL": "false", "SQLITE_SYNCHRONOUS": "FULL"},
+    "wal": {"USE_ASYNC_DB": "false", "SQLITE_WAL": "true", "SQLITE_SYNCHRONOUS": "NORMAL"},
+    "async": {"USE_ASYNC_DB": "true", "SQLITE_WAL": "true", "SQLITE_SYNCHRONOUS": "NORMAL"},
+}
+
+def percentile(sorted_values: list, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+async def drive(total: int, concurrency: int, write_percent: int) -> dict:
+    """Runs inside the subprocess: builds the app and fires the request mix."""
+    import httpx
+    from fastapi import FastAPI
+    from app.api import interviews
+    from app.database import engine, async_engine, Base
+    from app.models import interview  # noqa: F401 (registers the table)
+
+    Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    app.include_router(interviews.router, prefix="/api/v1/interviews")
+
+    latencies = {"read": [], "write": []}
+    errors = 0
+    rng = random.Random(0)
+    kinds = ["write" if rng.random() * 100 < write_percent else "read" for _ in range(total)]
+    counter = iter(range(total))
+
+    async def worker(client):
+        nonlocal errors
+        for i in counter:
+            kind = kinds[i]
+            start = time.perf_counter()
+            if kind == "write":
+                response = await client.post("/api/v1/interviews/example", json={"title": f"Interview {i}"})
+            else:
+                response = await client.get("/api/v1/interviews/example", params={"limit": 20})
+            latencies[kind].append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Seed rows so reads return a full page
+        for i in range(20):
+            await client.post("/api/v1/interviews/example", json={"title": f"Seed {i}"})
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    if async_engine is not None:
+        await async_engine.dispose()
+
+    summary = {"requests_per_second": total / elapsed, "errors": errors}
+    for kind, values in latencies.items():
+        values.sort()
+        if values:
+            summary[kind] = {
+                "count": len(values),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+            }
+    return summary
+
+def run_setup(name: str, total: int, concurrency: int, write_percent: int) -> dict:
+    with tempfile.TemporaryDirectory() as folder:
+        env = dict(os.environ, **SETUPS[name])
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(folder, 'bench.db')}"
+        env.pop("ASYNC_DATABASE_URL", None)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_db", "--child", str(total), str(concurrency), str(write_percent)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        total, concurrency, write_percent = (int(v) for v in sys.argv[2:5])
+        print(json.dumps(asyncio.run(drive(total, concurrency, write_percent))))
+        return
+
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    write_percent = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    print(f"{total} requests, {concurrency} concurrent clients, {write_percent}% writes")
+    print(f"{'setup':<8} {'req/s':>8} {'read p50':>9} {'read p95':>9} {'write p50':>10} {'write p95':>10} {'errors':>7}")
+    for name in SETUPS:
+        r = run_setup(name, total, concurrency, write_percent)
+        read, write = r.get("read", {}), r.get("write", {})
+        print(f"{name:<8} {r['requests_per_second']:>8.0f} "
+              f"{read.get('p50_ms', 0):>7.1f}ms {read.get('p95_ms', 0):>7.1f}ms "
+              f"{write.get('p50_ms', 0):>8.1f}ms {write.get('p95_ms', 0):>8.1f}ms {r['errors']:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Filler matcher benchmark.
+
+Compares the phrase matcher in app/services/filler_matcher.py with the previous
+word-by-word set lookup (which could not match "you know" / "i mean" / "sort of")
+on a synthetic 20k-word transcript. Before timing, `check_matcher` verifies the
+matcher on edge cases (punctuation-only words, overlapping phrases) and that the
+incremental accumulator agrees with the one-shot count.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_fillers [num_words]
+"""
+import gc
+import random
+import sys
+import time
+
+from app.services.filler_matcher import FillerMatcher, get_matcher, normalize_token
+from app.services.speech_analysis_service import count_filler_words, SpeechMetricsAccumulator
+
+VOCABULARY = (
+    "so i think the main thing we did was to build a service that scales and "
+    "then we measured latency across the whole team project with real users"
+).split()
+FILLERS = ["um", "uh", "like", "you know", "i mean", "sort of"]
+
+def synthetic_transcript(num_words: int = 20000, filler_rate: float = 0.05, seed: int = 0) -> list:
+    """Whisper-style segments of ~12 words, with punctuation and fillers sprinkled in."""
+    rng = random.Random(seed)
+    words, t = [], 0.0
+    while len(words) < num_words:
+        phrase = rng.choice(FILLERS) if rng.random() < filler_rate else rng.choice(VOCABULARY)
+        for token in phrase.split():
+            if rng.random() < 0.1:
+                token = token.capitalize() + rng.choice([",", ".", "?"])
+            words.append({"word": token, "start": round(t, 2), "end": round(t + 0.3, 2)})
+            t += rng.uniform(0.3, 0.6)
+        if rng.random() < 0.02:
+            # Whisper sometimes emits punctuation as a word of its own
+            words.append({"word": rng.choice(["...", "?", " -"]), "start": round(t, 2), "end": round(t + 0.1, 2)})
+            t += 0.2
+    return [
+        {"start": chunk[0]["start"], "end": chunk[-1]["end"], "text": "", "words": chunk}
+        for chunk in (words[i:i + 12] for i in range(0, len(words), 12))
+    ]
+
+def previous_count(transcript_segments: list) -> dict:
+    """The old implementation: one set lookup per word (multi-word fillers never match)."""
+    filler_words_list = {"um", "uh", "er", "ah", "like", "you know", "i mean", "sort of"}
+    detected_fillers = {}
+    total_count = 0
+    for segment in transcript_segments:
+        for word_data in segment.get("words", []):
+            word = word_data["word"].lower().strip(".,?!")
+            if word in filler_words_list:
+                detected_fillers[word] = detected_fillers.get(word, 0) + 1
+                total_count += 1
+    return {"total_count": total_count, "breakdown": detected_fillers}
+
+def best_of(fns: dict, repeats: int = 20) -> dict:
+    """
+    Best time per function. The functions take turns, so background load hits them alike.
+    The garbage collector is paused while timing (like `timeit`), otherwise a collection
+    triggered by one function's allocations is billed to whichever function runs next.
+    """
+    times = {name: float("inf") for name in fns}
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            for name, fn in fns.items():
+                start = time.perf_counter()
+                fn()
+                times[name] = min(times[name], time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return times
+
+def incremental(segments: list):
+    accumulator = SpeechMetricsAccumulator()
+    accumulator.add_segments(segments)
+    return accumulator.result()
+
+def _words(text: str) -> list:
+    return [{"word": " " + w, "start": float(i), "end": i + 0.5} for i, w in enumerate(text.split())]
+
+def check_matcher(segments: list):
+    """Raises AssertionError if the matcher gets an edge case wrong."""
+    en = get_matcher("en")
+    cases = {
+        "you know ... um": ["you know", "um"],
+        "you know?": ["you know"],
+        "you ... know": ["you know"],
+        "? ... um": ["um"],
+        "...": [],
+    }
+    for text, expected in cases.items():
+        assert [hit["phrase"] for hit in en.find(_words(text))] == expected, text
+    # Overlapping phrases, through `scan` (used by the accumulator and the live path)
+    overlapping = FillerMatcher(["you know", "you know what"])
+    for text, expected in {"you know ...": ["you know"], "you know ... what": ["you know what"],
+                           "you know ... so": ["you know"]}.items():
+        tokens = [normalize_token(w) for w in text.split()]
+        assert [phrase for phrase, _, _ in overlapping.scan(tokens)[0]] == expected, text
+        hits, consumed = overlapping.scan(tokens, final=False)
+        assert consumed <= len(tokens), text
+    # The incremental path must find exactly what the one-shot count finds
+    assert incremental(segments)["filler_words"] == count_filler_words(segments)
+
+def main(num_words: int):
+    segments = synthetic_transcript(num_words)
+    get_matcher()  # compile outside the timed region, like at startup
+    check_matcher(segments)
+
+    old = previous_count(segments)
+    new = count_filler_words(segments)
+    times = best_of({
+        "previous": lambda: previous_count(segments),
+        "matcher": lambda: count_filler_words(segments),
+        "accumulator": lambda: incremental(segments),
+    })
+    print(f"{num_words} words")
+    print(f"{'implementation':<32}{'time (ms)':>10}{'fillers':>9}")
+    print(f"{'previous (single words only)':<32}{times['previous'] * 1000:>10.2f}{old['total_count']:>9}")
+    print(f"{'phrase matcher':<32}{times['matcher'] * 1000:>10.2f}{new['total_count']:>9}")
+    print(f"{'accumulator (all metrics)':<32}{times['accumulator'] * 1000:>10.2f}")
+    print(f"breakdown: {new['breakdown']}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
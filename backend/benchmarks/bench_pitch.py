@@ -0,0 +1,93 @@
+"""
+Pitch backend benchmark.
+
+Compares the F0 trackers in app/services/pitch_tracking.py on speed and on
+agreement with librosa.pyin (the reference).
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_pitch                      # synthetic signals only
+    python -m benchmarks.bench_pitch interview1.wav ...   # plus recorded speech
+"""
+import sys
+import time
+import numpy as np
+import librosa
+
+from app.services.pitch_tracking import estimate_f0, PITCH_BACKENDS
+
+SR = 22050
+
+def _harmonic(f0_curve: np.ndarray, sr: int) -> np.ndarray:
+    """A voice-like tone: fundamental plus two harmonics following `f0_curve` (Hz per sample)."""
+    phase = 2 * np.pi * np.cumsum(f0_curve) / sr
+    return 0.3 * np.sin(phase) + 0.15 * np.sin(2 * phase) + 0.05 * np.sin(3 * phase)
+
+def vibrato_tone(seconds: float = 20.0, sr: int = SR) -> np.ndarray:
+    """150 Hz with +-30 Hz vibrato and a 0.5 s gap every 4 seconds."""
+    t = np.arange(int(seconds * sr)) / sr
+    y = _harmonic(150 + 30 * np.sin(2 * np.pi * 0.5 * t), sr)
+    y[(t % 4) > 3.5] = 0.0
+    return y
+
+def glide(seconds: float = 20.0, sr: int = SR) -> np.ndarray:
+    """Slow glide across the speech range, 80 Hz -> 350 Hz."""
+    t = np.arange(int(seconds * sr)) / sr
+    return _harmonic(80 + 270 * t / seconds, sr)
+
+def speech_like(seconds: float = 60.0, sr: int = SR, seed: int = 0) -> np.ndarray:
+    """Syllable-sized voiced bursts with random intonation, breath noise and pauses."""
+    rng = np.random.default_rng(seed)
+    out = []
+    while sum(len(x) for x in out) < seconds * sr:
+        n = int(rng.uniform(0.12, 0.35) * sr)
+        start, end = rng.uniform(100, 220), rng.uniform(100, 220)
+        envelope = np.hanning(n)
+        out.append(_harmonic(np.linspace(start, end, n), sr) * envelope)
+        if rng.random() < 0.25:
+            out.append(np.zeros(int(rng.uniform(0.2, 0.8) * sr)))
+    y = np.concatenate(out)[:int(seconds * sr)]
+    return y + 0.005 * rng.standard_normal(len(y))
+
+def agreement(reference: np.ndarray, estimate: np.ndarray) -> dict:
+    """Voicing agreement and share of jointly voiced frames within 50 cents of the reference."""
+    n = min(len(reference), len(estimate))
+    reference, estimate = reference[:n], estimate[:n]
+    both = (reference > 0) & (estimate > 0)
+    cents = 1200 * np.abs(np.log2(estimate[both] / reference[both])) if both.any() else np.array([])
+    return {
+        "voicing_agreement": float(np.mean((reference > 0) == (estimate > 0))),
+        "pitch_within_50_cents": float(np.mean(cents < 50)) if len(cents) else float("nan"),
+    }
+
+def run(name: str, y: np.ndarray, sr: int):
+    y = np.asarray(y, dtype=np.float32)
+    duration = len(y) / sr
+    print(f"\n{name}: {duration:.1f}s @ {sr} Hz")
+    print(f"  {'backend':<8} {'seconds':>8} {'x realtime':>11} {'speedup':>8} {'voicing':>8} {'<50c':>7}")
+
+    reference, reference_time = None, None
+    for backend in PITCH_BACKENDS:
+        started = time.perf_counter()
+        f0 = estimate_f0(y, sr, backend=backend)
+        elapsed = time.perf_counter() - started
+        if backend == "pyin":
+            reference, reference_time = f0, elapsed
+        scores = agreement(reference, f0)
+        print(
+            f"  {backend:<8} {elapsed:>8.3f} {duration / elapsed:>11.1f} {reference_time / elapsed:>8.1f}"
+            f" {scores['voicing_agreement']:>8.3f} {scores['pitch_within_50_cents']:>7.3f}"
+        )
+
+def main(paths):
+    # JIT-compile pyin's internals once so the first measurement is fair
+    estimate_f0(vibrato_tone(1.0), SR, backend="pyin")
+
+    run("vibrato tone", vibrato_tone(), SR)
+    run("glide", glide(), SR)
+    run("speech-like", speech_like(), SR)
+    for path in paths:
+        y, sr = librosa.load(path, sr=None)
+        run(path, y, sr)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
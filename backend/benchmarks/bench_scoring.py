@@ -0,0 +1,75 @@
+"""
+Cohort scoring benchmark.
+
+Compares the vectorized `score_sessions` with calling `calculate_session_score`
+once per session, checks that both give exactly the same scores, and times
+percentile lookups in the sorted-array index.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_scoring [cohort_size]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.services.session_comparison_service import (
+    calculate_session_score, score_sessions, metrics_to_columns, PercentileIndex
+)
+
+def synthetic_cohort(size: int, seed: int = 0) -> list:
+    """Metrics dicts spread over every branch of the scorer (ideal/slow/fast pace, 0 s, many fillers)."""
+    rng = random.Random(seed)
+    cohort = []
+    for _ in range(size):
+        cohort.append({
+            "overall_relevance": rng.random(),
+            "overall_emotional_stability_score": rng.random(),
+            "speaking_rate_wpm": rng.choice([0, rng.uniform(60, 220), rng.randint(100, 180)]),
+            "filler_words_count": rng.randint(0, 40),
+            "duration_seconds": rng.choice([0, rng.uniform(30, 1800)]),
+        })
+    return cohort
+
+def best_time(fn, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(size: int):
+    cohort = synthetic_cohort(size)
+    columns = metrics_to_columns(cohort)
+
+    scalar = [calculate_session_score(m) for m in cohort]
+    vector = score_sessions(columns)
+    mismatches = sum(
+        s["final_score"] != vector["final_score"][i]
+        or any(s["components"][k] != vector[k][i] for k in s["components"])
+        for i, s in enumerate(scalar)
+    )
+
+    t_scalar = best_time(lambda: [calculate_session_score(m) for m in cohort])
+    t_columns = best_time(lambda: metrics_to_columns(cohort))
+    t_vector = best_time(lambda: score_sessions(columns))
+
+    index = PercentileIndex(vector["final_score"])
+    probes = np.random.default_rng(0).uniform(0, 100, 10000)
+    t_lookup = best_time(lambda: [index.percentile(p) for p in probes[:1000]]) / 1000
+    t_batch = best_time(lambda: index.percentile(probes)) / len(probes)
+
+    print(f"{size} sessions")
+    print(f"{'scalar loop':<34}{t_scalar * 1000:>10.2f} ms")
+    print(f"{'vectorized (columns ready)':<34}{t_vector * 1000:>10.2f} ms  ({t_scalar / t_vector:.0f}x)")
+    print(f"{'vectorized (incl. dicts->columns)':<34}{(t_vector + t_columns) * 1000:>10.2f} ms")
+    print(f"{'percentile lookup (single)':<34}{t_lookup * 1e6:>10.2f} us")
+    print(f"{'percentile lookup (batched)':<34}{t_batch * 1e6:>10.3f} us per score")
+    print(f"mismatches vs scalar: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
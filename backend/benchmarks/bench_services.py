@@ -0,0 +1,339 @@
+"""
+Offline benchmark suite for the analysis services.
+
+Generates synthetic inputs and measures throughput and peak memory as the input grows:
+
+    audio       audio_analysis_service: prosody index (pitch + energy) and per-segment
+                stability of tone sweeps mixed with noise bursts and silence
+    speech      speech_analysis_service.analyze_speech on Whisper-shaped transcripts
+    chunking    semantic_analysis_service.chunk_transcript on the same transcripts
+    semantic    semantic_analysis_service.analyze_semantic_relevance, with a stub
+                embedding model (hashed bag of words) instead of SentenceTransformer
+    scoring     session_comparison_service.score_sessions + PercentileIndex over a cohort
+
+Nothing is downloaded and no model weights are needed. Time is the best of
+`--repeats` samples; each sample repeats the call until it has run for at least
+`--min-time` seconds (0.2), so millisecond-sized cases are not measured from a
+single noisy call. Peak memory is measured in a separate run under tracemalloc
+(which slows Python code down, so it never overlaps with the timing).
+
+Regression check: `--save FILE` stores the results as a baseline; `--baseline FILE`
+compares against one and exits with status 1 when throughput drops, or peak memory
+grows, by more than `--tolerance` (default 30%) plus an absolute slack for tiny
+cases (`--time-slack`, 1 ms per call; 1 MB). Cases over the limit are measured a
+second time and only fail if they regress again. Baselines are machine-specific,
+so record them on the machine (or CI runner) that runs the check.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_services                         # full sizes (1k-100k words)
+    python -m benchmarks.bench_services --quick --cases speech,chunking
+    python -m benchmarks.bench_services --save bench_baseline.json
+    python -m benchmarks.bench_services --baseline bench_baseline.json
+"""
+import argparse
+import gc
+import hashlib
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+# semantic_analysis_service imports sentence_transformers at module level. The
+# stub model below is used instead, so the suite runs where it is not installed.
+try:
+    import sentence_transformers  # noqa: F401
+except ImportError:
+    placeholder = types.ModuleType("sentence_transformers")
+
+    class _NotInstalled:
+        def __init__(self, *args, **kwargs):
+            raise RuntimeError("sentence_transformers is not installed (the benchmark uses a stub model)")
+
+    placeholder.SentenceTransformer = _NotInstalled
+    sys.modules["sentence_transformers"] = placeholder
+
+from app.config import settings
+from app.services.model_registry import model_registry
+
+class StubEmbeddingModel:
+    """
+    Deterministic stand-in for SentenceTransformer.encode: each word is hashed into
+    one of `dim` buckets (a bag-of-words vector). Cost grows with the text length
+    like a real encoder, without weights or a GPU.
+    """
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._buckets = {}
+
+    def _bucket(self, word: str) -> int:
+        bucket = self._buckets.get(word)
+        if bucket is None:
+            bucket = self._buckets[word] = int.from_bytes(hashlib.md5(word.encode()).digest()[:4], "little") % self.dim
+        return bucket
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row, self._bucket(word)] += 1.0
+        return out
+
+# Registered before the service module is imported, so its own registration is skipped
+model_registry.register("sentence-transformer", StubEmbeddingModel)
+settings.embedding_cache_enabled = False  # Measure the analysis, not the on-disk cache
+
+from app.services import audio_analysis_service, speech_analysis_service, semantic_analysis_service  # noqa: E402
+from app.services.session_comparison_service import score_sessions, metrics_to_columns, PercentileIndex  # noqa: E402
+
+SR = 16000
+
+# --- Synthetic inputs ---
+
+VOCABULARY = (
+    "so i think the main thing we did was to build a python service that scales and then we "
+    "measured latency across the whole team project with real users using kubernetes and postgres "
+    "i led the migration designed the api wrote tests and mentored two junior engineers"
+).split()
+FILLERS = ["um", "uh", "like", "you know", "i mean", "sort of"]
+
+RESUME = """Senior backend engineer. Python, FastAPI, PostgreSQL, Kubernetes.
+
+Led a team of five engineers migrating a monolith to services.
+
+Designed public APIs and improved p95 latency by 40 percent.
+
+Mentored junior engineers and ran the hiring loop."""
+
+def synthetic_transcript(num_words: int, seed: int = 0) -> dict:
+    """
+    A Whisper-shaped transcription: segments of 8-25 timestamped words with text,
+    ~5% fillers, occasional punctuation and a pause of 0.6-3 s before ~8% of segments.
+    """
+    rng = random.Random(seed)
+    segments, t, count = [], 0.0, 0
+    while count < num_words:
+        if rng.random() < 0.08:
+            t += rng.uniform(0.6, 3.0)
+        words = []
+        for _ in range(min(rng.randint(8, 25), num_words - count)):
+            phrase = rng.choice(FILLERS) if rng.random() < 0.05 else rng.choice(VOCABULARY)
+            for token in phrase.split():
+                if rng.random() < 0.08:
+                    token = token.capitalize() + rng.choice([",", ".", "?"])
+                duration = rng.uniform(0.15, 0.45)
+                words.append({"word": " " + token, "start": round(t, 2), "end": round(t + duration, 2)})
+                t += duration + rng.uniform(0.02, 0.2)
+            count += 1
+        segments.append({
+            "start": words[0]["start"], "end": words[-1]["end"],
+            "text": "".join(w["word"] for w in words), "words": words,
+        })
+    return {"full_text": "".join(s["text"] for s in segments), "segments": segments}
+
+def _harmonic(f0_curve: np.ndarray) -> np.ndarray:
+    phase = 2 * np.pi * np.cumsum(f0_curve) / SR
+    return 0.3 * np.sin(phase) + 0.15 * np.sin(2 * phase) + 0.05 * np.sin(3 * phase)
+
+def synthetic_audio(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Alternating 0.5-3 s tone sweeps (voice-like harmonics gliding within 80-350 Hz),
+    0.1-0.6 s noise bursts and short silences, at 16 kHz (the shared decode rate).
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SR)
+    parts, length = [], 0
+    while length < total:
+        kind = rng.random()
+        if kind < 0.6:
+            n = int(rng.uniform(0.5, 3.0) * SR)
+            start, end = rng.uniform(80, 350, size=2)
+            part = _harmonic(np.geomspace(start, end, n)) * np.hanning(n)
+        elif kind < 0.85:
+            n = int(rng.uniform(0.1, 0.6) * SR)
+            part = rng.uniform(0.05, 0.3) * rng.standard_normal(n) * np.hanning(n)
+        else:
+            n = int(rng.uniform(0.2, 1.0) * SR)
+            part = np.zeros(n)
+        parts.append(part)
+        length += n
+    y = np.concatenate(parts)[:total]
+    return (y + 0.003 * rng.standard_normal(total)).astype(np.float32)
+
+def audio_segments(seconds: float, seed: int = 0) -> list:
+    """Transcript segments (5-15 s) covering the recording, for the per-segment summary."""
+    rng = random.Random(seed)
+    segments, t = [], 0.0
+    while t < seconds:
+        end = min(seconds, t + rng.uniform(5, 15))
+        segments.append({"start": t, "end": end, "text": ""})
+        t = end
+    return segments
+
+def synthetic_cohort(size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [{
+        "overall_relevance": rng.random(),
+        "overall_emotional_stability_score": rng.random(),
+        "speaking_rate_wpm": rng.uniform(60, 220),
+        "filler_words_count": rng.randint(0, 40),
+        "duration_seconds": rng.uniform(30, 1800),
+    } for _ in range(size)]
+
+# --- Cases ---
+# Each factory takes an input size and returns (prepare, run): `prepare` builds
+# the input outside the measurement, `run` is what gets timed.
+
+def audio_case(seconds: int, pitch_backend: str):
+    def prepare():
+        return synthetic_audio(seconds), audio_segments(seconds)
+
+    def run(inputs):
+        y, segments = inputs
+        index = audio_analysis_service.build_prosody_index(
+            "synthetic.wav", pitch_backend=pitch_backend, audio=y, audio_sr=SR
+        )
+        return audio_analysis_service.summarize_segments(index, segments)
+    return prepare, run
+
+def speech_case(words: int):
+    return (lambda: synthetic_transcript(words)), speech_analysis_service.analyze_speech
+
+def chunking_case(words: int):
+    return (lambda: synthetic_transcript(words)["segments"]), semantic_analysis_service.chunk_transcript
+
+def semantic_case(words: int):
+    return (lambda: synthetic_transcript(words)), (
+        lambda transcript: semantic_analysis_service.analyze_semantic_relevance(transcript, RESUME)
+    )
+
+def scoring_case(sessions: int):
+    def run(cohort):
+        scores = score_sessions(metrics_to_columns(cohort))["final_score"]
+        return PercentileIndex(scores).percentile(scores)
+    return (lambda: synthetic_cohort(sessions)), run
+
+WORD_SIZES = [1000, 10000, 100000]
+CASES = {
+    # name: (factory, unit, full sizes, quick sizes)
+    "audio": (audio_case, "audio s", [30, 120, 600], [10, 30]),
+    "speech": (speech_case, "words", WORD_SIZES, [1000, 10000]),
+    "chunking": (chunking_case, "words", WORD_SIZES, [1000, 10000]),
+    "semantic": (semantic_case, "words", WORD_SIZES, [1000, 10000]),
+    "scoring": (scoring_case, "sessions", WORD_SIZES, [1000, 10000]),
+}
+
+# --- Measurement ---
+
+def measure(prepare, run, repeats: int, min_time: float = 0.2) -> dict:
+    inputs = prepare()
+    started = time.perf_counter()
+    run(inputs)  # Warm up (lexicon compile, numba/librosa caches)
+    # Calls per sample, so that one sample takes at least `min_time`
+    loops = max(1, math.ceil(min_time / max(time.perf_counter() - started, 1e-6)))
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()  # Like timeit: collections triggered by earlier garbage are noise
+        try:
+            started = time.perf_counter()
+            for _ in range(loops):
+                run(inputs)
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        if elapsed < min_time:
+            # The warm-up call was slower than the steady state: sample again with more calls
+            loops = max(loops + 1, math.ceil(loops * min_time / max(elapsed, 1e-6)))
+        best = min(best, elapsed / loops)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "loops": loops, "peak_mb": peak / 1e6}
+
+def check(results: dict, baseline: dict, tolerance: float, time_slack: float = 0.001) -> list:
+    """
+    Regressions against a saved baseline: slower throughput or higher peak memory.
+    `time_slack` (seconds per call) keeps millisecond-sized cases from failing on jitter.
+    """
+    failures = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        # Throughput below (1 - tolerance) of the baseline, i.e. seconds above baseline / (1 - tolerance)
+        if current["seconds"] > reference["seconds"] / (1 - tolerance) + time_slack:
+            failures.append(f"{key}: throughput {current['throughput']:.0f} < baseline {reference['throughput']:.0f}")
+        # +1 MB slack: tiny inputs have noisy allocation peaks
+        if current["peak_mb"] > reference["peak_mb"] * (1 + tolerance) + 1.0:
+            failures.append(f"{key}: peak memory {current['peak_mb']:.1f} MB > baseline {reference['peak_mb']:.1f} MB")
+    return failures
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases to run")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs (a few seconds in total)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed samples per case (the best one counts)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timed sample")
+    parser.add_argument("--pitch-backend", default="fast", help="Pitch backend for the audio case")
+    parser.add_argument("--save", metavar="FILE", help="Write the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="Fail on regressions against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative regression (0.3 = 30%%)")
+    parser.add_argument("--time-slack", type=float, default=0.001, help="Extra seconds per call allowed on top of the tolerance")
+    args = parser.parse_args(argv)
+
+    def run_case(name: str, size: int) -> dict:
+        factory = CASES[name][0]
+        case = factory(size, args.pitch_backend) if name == "audio" else factory(size)
+        measured = measure(*case, repeats=args.repeats, min_time=args.min_time)
+        measured["throughput"] = size / measured["seconds"]
+        return measured
+
+    results = {}
+    print(f"{'case':<10} {'size':>8} {'unit':<9} {'seconds':>9} {'per second':>12} {'peak MB':>9}")
+    for name in args.cases.split(","):
+        _, unit, sizes, quick_sizes = CASES[name]
+        for size in (quick_sizes if args.quick else sizes):
+            measured = results[f"{name}/{size}"] = run_case(name, size)
+            print(f"{name:<10} {size:>8} {unit:<9} {measured['seconds']:>9.4f} "
+                  f"{measured['throughput']:>12.0f} {measured['peak_mb']:>9.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = check(results, baseline, args.tolerance, args.time_slack)
+        if failures:
+            # Timing noise comes in bursts: a case only fails if it is also slow when measured again
+            suspects = {failure.split(":")[0] for failure in failures}
+            print(f"Measuring {len(suspects)} case(s) again: {', '.join(sorted(suspects))}")
+            for key in suspects:
+                name, size = key.split("/")
+                again = run_case(name, int(size))
+                if again["seconds"] < results[key]["seconds"]:
+                    results[key].update(seconds=again["seconds"], throughput=again["throughput"])
+                results[key]["peak_mb"] = min(results[key]["peak_mb"], again["peak_mb"])
+            failures = check(results, baseline, args.tolerance, args.time_slack)
+        if failures:
+            print("REGRESSIONS:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
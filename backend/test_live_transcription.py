@@ -0,0 +1,63 @@
+import json
+import sys
+import time
+import numpy as np
+import soundfile as sf
+from websockets.sync.client import connect
+
+# Configuration
+WS_URL = "ws://127.0.0.1:8000/api/v1/transcription/live"
+FRAME_SECONDS = 0.1  # Browsers typically deliver 100-250 ms of audio per frame
+
+def replay(wav_path: str, realtime: bool = True):
+    """
+    Replays a recorded WAV file to the live endpoint as if it was being recorded,
+    printing the partial results the server sends back.
+    """
+    audio, sample_rate = sf.read(wav_path, dtype="int16", always_2d=True)
+    audio = audio[:, 0]  # first channel
+    frame = int(sample_rate * FRAME_SECONDS)
+
+    print(f"Connecting to: {WS_URL}")
+    with connect(WS_URL, max_size=None) as ws:
+        ws.send(json.dumps({"type": "start", "sample_rate": sample_rate, "encoding": "pcm_s16le"}))
+
+        for start in range(0, len(audio), frame):
+            ws.send(audio[start:start + frame].tobytes())
+            if realtime:
+                time.sleep(FRAME_SECONDS)
+            # Print whatever the server sent meanwhile
+            while True:
+                try:
+                    show(json.loads(ws.recv(timeout=0)))
+                except TimeoutError:
+                    break
+
+        stopped_at = time.time()
+        ws.send(json.dumps({"type": "stop"}))
+        for message in ws:
+            update = json.loads(message)
+            show(update)
+            if update["type"] in ("final", "error"):
+                break
+        print(f"\nFinal result {time.time() - stopped_at:.2f}s after recording stopped.")
+
+def show(update: dict):
+    if update["type"] == "error":
+        print("\n❌ ERROR:", update["detail"])
+        return
+    metrics = update["metrics"]
+    committed = " ".join(s["text"] for s in update["committed"])
+    tentative = " ".join(s["text"] for s in update["tentative"])
+    print(f"[{update['type']} @ {update.get('received_seconds', 0)}s] "
+          f"WPM={metrics['speaking_rate_wpm']} fillers={metrics['filler_words']['total_count']} | "
+          f"{committed} ~ {tentative}")
+    if update["type"] == "final":
+        print("\n✅ Full transcript:")
+        print(update["transcription"]["full_text"])
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python test_live_transcription.py recording.wav [--fast]")
+        sys.exit(1)
+    replay(sys.argv[1], realtime="--fast" not in sys.argv)